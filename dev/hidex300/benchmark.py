@@ -0,0 +1,167 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from generate_readings import write_readings
+from metpyrad import Hidex300
+
+# Benchmark suite of the Hidex 300 SL processing
+# ---------------------------------------------
+# Writes a synthetic campaign with generate_readings.py and times the main steps of the Hidex300 class on it:
+# parse_readings, process_readings, export_table, export_plot and analyze_readings. Each step is run several times and
+# the best time is kept, then once more under tracemalloc to measure its peak memory (the memory of worker processes
+# is not included). The results are printed and, optionally, saved to a JSON file to track them across releases.
+#
+# Usage:
+#     python benchmark.py [--files 22] [--repetitions 30] [--repeat 3] [--workers 1] [--output results.json]
+
+# Unit of the elapsed time of the processed measurements
+_TIME_UNIT = 'h'
+
+
+def run_benchmark(folder_path, repeat=3, workers=1):
+    """
+    Times the main steps of the Hidex300 class on the CSV files of a folder.
+
+    Parameters
+    ----------
+    folder_path : str
+        Path to the folder with the CSV files.
+    repeat : int
+        Number of timed runs of each step. Default is 3.
+    workers : int or None
+        Number of worker processes used to parse the CSV files and render the plots. Default is 1.
+
+    Returns
+    -------
+    list of dict
+        A record per step with its best time, its throughput and its peak memory.
+    """
+    size = sum(os.path.getsize(os.path.join(folder_path, name)) for name in os.listdir(folder_path)
+               if name.lower().endswith('.csv'))
+    output_folder = tempfile.mkdtemp()
+    processor = Hidex300('Lu-177', 2023, 11)
+    # Steps to time, with whether their throughput is measured on the size of the CSV files
+    steps = {
+        'parse_readings': (lambda: processor.parse_readings(folder_path, workers=workers), True),
+        'process_readings': (lambda: processor.process_readings('all', time_unit=_TIME_UNIT), False),
+        'export_table[csv]': (lambda: processor.export_table('all', output_folder), False),
+        'export_table[parquet]': (lambda: processor.export_table('all', output_folder, format='parquet'), False),
+        'export_plot': (lambda: processor.export_plot('sample', output_folder), False),
+        'analyze_readings': (lambda: Hidex300('Lu-177', 2023, 11).analyze_readings(
+            folder_path, _TIME_UNIT, save=True, output_folder=output_folder, workers=workers), True),
+    }
+    results = []
+    try:
+        for name, (step, reads_files) in steps.items():
+            try:
+                seconds, peak = _measure(step, repeat)
+            except ImportError as error:
+                # Skip the steps whose optional dependencies are not installed
+                print(f'{name}: skipped ({error})')
+                continue
+            readings = len(processor.readings)
+            results.append({
+                'step': name,
+                'seconds': seconds,
+                'readings': readings,
+                'readings_per_second': readings / seconds,
+                'megabytes_per_second': size / 1e6 / seconds if reads_files else None,
+                'peak_memory_megabytes': peak / 1e6,
+            })
+    finally:
+        shutil.rmtree(output_folder)
+    return results
+
+
+def _measure(step, repeat):
+    """
+    Measures the best time and the peak memory of a step, silencing its progress messages.
+
+    Parameters
+    ----------
+    step : callable
+        The step to measure.
+    repeat : int
+        Number of timed runs of the step.
+
+    Returns
+    -------
+    tuple of float
+        The best time in seconds and the peak memory in bytes.
+    """
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            step()
+            times.append(time.perf_counter() - start)
+        # Measure the memory in a separate run since tracing slows down the step
+        tracemalloc.start()
+        try:
+            step()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return min(times), peak
+
+
+def _get_environment():
+    """
+    Gets the versions and the machine the benchmark is run on.
+
+    Returns
+    -------
+    dict
+        The date, the versions of metpyrad, Python, NumPy and pandas, the platform and the number of CPUs.
+    """
+    try:
+        from importlib.metadata import version
+        metpyrad_version = version('metpyrad')
+    except Exception:
+        metpyrad_version = None
+    return {'date': datetime.now().isoformat(timespec='seconds'), 'metpyrad': metpyrad_version,
+            'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+            'platform': platform.platform(), 'cpus': os.cpu_count()}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the Hidex 300 SL processing on synthetic CSV files.')
+    parser.add_argument('--files', type=int, default=22, help='Number of CSV files. Default is 22.')
+    parser.add_argument('--repetitions', type=int, default=30,
+                        help='Number of repetitions of the background and of the sample per file. Default is 30.')
+    parser.add_argument('--repeat', type=int, default=3, help='Number of timed runs of each step. Default is 3.')
+    parser.add_argument('--workers', type=int, default=1, help='Number of worker processes. Default is 1.')
+    parser.add_argument('--folder', default=None,
+                        help='Folder with the CSV files to benchmark. Default is a synthetic campaign.')
+    parser.add_argument('--output', default=None, help='JSON file where the results are saved.')
+    args = parser.parse_args()
+    scale = {'repeat': args.repeat, 'workers': args.workers}
+    if args.folder is None:
+        input_folder = tempfile.mkdtemp()
+        scale['repetitions'] = args.repetitions
+        scale.update(write_readings(input_folder, files=args.files, repetitions=args.repetitions))
+    else:
+        input_folder = args.folder
+        scale['folder'] = args.folder
+    try:
+        records = run_benchmark(input_folder, repeat=args.repeat, workers=args.workers)
+    finally:
+        if args.folder is None:
+            shutil.rmtree(input_folder)
+    print(pd.DataFrame(records).to_string(index=False, float_format='{:.4g}'.format))
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump({'environment': _get_environment(), 'scale': scale, 'results': records}, file, indent=2)
+        print(f'Results saved to {args.output}')
@@ -0,0 +1,93 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from metpyrad import Hidex300
+
+# Benchmark of the processing of background, sample and net measurements
+# -----------------------------------------------------------------------
+# Compares process_readings('all') with the previous processing path on synthetic readings and checks that the
+# results are identical.
+
+# Number of synthetic readings
+_READINGS = 10 ** 6
+# Unit of the elapsed time
+_TIME_UNIT = 'h'
+# Conversion factors of the elapsed time
+_TIME_CONVERSION = {'s': 1, 'min': 1 / 60, 'h': 1 / 3600, 'd': 1 / 86400, 'wk': 1 / (86400 * 7),
+                    'mo': 1 / (86400 * 30.44), 'yr': 1 / (86400 * 365.25)}
+
+
+def get_readings(readings, repetitions=10, seed=0):
+    # Build readings alternating a background and a sample with the given repetitions per cycle
+    rng = np.random.default_rng(seed)
+    cycles = readings // (2 * repetitions)
+    readings = cycles * 2 * repetitions
+    return pd.DataFrame({
+        'Cycle': np.repeat(np.arange(1, cycles + 1), 2 * repetitions),
+        'Sample': np.tile(np.repeat([1, 2], repetitions), cycles),
+        'Repetition': np.tile(np.arange(1, repetitions + 1), 2 * cycles),
+        'Count rate (cpm)': rng.uniform(50, 3e5, readings),
+        'Counts (reading)': rng.integers(100, 400000, readings),
+        'Dead time': rng.uniform(1, 1.2, readings),
+        'Real time (s)': np.full(readings, 100),
+        'End time': pd.Timestamp('2023-11-30') + pd.to_timedelta(np.sort(rng.integers(0, 10 ** 15, readings)), 'ns'),
+    })
+
+
+def previous_background_sample(readings, sample_id, time_unit):
+    # Previous processing of background or sample measurements
+    df = readings.copy()
+    df = df[df['Sample'] == sample_id].reset_index(drop=True)
+    elapsed_time = df['End time'] - df['End time'].min()
+    elapsed_time_unit = pd.Series([i.total_seconds() for i in elapsed_time]) * _TIME_CONVERSION[time_unit]
+    df['Live time (s)'] = df['Real time (s)'] / df['Dead time']
+    df['Elapsed time'] = elapsed_time
+    df[f'Elapsed time ({time_unit})'] = elapsed_time_unit
+    df['Counts'] = df['Count rate (cpm)'] * df['Live time (s)'] / 60
+    df['Counts uncertainty'] = df['Counts'].pow(1 / 2)
+    df['Counts uncertainty (%)'] = df['Counts uncertainty'] / df['Counts'] * 100
+    return df
+
+
+def previous_net(background, sample, time_unit):
+    # Previous processing of net measurements
+    data = {
+        'Cycle': sample['Cycle'],
+        'Repetition': sample['Repetition'],
+        'Elapsed time': sample['Elapsed time'],
+        f'Elapsed time ({time_unit})': sample[f'Elapsed time ({time_unit})'],
+        'Count rate (cpm)': sample['Count rate (cpm)'] - background['Count rate (cpm)'],
+        'Counts': sample['Counts'] - background['Counts'],
+        'Counts uncertainty': (sample['Counts'] + background['Counts']).pow(1 / 2),
+    }
+    data['Counts uncertainty (%)'] = data['Counts uncertainty'] / data['Counts'] * 100
+    return pd.DataFrame(data)
+
+
+_readings = get_readings(_READINGS)
+
+# Previous processing path
+_start = time.perf_counter()
+_background = previous_background_sample(_readings, 1, _TIME_UNIT)
+_sample = previous_background_sample(_readings, 2, _TIME_UNIT)
+_net = previous_net(_background, _sample, _TIME_UNIT)
+_previous_time = time.perf_counter() - _start
+
+# Current processing path
+processor = Hidex300(radionuclide='Lu-177', year=2023, month=11)
+processor.readings = _readings
+_start = time.perf_counter()
+processor.process_readings(kind='all', time_unit=_TIME_UNIT)
+_current_time = time.perf_counter() - _start
+
+# Check that the results are identical
+pd.testing.assert_frame_equal(processor.background, _background, check_exact=True)
+pd.testing.assert_frame_equal(processor.sample, _sample, check_exact=True)
+pd.testing.assert_frame_equal(processor.net, _net, check_exact=True)
+
+print(f'Readings: {len(_readings)}')
+print(f'Previous processing: {_previous_time:.3f} s')
+print(f'Current processing: {_current_time:.3f} s ({_previous_time / _current_time:.1f}x faster)')
+print('Results are identical')
@@ -0,0 +1,173 @@
+import argparse
+import os
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Generator of synthetic Hidex 300 SL CSV files
+# --------------------------------------------
+# Writes a measurement campaign of a decaying radionuclide with the layout of the instrument output: four
+# identification lines and, per repetition of the background (sample 1) and the sample (sample 2), a data block with
+# the header rows, the 1024 channel spectrum and the 32x64 alpha matrix. The background blocks of a file come before
+# its sample blocks, as in the reference files of dev/hidex300/ref_case.
+#
+# Usage:
+#     python generate_readings.py /path/to/folder [--files 22] [--repetitions 30] [--alpha-events 0] [--seed 0]
+
+# Number of channels of the spectrum
+_CHANNELS = 1024
+# Number of rows and columns of the alpha matrix
+_MATRIX_SHAPE = (32, 64)
+# Time between the end of a background measurement and the end of the next sample measurement (s)
+_SAMPLE_OFFSET = 204
+# Time between the end of two repetitions of the same sample (s)
+_REPETITION_INTERVAL = 404
+# Header of the spectrum section of a data block
+_SPECTRUM_HEADER = 'Spectrum:;Alpha;Beta;Alpha Triple;Beta Triple'
+# Shape of the beta spectrum over the channels, similar to the one of Lu-177 in the reference files
+_BETA_SHAPE = np.clip(np.sin(np.pi * np.arange(_CHANNELS) / 700), 0, None) ** 2 * np.exp(-np.arange(_CHANNELS) / 600)
+_BETA_SHAPE /= _BETA_SHAPE.sum()
+# Channel numbers of the spectrum rows
+_CHANNEL_PREFIXES = [f'{channel};0;' for channel in range(1, _CHANNELS + 1)]
+# Row of the alpha matrix without events
+_EMPTY_MATRIX_ROW = ';'.join(['0'] * _MATRIX_SHAPE[1])
+
+
+def write_readings(folder_path, files=22, repetitions=30, radionuclide='Lu-177', half_life=6.647,
+                   sample_rate=2.5e5, background_rate=85, real_time=100, interval=1, alpha_events=0,
+                   start=datetime(2023, 11, 30, 8, 40, 58), seed=0):
+    """
+    Writes a synthetic measurement campaign of Hidex 300 SL CSV files to a folder.
+
+    Each file is a measurement cycle with 2 * repetitions data blocks: the repetitions of the background and of the
+    sample. The sample count rate decays with the half-life of the radionuclide and the counts are Poisson distributed.
+
+    Parameters
+    ----------
+    folder_path : str
+        Path to the folder where the CSV files are written. It is created if it does not exist.
+    files : int
+        Number of CSV files (measurement cycles). Default is 22.
+    repetitions : int
+        Number of repetitions of the background and of the sample in each file. Default is 30.
+    radionuclide : str
+        Name of the radionuclide, used in the file names. Default is 'Lu-177'.
+    half_life : float
+        Half-life of the radionuclide (days). Default is 6.647.
+    sample_rate : float
+        Count rate of the sample at the start of the campaign (cpm). Default is 2.5e5.
+    background_rate : float
+        Count rate of the background (cpm). Default is 85.
+    real_time : int
+        Real time of each measurement (s). Default is 100.
+    interval : float
+        Time between the start of two consecutive cycles (days). Default is 1.
+    alpha_events : int
+        Number of non-zero values in each alpha matrix. Default is 0, as in the reference files.
+    start : datetime.datetime
+        Start time of the campaign. Default is 2023-11-30 08:40:58.
+    seed : int
+        Seed of the random number generator. Default is 0.
+
+    Returns
+    -------
+    dict
+        The number of files, the number of readings and the total size in bytes of the written files.
+
+    Examples
+    --------
+    >>> write_readings('/path/to/folder', files=4, repetitions=2)
+    {'files': 4, 'readings': 16, 'bytes': 285645}
+    """
+    rng = np.random.default_rng(seed)
+    os.makedirs(folder_path, exist_ok=True)
+    size = 0
+    for cycle in range(files):
+        cycle_start = start + timedelta(days=cycle * interval)
+        file_path = os.path.join(folder_path, f'{radionuclide} HS3 {cycle_start:%d%m%y}_ciclo{cycle + 1}.csv')
+        lines = [f'{radionuclide} HS3 {cycle_start:%d%m%y}_ciclo{cycle + 1}',
+                 f'Start Time {cycle_start.hour}:{cycle_start:%M:%S}',
+                 '- ROI1 Free Channel Limits 1 - 1023, Type Beta', 'Counting type: Low']
+        for sample, vial, offset in [(1, 1, 0), (2, 8, _SAMPLE_OFFSET)]:
+            for repetition in range(1, repetitions + 1):
+                end_time = cycle_start + timedelta(seconds=real_time + offset + (repetition - 1) * _REPETITION_INTERVAL)
+                if sample == 1:
+                    rate = background_rate
+                else:
+                    elapsed = (end_time - start).total_seconds() / 86400
+                    rate = background_rate + sample_rate * 2 ** (-elapsed / half_life)
+                lines.extend(_get_block(rng, sample, repetition, vial, rate, real_time, end_time, alpha_events))
+        content = '\n'.join(lines)
+        with open(file_path, 'w', newline='') as file:
+            file.write(content)
+        size += len(content)
+    return {'files': files, 'readings': files * 2 * repetitions, 'bytes': size}
+
+
+def _get_block(rng, sample, repetition, vial, rate, real_time, end_time, alpha_events):
+    """
+    Gets the lines of a data block with the given true count rate.
+
+    Parameters
+    ----------
+    rng : numpy.random.Generator
+        The random number generator.
+    sample : int
+        The sample number: 1 for the background and 2 for the sample.
+    repetition : int
+        The repetition number.
+    vial : int
+        The vial number.
+    rate : float
+        The true count rate (cpm).
+    real_time : int
+        The real time of the measurement (s).
+    end_time : datetime.datetime
+        The end time of the measurement.
+    alpha_events : int
+        The number of non-zero values of the alpha matrix.
+
+    Returns
+    -------
+    list of str
+        The lines of the data block.
+    """
+    # The dead time grows with the count rate as in the reference files
+    dead_time = 1 + rate / 2e6
+    counts = int(rng.poisson(rate * real_time / 60 / dead_time))
+    cpm = counts * 60 * dead_time / real_time
+    tdcr = min(0.98, 0.6 + 0.4 * rate / (rate + 1e3)) if sample == 2 else 0.66
+    lines = ['Sample start', f'Samp.;{sample}', f'Repe.;{repetition}', f'Vial;{vial}', f'WName;A{vial:02d}',
+             f'CPM;{cpm:.3f}', f'DPM;{round(cpm / tdcr)}', f'TDCR;{tdcr:.3f}', f'Chemi;{rng.uniform(0.3, 0.4):.3f}',
+             f'Counts;{counts}', f'DTime;{dead_time:.3f}', f'Time;{real_time}', f'EndTime;{end_time:%d/%m/%Y %H:%M:%S}',
+             f'QPE;{rng.normal(787, 2):.3f}', f'QPI;{rng.normal(400, 30):.3f}', f'LumiCPS;{int(rng.integers(250, 300))}',
+             f'Temp;{rng.normal(24.1, 0.1):.2f}', 'Column 17;0', 'Column 18;0', 'Column 19;0', 'Column 20;0',
+             _SPECTRUM_HEADER]
+    # Spread the counts over the beta channels, with the triple coincidences as a fraction of them
+    beta = rng.multinomial(counts, _BETA_SHAPE)
+    beta_triple = rng.binomial(beta, tdcr)
+    lines.extend(f'{prefix}{b};0;{t}' for prefix, b, t in zip(_CHANNEL_PREFIXES, beta.tolist(), beta_triple.tolist()))
+    lines.append('Alpha:')
+    if alpha_events:
+        matrix = np.zeros(_MATRIX_SHAPE[0] * _MATRIX_SHAPE[1], dtype=np.int64)
+        matrix[rng.choice(matrix.size, alpha_events, replace=False)] = rng.integers(1, 100, alpha_events)
+        lines.extend(';'.join(map(str, row)) for row in matrix.reshape(_MATRIX_SHAPE).tolist())
+    else:
+        lines.extend([_EMPTY_MATRIX_ROW] * _MATRIX_SHAPE[0])
+    return lines
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Write synthetic Hidex 300 SL CSV files.')
+    parser.add_argument('folder', help='Folder where the CSV files are written.')
+    parser.add_argument('--files', type=int, default=22, help='Number of CSV files. Default is 22.')
+    parser.add_argument('--repetitions', type=int, default=30,
+                        help='Number of repetitions of the background and of the sample per file. Default is 30.')
+    parser.add_argument('--alpha-events', type=int, default=0,
+                        help='Number of non-zero values in each alpha matrix. Default is 0.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random number generator. Default is 0.')
+    args = parser.parse_args()
+    result = write_readings(args.folder, files=args.files, repetitions=args.repetitions,
+                            alpha_events=args.alpha_events, seed=args.seed)
+    print(f'{result["files"]} CSV files with {result["readings"]} readings ({result["bytes"] / 1e6:.1f} MB) '
+          f'written to {args.folder}')
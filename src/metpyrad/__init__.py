@@ -1,5 +1,5 @@
 # MetPyRad public API
 
-from .hidex300 import Hidex300
+from .hidex300 import Hidex300, ParseCache, AlphaMatrices, Metrics, analyze_campaigns, fit_decay
 
-__all__ = ['Hidex300', ]
\ No newline at end of file
+__all__ = ['Hidex300', 'ParseCache', 'AlphaMatrices', 'Metrics', 'analyze_campaigns', 'fit_decay', ]
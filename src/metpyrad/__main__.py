@@ -0,0 +1,47 @@
+"""Command line entry point of MetPyRad.
+
+Analyzes a batch of Hidex 300 measurement campaigns listed in a manifest CSV file and prints their summary table.
+
+Usage:
+    metpyrad manifest.csv [--workers N] [--output summary.csv] [--raw-files {copy,link,archive,store,none}]
+"""
+import argparse
+
+from .hidex300 import analyze_campaigns
+
+
+def main(argv=None):
+    """
+    Runs the batch analysis of the campaigns of a manifest from the command line.
+
+    Parameters
+    ----------
+    argv : list of str or None
+        The command line arguments. If None, the arguments of the current process are used. Default is None.
+
+    Returns
+    -------
+    int
+        The exit status: 0 if all the campaigns were analyzed, 1 if any of them failed.
+    """
+    parser = argparse.ArgumentParser(prog='metpyrad', description='Analyze a batch of Hidex 300 measurement campaigns.')
+    parser.add_argument('manifest', help='CSV file with a row per campaign and the columns radionuclide, year, month, '
+                                         'input_folder and, optionally, time_unit and output_folder.')
+    parser.add_argument('-w', '--workers', type=int, default=None,
+                        help='Number of worker processes. Default is one per CPU.')
+    parser.add_argument('-o', '--output', default=None, help='CSV file where the summary table is saved.')
+    parser.add_argument('--raw-files', choices=['copy', 'link', 'archive', 'store', 'none'], default='copy',
+                        help='How the raw CSV files are saved with the results. Default is copy.')
+    args = parser.parse_args(argv)
+    # Analyze the campaigns and print the summary table
+    raw_files = None if args.raw_files == 'none' else args.raw_files
+    summary = analyze_campaigns(args.manifest, workers=args.workers, raw_files=raw_files)
+    print(summary.to_string(index=False))
+    if args.output is not None:
+        summary.to_csv(args.output, index=False)
+        print(f'Summary saved to {args.output}')
+    return 1 if summary['Error'].notna().any() else 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
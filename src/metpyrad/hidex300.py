@@ -5,12 +5,30 @@ The module includes a class for handling the parsing, processing, summarizing, a
 
 Classes:
     HidexTDCR: A class to process and summarize measurements for a given radionuclide with a Hidex TDCR.
+    ParseCache: A persistent on-disk cache of the data blocks extracted from Hidex TDCR CSV files.
+    AlphaMatrices: A sparse store of the alpha matrices of the data blocks of Hidex TDCR CSV files.
+    Metrics: Wall times and counters of the processing stages of a HidexTDCR object.
+
+Functions:
+    analyze_campaigns: Analyzes several measurement campaigns in a pool of worker processes.
+    fit_decay: Fits exponential decay curves to one or more series of net measurements by weighted least squares.
 """
+import contextlib
+import hashlib
+import io
+import json
+import mmap
 import os
+import re
 import shutil
+import time
+import zipfile
 from calendar import month_name
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache, partial
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 
@@ -21,12 +39,61 @@ class Hidex300:
     This class provides methods to parse readings from CSV files, process different types of measurements
     (background, sample, net), generate summaries, and export results.
     """
-    # Rows to extract from the CSV files
+    # Registry of the header rows that can be extracted from the CSV files, with the name of their readings column
+    # and their type: 'number' (integer, or float if any value is not an integer), 'float', 'text' or 'datetime'
+    _FIELDS = {'Samp.': ('Sample', 'number'), 'Repe.': ('Repetition', 'number'), 'Vial': ('Vial', 'number'),
+               'WName': ('Well name', 'text'), 'CPM': ('Count rate (cpm)', 'number'),
+               'DPM': ('Disintegration rate (dpm)', 'float'), 'TDCR': ('TDCR', 'float'),
+               'Chemi': ('Chemiluminescence', 'float'), 'Counts': ('Counts (reading)', 'number'),
+               'DTime': ('Dead time', 'number'), 'Time': ('Real time (s)', 'number'), 'EndTime': ('End time', 'datetime'),
+               'QPE': ('QPE', 'float'), 'QPI': ('QPI', 'float'), 'LumiCPS': ('Luminescence rate (cps)', 'float'),
+               'Temp': ('Temperature', 'float')}
+    # Rows always extracted from the CSV files
     _ROWS_TO_EXTRACT = ['Samp.', 'Repe.', 'CPM', 'Counts', 'DTime', 'Time', 'EndTime']
+    # Names of the readings columns for the rows extracted from the CSV files
+    _ROW_NAMES = {row: name for row, (name, _) in _FIELDS.items()}
     # Format for parsing date and time strings from the CSV files
     _DATE_TIME_FORMAT = '%d/%m/%Y %H:%M:%S'
     # String that indicates the start of a data block in the CSV files
     _BLOCK_STARTER = 'Sample start'
+    # String that indicates the end of the header rows of a data block in the CSV files
+    _SPECTRUM_STARTER = 'Spectrum:'
+    # Number of channels of the spectrum of a data block in the CSV files
+    _SPECTRUM_CHANNELS = 1024
+    # Number of characters read at once from the CSV files
+    _CHUNK_SIZE = 1024 * 1024
+    # Minimum number of CSV files per worker process when the number of workers is chosen automatically
+    _FILES_PER_WORKER = 16
+    # Engines available to parse the CSV files
+    _ENGINES = ['python', 'mmap']
+    # Name of the default parse cache folder inside the folder of the CSV files
+    _CACHE_FOLDER = '.metpyrad_cache'
+    # Suffix of the sidecar block index files written next to the CSV files
+    _INDEX_SUFFIX = '.idx.npz'
+    # Formats available to export the tables of measurements, with the extension of their files
+    _TABLE_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather', 'hdf5': '.h5'}
+    # Ways of saving the raw CSV files with the results of analyze_readings
+    _RAW_FILES_MODES = ['copy', 'link', 'archive', 'store']
+    # Name of the content-addressed store of raw CSV files shared by the analyses saved to the same output folder
+    _STORE_FOLDER = '.metpyrad_store'
+    # Context manager of the stages when the metrics are disabled
+    _NO_STAGE = contextlib.nullcontext()
+    # Maximum number of simulated values of each quantity held in memory at once by the Monte Carlo propagation
+    _TRIALS_CHUNK_SIZE = 2 ** 20
+    # Number of bootstrap resamples drawn at once, each chunk with its own seed
+    _RESAMPLES_CHUNK_SIZE = 1000
+    # Minimum number of bootstrap resamples per worker process when the number of workers is chosen automatically
+    _RESAMPLES_PER_WORKER = 10000
+    # Maximum relative difference between a float64 value and its float32 version in compact mode
+    _COMPACT_TOLERANCE = 1e-6
+    # Extensions appended to the compressed CSV files
+    _CSV_COMPRESSIONS = {'gzip': '.gz', 'bz2': '.bz2', 'zip': '.zip', 'xz': '.xz', 'zstd': '.zst'}
+    # Names of the byte offset columns of the block index
+    _OFFSET_NAMES = ['Header offset', 'Spectrum offset', 'Matrix offset', 'End offset']
+    # String that indicates the start of the alpha matrix of a data block in the CSV files
+    _MATRIX_STARTER = 'Alpha:'
+    # Number of rows of the alpha matrix of a data block in the CSV files
+    _MATRIX_ROWS = 32
     # Number of initial lines to skip from the CSV files
     _ID_LINES = 4
     # Delimiter used in the CSV files
@@ -79,19 +146,26 @@ class Hidex300:
         >>> processor.month
         11
         """
-        self.readings = None
+        self.compact = False
         """
-        DataFrame containing the readings (pandas.DataFrame or None). Default None.
-                
+        Whether the readings and the processed measurements are stored with compact dtypes (bool). Default False.
+
+        In compact mode, the integer columns are stored with the narrowest integer dtype that holds their values, the
+        float columns as float32 if their values round-trip within a relative tolerance of 1e-6 (float32 keeps about
+        7 significant digits), and the text columns as categorical if they repeat their values. The calculations are
+        done in float64 and their results are stored with compact dtypes. The net measurements are differences of the
+        compact sample and background measurements, so their rounding error is about 1e-7 of the sample counts, far
+        below their counting uncertainty. Set it before parsing the readings.
+
         Examples
         --------
         >>> processor = HidexTDCR('Lu-177', 2023, 11)
+        >>> processor.compact = True
         >>> processor.parse_readings('path/to/input/files/folder')
-        >>> processor.readings
-            Cycle  Sample  Repetitions  Count rate (cpm)  Counts (reading)  Dead time Real time (s)            End time 
-        1       1            1             83.97               140      1.000           100 2023-11-30 08:44:20     
-        1       2            1         252623.23            374237      1.125           100 2023-11-30 08:47:44
+        >>> processor.readings['Cycle'].dtype
+        dtype('uint8')
         """
+        self.readings = None
         self.background = None
         """
         DataFrame containing the background measurements (pandas.DataFrame or None). Default None.
@@ -189,6 +263,93 @@ class Hidex300:
         >>> processor.measurement_time
         400
         """
+        self.spectra = None
+        """
+        Spectra of the readings (numpy.ndarray or None). Default None.
+
+        Integer array of shape (measurements, 1024, 4) with the Alpha, Beta, Alpha Triple and Beta Triple counts of
+        each channel, aligned with the rows of the readings. Its dtype is the narrowest integer type that holds all the
+        counts. Only available if the readings are parsed with spectra.
+
+        Examples
+        --------
+        >>> processor = HidexTDCR('Lu-177', 2023, 11)
+        >>> processor.parse_readings('path/to/input/files/folder', spectra=True)
+        >>> processor.spectra.shape
+        (4, 1024, 4)
+        """
+        self.matrices = None
+        """
+        Alpha matrices of the readings (AlphaMatrices or None). Default None.
+
+        Sparse store of the 32 x 64 alpha matrix of each measurement, aligned with the rows of the readings.
+        Only available if the readings are parsed with matrices.
+
+        Examples
+        --------
+        >>> processor = HidexTDCR('Lu-177', 2023, 11)
+        >>> processor.parse_readings('path/to/input/files/folder', matrices=True)
+        >>> processor.matrices
+        AlphaMatrices(matrices=4, shape=(32, 64), nonzero=0)
+        """
+        self.blocks = None
+        """
+        Location of the data blocks of the readings in the CSV files (pandas.DataFrame or None). Default None.
+
+        Table aligned with the rows of the readings with the path of the CSV file of each measurement and the byte
+        offsets of the header, spectrum and alpha matrix sections and of the end of its data block.
+        Only available if the readings are parsed with the block index.
+
+        Examples
+        --------
+        >>> processor = HidexTDCR('Lu-177', 2023, 11)
+        >>> processor.parse_readings('path/to/input/files/folder', index=True)
+        >>> processor.blocks.columns.tolist()
+        ['File', 'Header offset', 'Spectrum offset', 'Matrix offset', 'End offset']
+        """
+        self.metrics = None
+        """
+        Wall times and counters of the processing stages (Metrics or None). Default None.
+
+        Assign a Metrics object to record them. If None, nothing is recorded.
+
+        Examples
+        --------
+        >>> processor = HidexTDCR('Lu-177', 2023, 11)
+        >>> processor.metrics = Metrics()
+        >>> processor.parse_readings('path/to/input/files/folder')
+        >>> processor.metrics.counters['blocks parsed']
+        4
+        """
+
+    @property
+    def readings(self):
+        """
+        DataFrame containing the readings (pandas.DataFrame or None). Default None.
+
+        Assigning a new DataFrame clears the cached summary, statistics and processed measurements derived from the
+        previous readings, and downcasts it in compact mode. Modify the readings by assigning a new DataFrame, not in
+        place.
+
+        Examples
+        --------
+        >>> processor = HidexTDCR('Lu-177', 2023, 11)
+        >>> processor.parse_readings('path/to/input/files/folder')
+        >>> processor.readings
+            Cycle  Sample  Repetitions  Count rate (cpm)  Counts (reading)  Dead time Real time (s)            End time
+        1       1            1             83.97               140      1.000           100 2023-11-30 08:44:20
+        1       2            1         252623.23            374237      1.125           100 2023-11-30 08:47:44
+        """
+        return self._readings
+
+    @readings.setter
+    def readings(self, readings):
+        # Downcast the readings in compact mode
+        if readings is not None and self.compact:
+            readings = _compact_frame(readings)
+        self._readings = readings
+        # Clear the values derived from the previous readings
+        self._cache = {}
 
     def __repr__(self):
         return f'DataProcessor(radionuclide={self.radionuclide}, year={self.year}, month={self.month})'
@@ -222,10 +383,11 @@ class Hidex300:
                     f'Total number of measurements: {self.total_measurements}\n'
                     f'Total measurement time: {self.measurement_time} s\n'
                     f'Cycles summary\n'
-                    f'{self._get_readings_summary()}')
+                    f'{self._get_summary_text()}')
         return msg
 
-    def parse_readings(self, folder_path):
+    def parse_readings(self, folder_path, workers=None, engine='python', cache=None, spectra=False, matrices=False,
+                       index=False, fields=None):
         """
         Parses readings from CSV files in the specified folder, generates a summary, and calculates statistics.
 
@@ -233,6 +395,31 @@ class Hidex300:
         ----------
         folder_path : str
             Path to the folder containing the CSV files.
+        workers : int or None
+            Number of worker processes used to parse the CSV files. If 1, the files are parsed in the current process.
+            If None, the number of workers is chosen from the number of CPUs and the number of CSV files.
+            Default is None.
+        engine : str
+            The engine used to parse the CSV files. Options are 'python' (chunked line scanner) or 'mmap' (memory-mapped
+            regular expression scanner). Default is 'python'.
+        cache : bool, str, ParseCache or None
+            The parse cache used to skip parsing unchanged CSV files. If True, a cache is kept in a ".metpyrad_cache"
+            subfolder of the folder of the CSV files. If a string, a cache is kept in that folder. A ParseCache object
+            can be given to set the cache size or to inspect its hits and misses. If None or False, no cache is used.
+            Default is None.
+        spectra : bool
+            If True, the spectra of the readings are also extracted into the spectra attribute. Default is False.
+        matrices : bool
+            If True, the alpha matrices of the readings are also extracted into the matrices attribute.
+            Default is False.
+        index : bool
+            If True, the readings are built from a sidecar block index next to each CSV file, which is written or
+            updated if it is missing or out of date, and the location of each data block is stored in the blocks
+            attribute so that its spectrum or alpha matrix can be read on demand. The engine and the parse cache are
+            not used. Default is False.
+        fields : list of str or None
+            Labels of extra header rows to extract in the same pass, such as 'TDCR', 'DPM', 'QPE', 'Temp' or 'WName'.
+            They are added as readings columns after the default ones. Default is None (no extra rows).
 
         Raises
         ------
@@ -240,23 +427,301 @@ class Hidex300:
             If repetitions per cycle or real time values are not consistent for all measurements.
         ValueError
             If no readings data or no readings summary is available.
+        ValueError
+            If an invalid number of workers, engine, or parse cache is provided.
 
         Examples
         --------
         >>> processor = Hidex300('Lu-177', 2023, 11)
         >>> processor.parse_readings(folder_path='/path/to/folder/')
         Found 2 CSV files in folder /path/to/folder
+
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings(folder_path='/path/to/folder/', workers=4)
+        Found 2 CSV files in folder /path/to/folder
+
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings(folder_path='/path/to/folder/', engine='mmap')
+        Found 2 CSV files in folder /path/to/folder
+
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings(folder_path='/path/to/folder/', cache=True)
+        Found 2 CSV files in folder /path/to/folder
+        Loaded 2 of 2 CSV files from parse cache /path/to/folder/.metpyrad_cache
+
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings(folder_path='/path/to/folder/', index=True)
+        Found 2 CSV files in folder /path/to/folder
+        Loaded block index of 2 CSV files
+
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings(folder_path='/path/to/folder/', fields=['TDCR', 'Temp'])
+        Found 2 CSV files in folder /path/to/folder
+        >>> processor.readings.columns[-2:].tolist()
+        ['TDCR', 'Temperature']
         """
         # Parse the readings from the CSV files in the specified folder
-        self.readings = self._parse_readings(folder_path=folder_path)
+        readings, input_files = self._parse_readings(folder_path=folder_path, workers=workers, engine=engine,
+                                                     cache=cache, spectra=spectra, matrices=matrices, index=index,
+                                                     fields=fields)
+        self.readings = readings
+        # Record the CSV files of the readings, so that they are not added again
+        self._cache['files'] = set(input_files)
         # Calculate statistics from the readings summary
-        statistics = self._get_readings_statistics()
-        # Assign the calculated statistics to the corresponding attributes
-        self.cycles = statistics['cycles']
-        self.cycle_repetitions = statistics['cycle_repetitions']
-        self.repetition_time = statistics['repetition_time']
-        self.total_measurements = statistics['measurements']
-        self.measurement_time = statistics['measurement_time']
+        self._set_readings_statistics()
+
+    def iter_blocks(self, path, fields=None):
+        """
+        Iterates over the data blocks of a CSV file or of the CSV files in a folder, one block at a time.
+
+        Only the data block being read and a chunk of the current file are held in memory, so arbitrarily large
+        amounts of readings can be streamed, and the iteration can be stopped at any time.
+
+        Parameters
+        ----------
+        path : str
+            Path to a CSV file or to a folder containing the CSV files.
+        fields : list of str or None
+            Labels of extra header rows to extract. Default is None (no extra rows).
+
+        Yields
+        ------
+        dict
+            A record for each data block, with the path of the CSV file under 'File' and the header rows under the
+            names of the readings columns, converted to integers, floats, or datetimes.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> next(processor.iter_blocks('/path/to/folder/file1.csv'))
+        {'File': '/path/to/folder/file1.csv', 'Sample': 1, 'Repetition': 1, 'Count rate (cpm)': 83.97, 'Counts (reading)': 140, 'Dead time': 1.0, 'Real time (s)': 100, 'End time': datetime.datetime(2023, 11, 30, 8, 44, 20)}
+        """
+        # Get the rows to extract and the CSV file or the list of CSV files in the folder
+        rows = self._get_rows(fields)
+        input_files = [os.path.abspath(path)] if os.path.isfile(path) else _get_csv_files(path)
+        for input_file in input_files:
+            for block in _iter_csv_file(input_file, rows=rows):
+                # Rename the header rows to the names of the readings columns
+                record = {'File': input_file}
+                record.update((self._ROW_NAMES.get(row, row), value) for row, value in block.items())
+                yield record
+
+    def read_spectrum(self, item):
+        """
+        Reads the spectrum of a measurement from its CSV file on demand.
+
+        Only the spectrum section of the data block is read, seeking to its byte offset in the block index.
+
+        Parameters
+        ----------
+        item : int
+            The position of the measurement in the readings.
+
+        Returns
+        -------
+        numpy.ndarray
+            Integer array of shape (1024, 4) with the Alpha, Beta, Alpha Triple and Beta Triple counts of each channel.
+
+        Raises
+        ------
+        ValueError
+            If the readings are not parsed with the block index.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings('/path/to/folder', index=True)
+        Found 2 CSV files in folder /path/to/folder
+        Loaded block index of 2 CSV files
+        >>> processor.read_spectrum(0).shape
+        (1024, 4)
+        """
+        rows = self._read_block_section(item, 'Spectrum offset', 'Matrix offset')
+        if rows.shape != (self._SPECTRUM_CHANNELS, 5):
+            raise ValueError(f'Spectrum without {self._SPECTRUM_CHANNELS} channels for measurement {item}.')
+        return rows[:, 1:]
+
+    def read_matrix(self, item):
+        """
+        Reads the alpha matrix of a measurement from its CSV file on demand.
+
+        Only the alpha matrix section of the data block is read, seeking to its byte offset in the block index.
+
+        Parameters
+        ----------
+        item : int
+            The position of the measurement in the readings.
+
+        Returns
+        -------
+        numpy.ndarray
+            Integer array of shape (32, 64) with the alpha matrix.
+
+        Raises
+        ------
+        ValueError
+            If the readings are not parsed with the block index.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings('/path/to/folder', index=True)
+        Found 2 CSV files in folder /path/to/folder
+        Loaded block index of 2 CSV files
+        >>> processor.read_matrix(0).shape
+        (32, 64)
+        """
+        rows = self._read_block_section(item, 'Matrix offset', 'End offset')
+        if rows.shape != (self._MATRIX_ROWS, AlphaMatrices._COLUMNS):
+            raise ValueError(f'Alpha matrix without {self._MATRIX_ROWS} rows for measurement {item}.')
+        return rows
+
+    def add_readings(self, path, engine='python'):
+        """
+        Adds the readings of new CSV files to the parsed readings without parsing the previous files again.
+
+        The new readings are merged into the readings table in chronological order and the cycles are renumbered.
+        The measurement attributes and the processed background, sample, and net measurements are updated. The elapsed
+        times are rebased if the new readings are earlier than the previous first measurement.
+
+        Parameters
+        ----------
+        path : str
+            Path to a new CSV file or to a folder containing the new CSV files.
+        engine : str
+            The engine used to parse the CSV files. Options are 'python' or 'mmap'. Default is 'python'.
+
+        Raises
+        ------
+        ValueError
+            If no readings data is available.
+        ValueError
+            If repetitions per cycle or real time values of the new readings are not consistent with the previous ones.
+        ValueError
+            If the new readings are already in the readings table.
+        ValueError
+            If an invalid engine is provided.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings(folder_path='/path/to/folder')
+        Found 2 CSV files in folder /path/to/folder
+        >>> processor.process_readings('all')
+        >>> processor.add_readings('/path/to/new/file.csv')
+        Added 1 cycles from /path/to/new/file.csv
+        >>> processor.cycles
+        3
+        """
+        # Check if readings data is available
+        if self.readings is None:
+            raise ValueError('No readings data to add new readings to. Please read the CSV files first.')
+        # Check if the provided engine is valid
+        if engine not in self._ENGINES:
+            raise ValueError('Invalid parser engine. Choose from "python" or "mmap".')
+        # Get the new CSV file or the list of new CSV files in the folder
+        with self._stage('discovery'):
+            input_files = [os.path.abspath(path)] if os.path.isfile(path) else _get_csv_files(path)
+        # Parse the new CSV files with the same rows as the previous readings, numbering them after the previous cycles
+        previous_cycles = int(self.readings['Cycle'].max())
+        names = {name: row for row, name in self._ROW_NAMES.items()}
+        rows = [names[column] for column in self.readings.columns if column in names]
+        with self._stage('conversion'):
+            new_readings = self._get_blocks_frame(_parse_files(input_files, 1, engine, rows),
+                                                  first_file=previous_cycles + 1, rows=rows)
+        if self.metrics is not None:
+            self._count_parsed_files(input_files, list(range(len(input_files))), new_readings,
+                                     first_file=previous_cycles + 1)
+        # Check that the new readings are not already in the readings table, nor repeated among the new CSV files
+        key = ['Sample', 'Repetition', 'End time']
+        duplicated = pd.concat([self.readings[key], new_readings[key]], ignore_index=True).duplicated()
+        duplicated = duplicated.to_numpy()[len(self.readings):]
+        if duplicated.any():
+            files = [input_files[i - previous_cycles - 1] for i in np.unique(new_readings['Cycle'][duplicated])]
+            raise ValueError(f'Duplicated readings in CSV files {files}. They are already in the readings table.')
+        # Extract the spectra, alpha matrices and block locations of the new readings
+        new_spectra, new_matrices, new_blocks = [], [], None
+        if self.spectra is not None:
+            with self._stage('spectra'):
+                new_spectra = _read_files(_read_spectra, input_files, 1)
+        if self.matrices is not None:
+            with self._stage('matrices'):
+                new_matrices = _read_files(_read_matrices, input_files, 1)
+        if self.blocks is not None:
+            with self._stage('parse'):
+                new_blocks = _get_blocks_offsets(input_files, _read_files(_get_block_index, input_files, 1))
+        with self._stage('sort'):
+            # Merge the new readings into the previous ones and renumber the cycles
+            merged = pd.concat([self.readings, new_readings], ignore_index=True)
+            files = merged.sort_values(by='End time', kind='stable')['Cycle'].to_numpy()
+            readings = self._sort_readings(merged)
+            # Merge the spectra, alpha matrices and block locations of the new readings into the previous ones
+            spectra = None
+            if self.spectra is not None:
+                spectra = _sort_blocks(np.concatenate([self.spectra, *new_spectra]), merged)
+            blocks = None
+            if self.blocks is not None:
+                blocks = _sort_blocks(pd.concat([self.blocks, new_blocks], ignore_index=True), merged)
+            matrices = None
+            if self.matrices is not None:
+                matrices = _sort_blocks(AlphaMatrices.concatenate([self.matrices, *new_matrices]), merged)
+        # Map the previous cycle numbers to the new ones and select the new readings
+        cycles = dict(zip(files, readings['Cycle']))
+        new_readings = readings[files > previous_cycles]
+        # Calculate the statistics of the new cycles
+        if self.repetition_time is not None and not (new_readings['Real time (s)'] == self.repetition_time).all():
+            raise ValueError('Real time values are not consistent for all measurements. Check readings table.')
+        repetitions = new_readings.groupby('Cycle')['Repetition'].max()
+        # Process the new background and sample measurements and merge them into the previous ones
+        processed = {}
+        ids = {'background': self._BACKGROUND_ID, 'sample': self._SAMPLE_ID}
+        with self._stage('process'):
+            for kind in ['background', 'sample']:
+                df = getattr(self, kind)
+                if df is None:
+                    continue
+                time_unit = _get_time_unit(df)
+                new_df = new_readings[new_readings['Sample'] == ids[kind]].reset_index(drop=True)
+                # Rebase the elapsed times if the new measurements are earlier than the previous ones
+                initial_time = min(df['End time'].min(), new_df['End time'].min())
+                new_df = _process_measurements(new_df, time_unit, initial_time=initial_time)
+                df = df.copy()
+                df['Cycle'] = df['Cycle'].map(cycles)
+                if initial_time < df['End time'].min():
+                    df['Elapsed time'], df[f'Elapsed time ({time_unit})'] = _get_elapsed_time(df, time_unit,
+                                                                                              initial_time)
+                df = pd.concat([df, new_df], ignore_index=True)
+                df = df.sort_values(by='End time', kind='stable').reset_index(drop=True)
+                processed[kind] = _compact_frame(df) if self.compact else df
+            # Process the net measurements from the merged background and sample measurements
+            net = None
+            if self.net is not None:
+                net = self._get_net_measurements(time_unit=_get_time_unit(self.net),
+                                                 background=processed.get('background'),
+                                                 sample=processed.get('sample'))
+                net = _compact_frame(net) if self.compact else net
+        # Update the readings, the measurement attributes and the processed measurements once all the checks passed
+        files = self._cache.get('files', set()) | set(input_files)
+        self.readings = readings
+        self._cache['files'] = files
+        if spectra is not None:
+            self.spectra = spectra
+        if matrices is not None:
+            self.matrices = matrices
+        if blocks is not None:
+            self.blocks = blocks
+        if self.cycles is None:
+            self._set_readings_statistics()
+        else:
+            self.cycles += repetitions.size
+            self.total_measurements += repetitions.sum()
+            self.measurement_time += (repetitions * self.repetition_time).sum()
+        for kind, df in processed.items():
+            setattr(self, kind, df)
+        if net is not None:
+            self.net = net
+        self._count('rows produced', len(new_readings) + sum(len(df) for df in processed.values()))
+        print(f'Added {repetitions.size} cycles from {path}')
 
     def summarize_readings(self, save=False, folder_path=None):
         """
@@ -298,9 +763,10 @@ class Hidex300:
         # If save is True, save the summary to a text file
         if save:
             # Open the file in write mode
-            with open(f'{folder_path}/summary.txt', 'w') as file:
+            with self._stage('export'), open(f'{folder_path}/summary.txt', 'w') as file:
                 # Write the string representation of the object to the file
                 file.write(self.__str__())
+            self._count_written_file(f'{folder_path}/summary.txt')
             print(f'Summary saved to {folder_path}/summary.txt')
         else:
             # Print the string representation of the object
@@ -310,6 +776,9 @@ class Hidex300:
         """
         Processes the specified type of measurements (background, sample, net, or all).
 
+        The processed measurements are cached: processing them again with the same readings and time unit reuses them.
+        The net measurements are also processed again if the background or sample measurements have been replaced.
+
         Parameters
         ----------
         kind : str
@@ -347,25 +816,22 @@ class Hidex300:
          1       2            1         252623.23            374237      1.125           100 2023-11-30 08:47:44      88.888889 0 days 00:00:00              0.0  374256.637037          611.765181                0.163461
          1       2            2         251953.09            373593      1.124           100 2023-11-30 08:54:28      88.967972 0 days 00:06:44         6.733333  373595.922301          611.224936                0.163606
         """
-        # Process background measurements
-        if kind == 'background':
-            self.background = self._get_background_sample(kind='background', time_unit=time_unit)
-        # Process sample measurements
-        elif kind == 'sample':
-            self.sample = self._get_background_sample(kind='sample', time_unit=time_unit)
-        # Process net measurements
-        elif kind == 'net':
-            self.net = self._get_net_measurements(time_unit=time_unit)
-        # Process all types of measurements
-        elif kind == 'all':
-            self.background = self._get_background_sample(kind='background', time_unit=time_unit)
-            self.sample = self._get_background_sample(kind='sample', time_unit=time_unit)
-            self.net = self._get_net_measurements(time_unit=time_unit)
-        # Raise an error if the kind is invalid
-        else:
+        # Check if the provided kind is valid
+        if kind not in ['background', 'sample', 'net', 'all']:
             raise ValueError(f'Invalid measurement kind. Choose from "background", "sample", "net" or "all".')
+        with self._stage('process'):
+            # Process background measurements
+            if kind in ['background', 'all']:
+                self.background = self._get_processed('background', time_unit)
+            # Process sample measurements
+            if kind in ['sample', 'all']:
+                self.sample = self._get_processed('sample', time_unit)
+            # Process net measurements
+            if kind in ['net', 'all']:
+                self.net = self._get_processed('net', time_unit)
 
-    def _parse_readings(self, folder_path):
+    def _parse_readings(self, folder_path, workers=None, engine='python', cache=None, spectra=False,
+                        matrices=False, index=False, fields=None):
         """
         Parses readings from CSV files in the specified folder and returns a DataFrame.
 
@@ -373,77 +839,289 @@ class Hidex300:
         ----------
         folder_path : str
             Path to the folder containing the CSV files.
+        workers : int or None
+            Number of worker processes used to parse the CSV files. Default is None (automatic).
+        engine : str
+            The engine used to parse the CSV files. Options are 'python' or 'mmap'. Default is 'python'.
+        cache : bool, str, ParseCache or None
+            The parse cache used to skip parsing unchanged CSV files. Default is None (no cache).
+        spectra : bool
+            If True, the spectra of the readings are extracted into the spectra attribute, aligned with the returned
+            readings. Else, the spectra attribute is cleared. Default is False.
+        matrices : bool
+            If True, the alpha matrices of the readings are extracted into the matrices attribute, aligned with the
+            returned readings. Else, the matrices attribute is cleared. Default is False.
+        index : bool
+            If True, the readings are built from the sidecar block index of each CSV file and the location of the data
+            blocks is stored in the blocks attribute, aligned with the returned readings. Else, the blocks attribute
+            is cleared. Default is False.
+        fields : list of str or None
+            Labels of extra header rows to extract. Default is None (no extra rows).
 
         Returns
         -------
-        pandas.DataFrame
-            The parsed readings.
+        tuple
+            The parsed readings (pandas.DataFrame) and the paths to the parsed CSV files (list of str).
 
         Raises
         ------
         ValueError
             If repetitions per cycle are not consistent for all measurements.
+        ValueError
+            If an invalid number of workers, engine, parse cache or header field is provided.
         """
+        # Check if the provided engine is valid
+        if engine not in self._ENGINES:
+            raise ValueError('Invalid parser engine. Choose from "python" or "mmap".')
+        rows = self._get_rows(fields)
         # Retrieve a list of CSV files from the specified folder
-        input_files = _get_csv_files(folder_path)
-        # Initialize a list to store extracted data
-        extracted_data = []
-        # Iterate over each CSV file
-        for file_number, input_file in enumerate(input_files, start=1):
-            # Open the current CSV file
-            with open(input_file, 'r') as file:
-                # Read all lines from the file
-                lines = file.readlines()
-                # Initialize a dictionary to store the current data block
-                current_block = {}
-                # Iterate over the lines, skipping the initial ID lines
-                for line in lines[self._ID_LINES:]:
-                    # Check if the line indicates the start of a new data block
-                    if line.strip() == self._BLOCK_STARTER:
-                        # If there is an existing data block, append it to the extracted data
-                        if current_block:
-                            extracted_data.append(current_block)
-                        # Initialize a new data block with the file number
-                        current_block = {'file': file_number}
-                    else:
-                        # Extract relevant rows from the line
-                        for row in self._ROWS_TO_EXTRACT:
-                            if line.startswith(row):
-                                current_block[row] = line.split(self._DELIMITER)[1].strip()
-                # Append the last data block if it exists
-                if current_block:
-                    extracted_data.append(current_block)
-        # Convert the extracted data to a DataFrame
-        df = pd.DataFrame(extracted_data, columns=self._ROWS_TO_EXTRACT + ['file'])
-        # Convert relevant columns to numeric values
-        for col in df.columns[:-2]:
-            df[col] = pd.to_numeric(df[col])
-        # Convert the date and time column to datetime format
-        df[df.columns[-2]] = pd.to_datetime(df[df.columns[-2]], format=self._DATE_TIME_FORMAT)
+        with self._stage('discovery'):
+            input_files = _get_csv_files(folder_path)
+        self.blocks = None
+        with self._stage('parse'):
+            if index:
+                # Get the modification times of the block index files to tell which ones are rebuilt
+                stamps = _get_index_stamps(input_files) if self.metrics is not None else None
+                # Load the header rows and the block offsets from the block index of each CSV file
+                indexes = _read_files(_get_block_index, input_files, workers)
+                parsed_files = [{row: columns[row] for row in rows if row in columns} for columns in indexes]
+                parsed = [] if stamps is None else np.flatnonzero(_get_index_stamps(input_files) != stamps).tolist()
+                print(f'Loaded block index of {len(input_files)} CSV files')
+            elif not cache:
+                # Extract the header rows of each data block of each CSV file, keeping the order of the files
+                parsed_files = _parse_files(input_files, workers, engine, rows)
+                parsed = list(range(len(input_files)))
+            else:
+                cache = _get_parse_cache(cache, folder_path)
+                # Load the CSV files found in the parse cache
+                parsed_files = [cache.load(input_file, rows) for input_file in input_files]
+                # Parse the CSV files missing from the parse cache and store them
+                parsed = [i for i, columns in enumerate(parsed_files) if columns is None]
+                for i, columns in zip(parsed, _parse_files([input_files[i] for i in parsed], workers, engine, rows)):
+                    parsed_files[i] = columns
+                    cache.save(input_files[i], columns)
+                cache.flush()
+                print(f'Loaded {len(input_files) - len(parsed)} of {len(input_files)} CSV files from parse cache '
+                      f'{cache.folder_path}')
+        # Convert the data blocks to a DataFrame
+        with self._stage('conversion'):
+            df = self._get_blocks_frame(parsed_files, rows=rows)
+        if self.metrics is not None:
+            self._count_parsed_files(input_files, parsed, df)
+        # Extract the spectra and alpha matrices
+        spectra_blocks, matrix_blocks = None, None
+        if spectra:
+            with self._stage('spectra'):
+                spectra_blocks = np.concatenate(_read_files(_read_spectra, input_files, workers))
+        if matrices:
+            with self._stage('matrices'):
+                matrix_blocks = AlphaMatrices.concatenate(_read_files(_read_matrices, input_files, workers))
+        # Sort the readings into cycles, with the data blocks locations, spectra and alpha matrices in the same order
+        with self._stage('sort'):
+            if index:
+                self.blocks = _sort_blocks(_get_blocks_offsets(input_files, indexes), df)
+            self.spectra = None if spectra_blocks is None else _sort_blocks(spectra_blocks, df)
+            self.matrices = None if matrix_blocks is None else _sort_blocks(matrix_blocks, df)
+            df = self._sort_readings(df)
+        self._count('rows produced', len(df))
+        return df, input_files
+
+    def _get_rows(self, fields=None):
+        """
+        Gets the labels of the header rows to extract from the CSV files.
+
+        Parameters
+        ----------
+        fields : list of str or None
+            Labels of extra header rows to extract. Default is None (no extra rows).
+
+        Returns
+        -------
+        list of str
+            The labels of the default rows followed by the extra rows.
+
+        Raises
+        ------
+        ValueError
+            If a header field is not in the registry.
+        """
+        rows = list(self._ROWS_TO_EXTRACT)
+        for field in fields or []:
+            if field not in self._FIELDS:
+                extra = ', '.join(f'"{row}"' for row in self._FIELDS if row not in self._ROWS_TO_EXTRACT)
+                raise ValueError(f'Invalid header field. Choose from {extra}.')
+            if field not in rows:
+                rows.append(field)
+        return rows
+
+    def _stage(self, name):
+        """
+        Gets a context manager that records the wall time of a stage in the metrics, if they are enabled.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+
+        Returns
+        -------
+        contextlib.AbstractContextManager
+            The context manager of the stage, or a context manager that does nothing if the metrics are disabled.
+        """
+        return self._NO_STAGE if self.metrics is None else self.metrics.stage(name)
+
+    def _count(self, name, value=1):
+        """
+        Increments a counter of the metrics, if they are enabled.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        value : int
+            The increment. Default is 1.
+        """
+        if self.metrics is not None:
+            self.metrics.count(name, value)
+
+    def _count_written_file(self, file_path):
+        """
+        Counts a written file and its bytes in the metrics, if they are enabled.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the written file.
+        """
+        if self.metrics is not None:
+            self.metrics.count('files written')
+            self.metrics.count('bytes written', os.path.getsize(file_path))
+
+    def _count_parsed_files(self, input_files, parsed, df, first_file=1):
+        """
+        Counts the CSV files found and the files, bytes and data blocks parsed.
+
+        Parameters
+        ----------
+        input_files : list of str
+            The paths to the CSV files found.
+        parsed : list of int
+            The positions in input_files of the CSV files parsed, as opposed to loaded from the parse cache or the
+            block index.
+        df : pandas.DataFrame
+            The data blocks of all the CSV files, with the position in input_files plus first_file in the 'Cycle'
+            column, before being sorted.
+        first_file : int
+            The number of the first CSV file in the 'Cycle' column. Default is 1.
+        """
+        self._count('files', len(input_files))
+        self._count('files parsed', len(parsed))
+        self._count('bytes read', sum(os.path.getsize(input_files[i]) for i in parsed))
+        self._count('blocks parsed', np.isin(df['Cycle'].to_numpy(), np.add(parsed, first_file)).sum())
+
+    def _read_block_section(self, item, start, end):
+        """
+        Reads the rows of a section of the data block of a measurement from its CSV file.
+
+        Parameters
+        ----------
+        item : int
+            The position of the measurement in the readings.
+        start : str
+            The name of the offset column of the section in the blocks table.
+        end : str
+            The name of the offset column of the end of the section in the blocks table.
+
+        Returns
+        -------
+        numpy.ndarray
+            Integer array with the rows of the section, without its starter line.
+
+        Raises
+        ------
+        ValueError
+            If the readings are not parsed with the block index.
+        """
+        if self.blocks is None:
+            raise ValueError('No block index data to read from. Please read the CSV files with the block index first.')
+        block = self.blocks.iloc[item]
+        with open(block['File'], 'rb') as file:
+            file.seek(block[start])
+            section = file.read(block[end] - block[start])
+        # Skip the section starter line
+        section = section[section.find(b'\n') + 1:] if b'\n' in section else b''
+        return np.loadtxt(io.BytesIO(section), delimiter=self._DELIMITER, dtype=np.int64, ndmin=2)
+
+    def _get_blocks_frame(self, parsed_files, first_file=1, rows=None):
+        """
+        Converts the data blocks of the parsed CSV files to a DataFrame, tagging them with the file number.
+
+        Parameters
+        ----------
+        parsed_files : iterable of dict
+            The parsed CSV files, each one a dictionary mapping the extracted rows to NumPy arrays with a value for
+            each data block.
+        first_file : int
+            The number of the first CSV file. Default is 1.
+        rows : list of str or None
+            The labels of the extracted rows. Default is None (the default rows).
+
+        Returns
+        -------
+        pandas.DataFrame
+            The data blocks, with the file number in the 'Cycle' column and the header rows in the readings columns.
+        """
+        rows = rows or self._ROWS_TO_EXTRACT
+        # Tag the data blocks of each CSV file with the file number
+        parsed_files = list(parsed_files)
+        for file_number, columns in enumerate(parsed_files, start=first_file):
+            columns['file'] = np.full(len(columns['EndTime']), file_number)
+        # Concatenate the columns of all the CSV files into a DataFrame, empty if there are no CSV files
+        df = pd.DataFrame({col: np.concatenate([columns[col] for columns in parsed_files]) if parsed_files else []
+                           for col in rows + ['file']})
+        # Move the last column to be the first
+        cols = df.columns.tolist()
+        cols = [cols[-1]] + cols[:-1]
+        df = df[cols]
+        # Rename columns for clarity
+        return df.rename(columns={'file': 'Cycle', **self._ROW_NAMES})
+
+    def _sort_readings(self, df):
+        """
+        Sorts the readings by end time and numbers the cycles according to chronological order.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            The readings, with an identifier of the CSV file of each data block in the 'Cycle' column.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The sorted readings, with the cycle numbers in the 'Cycle' column.
+
+        Raises
+        ------
+        ValueError
+            If repetitions per cycle are not consistent for all measurements.
+        """
         # Sort the DataFrame by the end time
-        df = df.sort_values(by='EndTime')
+        df = df.sort_values(by='End time', kind='stable')
         df = df.reset_index(drop=True)
         # Check if repetitions per cycle are consistent for all measurements
-        value_counts = df['file'].value_counts()
+        value_counts = df['Cycle'].value_counts()
         if not value_counts.nunique() == 1:
             raise ValueError('Repetitions per cycle are not consistent for all measurements.')
         # Reassign values to files according to chronological order
-        df['file'] = [i for i in range(1, df['file'].unique().size + 1) for _ in range(value_counts.unique()[0])]
-        # Move the last column to be the first
-        cols = df.columns.tolist()
-        cols = [cols[-1]] + cols[:-1]
-        df = df[cols]
-        # Rename columns for clarity
-        old_names = ['file', 'Samp.', 'Repe.', 'CPM', 'Counts', 'DTime', 'Time', 'EndTime']
-        new_names = ['Cycle', 'Sample', 'Repetition', 'Count rate (cpm)', 'Counts (reading)', 'Dead time',
-                     'Real time (s)', 'End time']
-        df = df.rename(columns=dict(zip(old_names, new_names)))
+        df['Cycle'] = [i for i in range(1, df['Cycle'].unique().size + 1) for _ in range(value_counts.unique()[0])]
         return df
 
     def _get_readings_summary(self):
         """
         Generates a summary of the readings and returns it as a DataFrame.
 
+        The summary is cached until the readings are replaced.
+
         Returns
         -------
         pandas.DataFrame
@@ -455,35 +1133,32 @@ class Hidex300:
             If no readings data is available or if real time values are not consistent for all measurements.
         """
         # Check if readings data is available
-        if self.readings is not None:
-            # Check if real time values are consistent for all measurements
-            if not self.readings['Real time (s)'].nunique() == 1:
-                raise ValueError('Real time values are not consistent for all measurements. Check readings table.')
-            # Initialize a list to store the results
-            results = []
-            # Iterate over each unique cycle
-            for cycle in self.readings['Cycle'].unique():
-                # Filter the DataFrame for the current cycle
-                df = self.readings[self.readings['Cycle'] == cycle]
-                # Get the maximum number of repetitions for the current cycle
-                repetitions = df['Repetition'].max()
-                # Get the real time for the repetitions (assuming it's the same for all repetitions of a single cycle)
-                real_time = df['Real time (s)'].iloc[0]
-                # Get the earliest end time for the current cycle
-                start_time = df['End time'].min()
-                # Append the results to the list
-                results.append(
-                    {'Cycle': cycle, 'Repetitions': repetitions, 'Real time (s)': real_time, 'Date': start_time})
-            # Convert the results to a DataFrame
-            return pd.DataFrame(results, columns=['Cycle', 'Repetitions', 'Real time (s)', 'Date'])
-        else:
-            # Raise an error if no readings data is available
+        if self.readings is None:
             raise ValueError('No readings data to compute readings summary. Please read the CSV files first.')
+        # Return the cached summary of the current readings
+        if 'summary' in self._cache:
+            return self._cache['summary']
+        # Check if real time values are consistent for all measurements
+        if not self.readings['Real time (s)'].nunique() == 1:
+            raise ValueError('Real time values are not consistent for all measurements. Check readings table.')
+        # Aggregate the readings of each cycle in order of appearance: the maximum number of repetitions, the real
+        # time of the first repetition (it is the same for all of them) and the earliest end time
+        cycles = self.readings.groupby('Cycle', sort=False)
+        summary = pd.DataFrame({
+            'Cycle': _widen_integers(cycles.size().index.to_numpy()),
+            'Repetitions': _widen_integers(cycles['Repetition'].max().to_numpy()),
+            'Real time (s)': _widen_integers(cycles['Real time (s)'].first().to_numpy()),
+            'Date': cycles['End time'].min().to_numpy(),
+        })
+        self._cache['summary'] = summary
+        return summary
 
     def _get_readings_statistics(self):
         """
         Calculates statistics from the readings summary and returns them as a dictionary.
 
+        The statistics are cached until the readings are replaced.
+
         Returns
         -------
         dict
@@ -494,6 +1169,9 @@ class Hidex300:
         ValueError
             If repetitions per cycle are not consistent for all measurements.
         """
+        # Return the cached statistics of the current readings
+        if 'statistics' in self._cache:
+            return self._cache['statistics']
         summary = self._get_readings_summary()
         # Calculate the number of unique cycles
         cycles = summary['Cycle'].count()
@@ -509,11 +1187,75 @@ class Hidex300:
         labels = ['cycles', 'cycle_repetitions', 'repetition_time', 'measurements', 'measurement_time']
         values = [cycles, cycle_repetitions, repetition_time, measurements, measurement_time]
         statistics = dict(zip(labels, values))
+        self._cache['statistics'] = statistics
         return statistics
 
-    def _get_background_sample(self, kind, time_unit='s'):
+    def _set_readings_statistics(self):
         """
-        Processes background or sample measurements and returns them as a DataFrame.
+        Calculates statistics from the readings summary and assigns them to the measurement attributes.
+
+        Raises
+        ------
+        ValueError
+            If no readings data is available or if real time values are not consistent for all measurements.
+        """
+        statistics = self._get_readings_statistics()
+        # Assign the calculated statistics to the corresponding attributes
+        self.cycles = statistics['cycles']
+        self.cycle_repetitions = statistics['cycle_repetitions']
+        self.repetition_time = statistics['repetition_time']
+        self.total_measurements = statistics['measurements']
+        self.measurement_time = statistics['measurement_time']
+
+    def _get_summary_text(self):
+        """
+        Gets the cycles summary of the readings formatted as text, caching it until the readings are replaced.
+
+        Returns
+        -------
+        str
+            The cycles summary as a table.
+        """
+        if 'summary text' not in self._cache:
+            self._cache['summary text'] = str(self._get_readings_summary())
+        return self._cache['summary text']
+
+    def _get_processed(self, kind, time_unit='s'):
+        """
+        Gets the processed measurements of the specified type from the cache, processing them if they are not cached
+        for the current readings and time unit.
+
+        Parameters
+        ----------
+        kind : str
+            The type of measurements. Options are 'background', 'sample' or 'net'.
+        time_unit : str
+            The unit of time for the measurements. Default is seconds ('s').
+
+        Returns
+        -------
+        pandas.DataFrame
+            The processed measurements.
+        """
+        # The net measurements are derived from the current background and sample measurements
+        sources = [self.background, self.sample] if kind == 'net' else []
+        entry = self._cache.get(kind)
+        if (entry is None or entry[0] != time_unit or len(entry[1]) != len(sources)
+                or any(cached is not source for cached, source in zip(entry[1], sources))):
+            if kind == 'net':
+                df = self._get_net_measurements(time_unit=time_unit)
+            else:
+                df = self._get_background_sample(kind=kind, time_unit=time_unit)
+            # Downcast the processed measurements in compact mode
+            if self.compact:
+                df = _compact_frame(df)
+            self._count('rows produced', len(df))
+            entry = self._cache[kind] = (time_unit, sources, df)
+        return entry[2]
+
+    def _get_background_sample(self, kind, time_unit='s'):
+        """
+        Processes background or sample measurements and returns them as a DataFrame.
 
         Parameters
         ----------
@@ -537,36 +1279,31 @@ class Hidex300:
         if self.readings is not None:
             # Define identifiers for background and sample measurements
             ids = {'background': self._BACKGROUND_ID, 'sample': self._SAMPLE_ID}
-            # Create a copy of the readings DataFrame
-            df = self.readings.copy()
-            # Filter the DataFrame for the specified kind (background or sample)
-            df = df[df['Sample'] == ids[kind]].reset_index(drop=True)
-            # Calculate the elapsed time and its unit
-            elapsed_time, elapsed_time_unit = _get_elapsed_time(df, time_unit)
-            # Calculate the live time
-            df['Live time (s)'] = df['Real time (s)'] / df['Dead time']
-            # Add the elapsed time to the DataFrame
-            df['Elapsed time'] = elapsed_time
-            df[f'Elapsed time ({time_unit})'] = elapsed_time_unit
-            # Calculate the counts
-            df['Counts'] = df['Count rate (cpm)'] * df['Live time (s)'] / 60
-            # Calculate the counts uncertainty
-            df['Counts uncertainty'] = df['Counts'].pow(1 / 2)
-            # Calculate the counts uncertainty percentage
-            df['Counts uncertainty (%)'] = df['Counts uncertainty'] / df['Counts'] * 100
-            return df
+            # Filter the readings for the specified kind (background or sample), which copies only the selected rows
+            df = self.readings.take(np.flatnonzero(self.readings['Sample'].to_numpy() == ids[kind]))
+            df.index = pd.RangeIndex(len(df))
+            # Calculate the derived quantities
+            return _process_measurements(df, time_unit)
         else:
             # Raise an error if no readings data is available
             raise ValueError(f'No readings data to compute {kind} measurements. Please read the CSV files first.')
 
-    def _get_net_measurements(self, time_unit='s'):
+    def _get_net_measurements(self, time_unit='s', background=None, sample=None):
         """
         Processes net measurements from background and sample measurements and returns them as a DataFrame.
 
+        The sample and background measurements are paired by cycle and repetition, so the net measurements are
+        correct for any order of the measurements. The sample measurements without a background measurement of the
+        same cycle and repetition are skipped.
+
         Parameters
         ----------
         time_unit : str
             The unit of time for the measurements. Default is seconds ('s').
+        background : pandas.DataFrame or None
+            The processed background measurements. Default is None (the background attribute).
+        sample : pandas.DataFrame or None
+            The processed sample measurements. Default is None (the sample attribute).
 
         Returns
         -------
@@ -577,21 +1314,31 @@ class Hidex300:
         ------
         ValueError
             If no background or sample data is available.
+        ValueError
+            If several background measurements have the same cycle and repetition.
         """
+        background = self.background if background is None else background
+        sample = self.sample if sample is None else sample
         # Check if background and sample data are available
-        if self.background is not None and self.sample is not None:
+        if background is not None and sample is not None:
+            # Pair each sample measurement with the background measurement of the same cycle and repetition
+            measurements = len(sample)
+            sample, background = _pair_measurements(sample, background)
+            if len(sample) < measurements:
+                print(f'Skipped {measurements - len(sample)} sample measurements without a background measurement '
+                      f'of the same cycle and repetition.')
             # Create a dictionary to store the net measurements
             data = {
-                'Cycle': self.sample['Cycle'],
-                'Repetition': self.sample['Repetition'],
-                'Elapsed time': self.sample['Elapsed time'],
-                f'Elapsed time ({time_unit})': self.sample[f'Elapsed time ({time_unit})'],
+                'Cycle': sample['Cycle'],
+                'Repetition': sample['Repetition'],
+                'Elapsed time': sample['Elapsed time'],
+                f'Elapsed time ({time_unit})': sample[f'Elapsed time ({time_unit})'],
                 # Calculate net count rate by subtracting background count rate from sample count rate
-                'Count rate (cpm)': self.sample['Count rate (cpm)'] - self.background['Count rate (cpm)'],
+                'Count rate (cpm)': sample['Count rate (cpm)'] - background['Count rate (cpm)'],
                 # Calculate net counts by subtracting background counts from sample counts
-                'Counts': self.sample['Counts'] - self.background['Counts'],
+                'Counts': sample['Counts'] - background['Counts'],
                 # Calculate counts uncertainty using the square root of the sum of sample and background counts
-                'Counts uncertainty': (self.sample['Counts'] + self.background['Counts']).pow(1 / 2),
+                'Counts uncertainty': (sample['Counts'] + background['Counts']).pow(1 / 2),
             }
             # Calculate counts uncertainty percentage
             data['Counts uncertainty (%)'] = data['Counts uncertainty'] / data['Counts'] * 100
@@ -637,6 +1384,343 @@ class Hidex300:
             raise ValueError(
                 'No background, sample, and net data to compile measurements. Please process the readings first.')
 
+    def fit_decay(self, by=None, column='Counts', absolute_sigma=False):
+        """
+        Fits an exponential decay curve to the net measurements by weighted least squares.
+
+        The counts uncertainty of the net measurements weights the fit. See ``fit_decay`` to fit the measurements of
+        several campaigns at once.
+
+        Parameters
+        ----------
+        by : str, list of str or None
+            Columns of the net measurements that split them into series fitted separately, e.g. 'Repetition'. If
+            None, all the net measurements are fitted together. Default is None.
+        column : str
+            The fitted values: 'Counts' or 'Count rate (cpm)'. Default is 'Counts'.
+        absolute_sigma : bool
+            If True, the covariance is computed from the uncertainties as they are. Else, it is scaled by the reduced
+            chi-squared of the fit. Default is False.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A row per series with the fitted activity, decay constant and half-life, their uncertainties and
+            covariance. See ``fit_decay``.
+
+        Raises
+        ------
+        ValueError
+            If no net data is available.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.analyze_readings(input_folder='/path/to/folder', time_unit='d')
+        >>> processor.fit_decay(column='Count rate (cpm)')[['Points', 'Activity', 'Half-life (d)']]
+                        Points       Activity  Half-life (d)
+        Series
+        Lu-177 2023-11       8  252412.074437       6.644092
+        """
+        # Check if net data is available
+        if self.net is None:
+            raise ValueError('No net data to fit. Please process the readings first.')
+        return fit_decay({f'{self.radionuclide} {self.year}-{self.month:02d}': self.net}, by=by, column=column,
+                         absolute_sigma=absolute_sigma)
+
+    def propagate_uncertainty(self, trials=100000, dead_time_uncertainty=0, real_time_uncertainty=0, seed=None,
+                              update=False):
+        """
+        Propagates the uncertainties of the background and sample measurements to the net counts by Monte Carlo.
+
+        The counts of each measurement are computed as count rate * real time / dead time / 60, sampling for every
+        measurement at once the counting statistics of the count rate, the dead time and the real time.
+        The counting statistics are sampled from a normal distribution with the mean and variance of the Poisson
+        distribution of the counts. The trials are processed in chunks of bounded size, so the memory does not grow
+        with the number of trials. Without dead time and real time uncertainties, the result agrees with the analytic
+        uncertainty of the net counts, sqrt(sample counts + background counts).
+
+        Parameters
+        ----------
+        trials : int
+            Number of Monte Carlo trials. Default is 100000.
+        dead_time_uncertainty : float
+            Standard uncertainty of the dead time of each measurement. Default is 0.
+        real_time_uncertainty : float
+            Standard uncertainty of the real time of each measurement (s). Default is 0.
+        seed : int, numpy.random.Generator or None
+            Seed of the random number generator, for reproducible results. Default is None.
+        update : bool
+            If True, the counts uncertainty of the net measurements is replaced by the Monte Carlo one.
+            Default is False.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The mean and the standard deviation of the simulated background, sample and net counts of each
+            measurement.
+
+        Raises
+        ------
+        ValueError
+            If no background or sample data is available, or an invalid number of trials is provided.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.analyze_readings(input_folder='/path/to/folder', time_unit='d')
+        >>> result = processor.propagate_uncertainty(dead_time_uncertainty=0.001, seed=0)
+        >>> result[['Cycle', 'Repetition', 'Counts', 'Counts uncertainty']]
+           Cycle  Repetition         Counts  Counts uncertainty
+        0      1           1  374116.622618          696.277481
+        1      1           2  373448.986725          697.154530
+        2      2           1  209527.133259          499.303030
+        3      2           2  209971.465138          500.867231
+        """
+        # Check if background and sample data are available
+        if self.background is None or self.sample is None:
+            raise ValueError('No background and sample data to propagate the uncertainty. '
+                             'Please process the readings first.')
+        # Check if the number of trials is valid
+        if trials < 2:
+            raise ValueError('Invalid number of trials. Choose at least 2 trials.')
+        # Pair each sample measurement with the background measurement of the same cycle and repetition
+        paired_sample, paired_background = _pair_measurements(self.sample, self.background)
+        with self._stage('uncertainty'):
+            (background, background_uncertainty), (sample, sample_uncertainty), (net, net_uncertainty) = \
+                _propagate_counts(paired_background, paired_sample, trials, dead_time_uncertainty,
+                                  real_time_uncertainty, np.random.default_rng(seed), self._TRIALS_CHUNK_SIZE)
+        # Replace the analytic uncertainty of the net counts, if required
+        if update and self.net is not None:
+            # Build new net measurements, so that the tables held by the callers are not modified
+            net_measurements = self.net.assign(**{
+                'Counts uncertainty': net_uncertainty,
+                'Counts uncertainty (%)': net_uncertainty / self.net['Counts'].to_numpy(dtype=np.float64) * 100,
+            })
+            self.net = _compact_frame(net_measurements) if self.compact else net_measurements
+            # The net measurements are no longer the ones of the analytic propagation
+            self._cache.pop('net', None)
+        return pd.DataFrame({
+            'Cycle': paired_sample['Cycle'],
+            'Repetition': paired_sample['Repetition'],
+            'Background counts': background,
+            'Background counts uncertainty': background_uncertainty,
+            'Sample counts': sample,
+            'Sample counts uncertainty': sample_uncertainty,
+            'Counts': net,
+            'Counts uncertainty': net_uncertainty,
+            'Counts uncertainty (%)': net_uncertainty / net * 100,
+        })
+
+    def bootstrap(self, kind, resamples=1000, column='Count rate (cpm)', confidence=0.95, seed=None, workers=None):
+        """
+        Computes bootstrap confidence intervals of the net measurements by resampling the repetitions of each cycle.
+
+        The resamples of each cycle are drawn at once as an array of indices of its repetitions. With 'cycles', the
+        statistic is the mean of the column over the repetitions of each cycle. With 'decay', each resample of all the
+        cycles is fitted to an exponential decay curve, all the resamples at once, as in ``fit_decay``. The resamples
+        are drawn in chunks with independent seeds spawned from the given seed, so the result does not depend on the
+        number of worker processes.
+
+        Parameters
+        ----------
+        kind : str
+            The statistic to bootstrap. Options are 'cycles' (mean of each cycle) or 'decay' (fitted decay parameters).
+        resamples : int
+            Number of bootstrap resamples. Default is 1000.
+        column : str
+            The resampled values: 'Counts' or 'Count rate (cpm)'. Default is 'Count rate (cpm)'.
+        confidence : float
+            Confidence level of the percentile intervals. Default is 0.95.
+        seed : int or None
+            Seed of the random number generator, for reproducible results. Default is None.
+        workers : int or None
+            Number of worker processes. If None, one worker is used per CPU, but each worker gets at least
+            ``_RESAMPLES_PER_WORKER`` resamples. If 1, the resamples are drawn in the current process. Default is None.
+
+        Returns
+        -------
+        pandas.DataFrame
+            With 'cycles', a row per cycle with its number of repetitions, the mean of the column, its bootstrap
+            standard error and the limits of its confidence interval. With 'decay', a row per fitted parameter
+            (activity, decay constant and half-life) with its estimate, bootstrap standard error and confidence limits.
+
+        Raises
+        ------
+        ValueError
+            If an invalid kind, column, number of resamples or confidence level is provided.
+        ValueError
+            If no net data is available.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.analyze_readings(input_folder='/path/to/folder', time_unit='d')
+        >>> processor.bootstrap('cycles', seed=0)
+           Cycle  Repetitions  Mean count rate (cpm)  Standard error  Lower limit  Upper limit
+        0      1            2             252202.390      234.235496    251865.52    252539.26
+        1      2            2             134161.095       99.416485    134019.07    134303.12
+        2      3            2              72200.670       40.808249     72143.55     72257.79
+        3      4            2              25359.240      158.731339     25138.59     25579.89
+        >>> processor.bootstrap('decay', seed=0)
+                                   Estimate  Standard error    Lower limit    Upper limit
+        Parameter
+        Activity              252412.074437      205.111559  252023.104066  252797.078519
+        Decay constant (1/d)       0.104325        0.000176       0.104018       0.104631
+        Half-life (d)              6.644092        0.011210       6.624710       6.663730
+        """
+        # Check if the provided kind is valid
+        if kind not in ['cycles', 'decay']:
+            raise ValueError('Invalid bootstrap kind. Choose from "cycles" or "decay".')
+        if column not in ['Counts', 'Count rate (cpm)']:
+            raise ValueError('Invalid bootstrap column. Choose from "Counts" or "Count rate (cpm)".')
+        if isinstance(resamples, bool) or not isinstance(resamples, int) or resamples < 2:
+            raise ValueError('Invalid number of resamples. Choose at least 2 resamples.')
+        if not 0 < confidence < 1:
+            raise ValueError('Invalid confidence level. Choose a number between 0 and 1.')
+        # Check if net data is available
+        if self.net is None:
+            raise ValueError('No net data to bootstrap. Please process the readings first.')
+        time_unit, cycles, series, t, y, sigma = _get_decay_series(self.net, 'Cycle', column)
+        # Sort the points by cycle and get the bounds of the repetitions of each cycle
+        order = np.argsort(series, kind='stable')
+        t, y, sigma = t[order], y[order], sigma[order]
+        bounds = np.cumsum(np.bincount(series, minlength=len(cycles)))
+        groups = list(zip(np.concatenate([[0], bounds[:-1]]).tolist(), bounds.tolist()))
+        # Split the resamples in chunks with independent seeds
+        sizes = [min(self._RESAMPLES_CHUNK_SIZE, resamples - start)
+                 for start in range(0, resamples, self._RESAMPLES_CHUNK_SIZE)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        resample = partial(_bootstrap_resamples, kind, groups, t, y, sigma)
+        workers = _get_workers(workers, len(sizes), self._RESAMPLES_PER_WORKER // self._RESAMPLES_CHUNK_SIZE)
+        with self._stage('bootstrap'):
+            if workers > 1:
+                # Draw the chunks of resamples in a pool of worker processes
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    statistics = np.concatenate(list(executor.map(resample, sizes, seeds)))
+            else:
+                statistics = np.concatenate([resample(size, chunk_seed) for size, chunk_seed in zip(sizes, seeds)])
+        # Get the percentile confidence intervals, ignoring the resamples whose fit failed
+        with np.errstate(invalid='ignore'):
+            lower, upper = np.nanquantile(statistics, [(1 - confidence) / 2, (1 + confidence) / 2], axis=0)
+        uncertainty = np.nanstd(statistics, axis=0, ddof=1)
+        if kind == 'cycles':
+            return pd.DataFrame({
+                'Cycle': cycles,
+                'Repetitions': np.diff(bounds, prepend=0),
+                f'Mean {column[0].lower()}{column[1:]}': [y[start:stop].mean() for start, stop in groups],
+                'Standard error': uncertainty,
+                'Lower limit': lower,
+                'Upper limit': upper,
+            })
+        fit = fit_decay(self.net, column=column).iloc[0]
+        parameters = ['Activity', f'Decay constant (1/{time_unit})', f'Half-life ({time_unit})']
+        return pd.DataFrame({
+            'Estimate': fit[parameters].to_numpy(dtype=float),
+            'Standard error': uncertainty,
+            'Lower limit': lower,
+            'Upper limit': upper,
+        }, index=pd.Index(parameters, name='Parameter'))
+
+    def get(self, cycle, repetition, kind='net'):
+        """
+        Gets the processed measurement of the specified type with the given cycle and repetition.
+
+        The lookup uses an index of the cycles and repetitions of the measurements, built the first time a measurement
+        of that type is looked up and kept until the measurements are processed again.
+
+        Parameters
+        ----------
+        cycle : int
+            The cycle of the measurement.
+        repetition : int
+            The repetition of the measurement.
+        kind : str
+            The type of measurement. Options are 'background', 'sample' or 'net'. Default is 'net'.
+
+        Returns
+        -------
+        pandas.Series
+            The measurement.
+
+        Raises
+        ------
+        ValueError
+            If an invalid measurement kind is provided or the measurements of that type are not available.
+        KeyError
+            If there is no measurement with the given cycle and repetition.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.analyze_readings(input_folder='/path/to/folder', time_unit='d')
+        >>> processor.get(cycle=3, repetition=2)
+        Cycle                                    3
+        Repetition                               2
+        Elapsed time              12 days 00:03:43
+        Elapsed time (d)                 12.002581
+        Count rate (cpm)                  72257.79
+        Counts                       116352.484783
+        Counts uncertainty              341.508982
+        Counts uncertainty (%)            0.293512
+        Name: 5, dtype: object
+        >>> processor.get(cycle=3, repetition=2, kind='background')['Counts']
+        137.95
+        """
+        # Check if the provided kind is valid
+        if kind not in ['background', 'sample', 'net']:
+            raise ValueError(f'Invalid measurement kind. Choose from "background", "sample" or "net".')
+        df = getattr(self, kind)
+        if df is None:
+            raise ValueError(f'No {kind} data to look up. Please process the readings first.')
+        # Index the measurements by cycle and repetition, unless they are already indexed
+        entry = self._cache.get(('index', kind))
+        if entry is None or entry[0] is not df:
+            entry = self._cache[('index', kind)] = (df, pd.MultiIndex.from_frame(df[['Cycle', 'Repetition']]))
+        try:
+            position = entry[1].get_loc((cycle, repetition))
+        except KeyError:
+            raise KeyError(f'No {kind} measurement for cycle {cycle} and repetition {repetition}.') from None
+        return df.iloc[position]
+
+    def memory_usage(self):
+        """
+        Reports the memory used by the readings and the processed measurements.
+
+        The memory with the default dtypes (int64, float64 and text) is reported too, so the memory saved in compact
+        mode can be compared.
+
+        Returns
+        -------
+        pandas.DataFrame
+            A row per available table with its number of rows, its memory in bytes, its memory with the default dtypes
+            in bytes and the percentage of memory saved.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.compact = True
+        >>> processor.analyze_readings(input_folder='/path/to/folder', time_unit='d')
+        >>> processor.memory_usage()
+                    Rows  Memory (bytes)  Default memory (bytes)  Saved (%)
+        Table
+        readings      16             384                    1024  62.500000
+        background     8             392                     896  56.250000
+        sample         8             416                     896  53.571429
+        net            8             240                     512  53.125000
+        """
+        tables = {kind: getattr(self, kind) for kind in ['readings', 'background', 'sample', 'net']}
+        tables = {kind: df for kind, df in tables.items() if df is not None}
+        memory = [df.memory_usage(index=False, deep=True).sum() for df in tables.values()]
+        default_memory = [_get_default_memory(df) for df in tables.values()]
+        report = pd.DataFrame({
+            'Rows': [len(df) for df in tables.values()],
+            'Memory (bytes)': memory,
+            'Default memory (bytes)': default_memory,
+        }, index=pd.Index(list(tables), name='Table'))
+        report['Saved (%)'] = (1 - report['Memory (bytes)'] / report['Default memory (bytes)']) * 100
+        return report
+
     def plot_measurements(self, kind):
         """Plots the specified type of measurements.
 
@@ -645,6 +1729,11 @@ class Hidex300:
         kind : str
             The type of measurements to plot. Options are 'background', 'sample', or 'net'.
 
+        Returns
+        -------
+        matplotlib.figure.Figure
+            The figure object containing the plots, which is open in pyplot until it is shown or closed.
+
         Raises
         ------
         ValueError
@@ -656,37 +1745,49 @@ class Hidex300:
         >>> processor.parse_readings('/path/to/folder')
         Found 2 CSV files in folder /path/to/folder
         >>> processor.process_readings('all')
-        >>> processor.plot_measurements('net')
+        >>> fig = processor.plot_measurements('net')
+        >>> plt.show()
         """
         # Check the kind of measurements to plot
         if kind == 'background':
             # Plot background measurements
-            _plot_background_sample_measurements(df=self.background, kind=kind)
+            return _plot_background_sample_measurements(df=self.background, kind=kind)
         elif kind == 'sample':
             # Plot sample measurements
-            _plot_background_sample_measurements(df=self.sample, kind=kind)
+            return _plot_background_sample_measurements(df=self.sample, kind=kind)
         elif kind == 'net':
             # Plot net measurements
-            _plot_net_measurements(df=self.net)
+            return _plot_net_measurements(df=self.net)
         else:
             # Raise an error if the kind is invalid
             raise ValueError(f'Invalid measurement kind. Choose from "background", "sample", or "net".')
 
-    def export_table(self, kind, folder_path):
+    def export_table(self, kind, folder_path, format='csv', compression=None):
         """
-        Exports the specified type of measurements to a CSV file.
+        Exports the specified type of measurements to a CSV, Parquet, Feather or HDF5 file.
+
+        The binary columnar formats keep the data types of the columns, including the end times and the elapsed times,
+        and the two level header of the 'all' table. Parquet and Feather require ``pyarrow`` and HDF5 requires
+        ``tables``.
 
         Parameters
         ----------
         kind : str
             The type of measurements to export. Options are 'readings', 'background', 'sample', 'net', or 'all'.
         folder_path : str
-            The path to the folder where the CSV file will be saved.
+            The path to the folder where the file will be saved.
+        format : str
+            The format of the file. Options are 'csv', 'parquet', 'feather' or 'hdf5'. Default is 'csv'.
+        compression : str or None
+            The compression of the file: 'gzip', 'bz2', 'zip', 'xz' or 'zstd' for CSV, 'snappy', 'gzip', 'brotli',
+            'lz4' or 'zstd' for Parquet, 'lz4' or 'zstd' for Feather, and 'zlib', 'lzo', 'bzip2' or 'blosc' for HDF5.
+            Default is None (the default of the format: no compression for CSV and HDF5, snappy for Parquet and lz4
+            for Feather).
 
         Raises
         ------
         ValueError
-            If an invalid measurement kind is provided.
+            If an invalid measurement kind or table format is provided.
 
         Examples
         --------
@@ -696,21 +1797,85 @@ class Hidex300:
         >>> processor.process_readings('sample')
         >>> processor.export_table('sample', '/path/to/folder')
         Sample measurements CSV saved to "/path/to/folder" folder.
+        >>> processor.export_table('sample', '/path/to/folder', format='parquet', compression='zstd')
+        Sample measurements PARQUET saved to "/path/to/folder" folder.
         """
-        # Dictionary mapping measurement kinds to their corresponding DataFrames
-        dfs = {
-            'readings': self.readings,
-            'background': self.background,
-            'sample': self.sample,
-            'net': self.net,
-            'all': self._compile_measurements()
-        }
         # Check if the provided kind is valid
-        if kind not in dfs.keys():
+        if kind not in ['readings', 'background', 'sample', 'net', 'all']:
             raise ValueError(f'Invalid measurement kind. Choose from "readings", "background", "sample", "net", or "all".')
-        # Export the specified DataFrame to a CSV file
-        dfs[kind].to_csv(f'{folder_path}/{kind}.csv', index=False)
-        print(f'{kind.capitalize()} measurements CSV saved to "{folder_path}" folder.')
+        # Check if the provided format is valid
+        if format not in self._TABLE_FORMATS:
+            raise ValueError(f'Invalid table format. Choose from "csv", "parquet", "feather", or "hdf5".')
+        # Get the DataFrame of the specified kind, compiling all the measurements only if they are requested
+        df = self._compile_measurements() if kind == 'all' else getattr(self, kind)
+        # Export the DataFrame to a file of the specified format
+        with self._stage('export'):
+            file_path = _write_table(df, f'{folder_path}/{kind}{self._TABLE_FORMATS[format]}', format, compression,
+                                     key=kind)
+        self._count_written_file(file_path)
+        print(f'{kind.capitalize()} measurements {format.upper()} saved to "{folder_path}" folder.')
+
+    def export_spectra(self, folder_path):
+        """
+        Exports the spectra of the readings to a NumPy NPY file.
+
+        The file can be opened without loading it into memory with ``numpy.load(file, mmap_mode='r')``.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder where the NPY file will be saved.
+
+        Raises
+        ------
+        ValueError
+            If no spectra data is available.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings('/path/to/folder', spectra=True)
+        Found 2 CSV files in folder /path/to/folder
+        >>> processor.export_spectra('/path/to/folder')
+        Spectra NPY saved to "/path/to/folder" folder.
+        """
+        if self.spectra is None:
+            raise ValueError('No spectra data to export. Please read the CSV files with spectra first.')
+        with self._stage('export'):
+            np.save(f'{folder_path}/spectra.npy', self.spectra)
+        self._count_written_file(f'{folder_path}/spectra.npy')
+        print(f'Spectra NPY saved to "{folder_path}" folder.')
+
+    def export_matrices(self, folder_path):
+        """
+        Exports the alpha matrices of the readings to a sparse NumPy NPZ file.
+
+        The file can be read back with ``AlphaMatrices.load``.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder where the NPZ file will be saved.
+
+        Raises
+        ------
+        ValueError
+            If no alpha matrices data is available.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings('/path/to/folder', matrices=True)
+        Found 2 CSV files in folder /path/to/folder
+        >>> processor.export_matrices('/path/to/folder')
+        Alpha matrices NPZ saved to "/path/to/folder" folder.
+        """
+        if self.matrices is None:
+            raise ValueError('No alpha matrices data to export. Please read the CSV files with matrices first.')
+        with self._stage('export'):
+            self.matrices.save(f'{folder_path}/alpha_matrices.npz')
+        self._count_written_file(f'{folder_path}/alpha_matrices.npz')
+        print(f'Alpha matrices NPZ saved to "{folder_path}" folder.')
 
     def export_plot(self, kind, folder_path):
         """
@@ -746,13 +1911,64 @@ class Hidex300:
         # Check if the provided kind is valid
         if kind not in dfs.keys():
             raise ValueError(f'Invalid measurement kind. Choose from "background", "sample", or "net".')
-        # Plot the specified measurements
-        self.plot_measurements(kind=kind)
-        # Save the plot to a PNG file
-        plt.savefig(f'{folder_path}/{kind}.png')
+        # Plot the specified measurements outside pyplot and save the plot to a PNG file
+        with self._stage('plot'):
+            _save_plot(dfs[kind], kind, f'{folder_path}/{kind}.png')
+        self._count_written_file(f'{folder_path}/{kind}.png')
         print(f'{kind.capitalize()} measurements PNG saved to "{folder_path}" folder.')
 
-    def analyze_readings(self, input_folder, time_unit, save=False, output_folder=None):
+    def export_plots(self, folder_path, workers=None):
+        """
+        Exports the plots of the background, sample and net measurements to PNG files.
+
+        The figures are rendered with the non-interactive Agg backend without being registered in pyplot, so no figure
+        is left open, and in a pool of worker processes if more than one worker is used. Together with
+        ``analyze_readings(plots=False)``, it allows to defer the plots of a batch of analyses.
+
+        Parameters
+        ----------
+        folder_path : str
+            The path to the folder where the PNG files will be saved.
+        workers : int or None
+            Number of worker processes, up to the number of plots. If None or 1, the plots are rendered in the current
+            process, so that saving three figures does not start a pool of processes. Default is None.
+
+        Raises
+        ------
+        ValueError
+            If an invalid number of workers is provided.
+
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.parse_readings('/path/to/folder')
+        Found 2 CSV files in folder /path/to/folder
+        >>> processor.process_readings('all')
+        >>> processor.export_plots('/path/to/folder')
+        Background measurements PNG saved to "/path/to/folder" folder.
+        Sample measurements PNG saved to "/path/to/folder" folder.
+        Net measurements PNG saved to "/path/to/folder" folder.
+        """
+        kinds = ['background', 'sample', 'net']
+        dfs = [self.background, self.sample, self.net]
+        file_paths = [f'{folder_path}/{kind}.png' for kind in kinds]
+        # Render the plots in the current process unless a number of workers is requested
+        workers = 1 if workers is None else _get_workers(workers, len(kinds), per_worker=1)
+        with self._stage('plot'):
+            if workers > 1:
+                # Render the plots in a pool of worker processes
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    for kind, _ in zip(kinds, executor.map(_save_plot, dfs, kinds, file_paths)):
+                        print(f'{kind.capitalize()} measurements PNG saved to "{folder_path}" folder.')
+            else:
+                for df, kind, file_path in zip(dfs, kinds, file_paths):
+                    _save_plot(df, kind, file_path)
+                    print(f'{kind.capitalize()} measurements PNG saved to "{folder_path}" folder.')
+        for file_path in file_paths:
+            self._count_written_file(file_path)
+
+    def analyze_readings(self, input_folder, time_unit, save=False, output_folder=None, workers=None, cache=None,
+                         spectra=False, matrices=False, format='csv', compression=None, raw_files='copy', plots=True):
         """
         Processes readings from the input folder, prints a summary, and optionally saves the results.
 
@@ -766,11 +1982,38 @@ class Hidex300:
             If True, saves the results to the specified output folder. Default is False.
         output_folder : str or None
             Path to the folder where the results will be saved. Required if save is True.
+        workers : int or None
+            Number of worker processes used to parse the CSV files and to render the plots. If None, the number of
+            workers to parse the CSV files is chosen automatically and the plots are rendered in the current process.
+            Default is None.
+        cache : bool, str, ParseCache or None
+            The parse cache used to skip parsing unchanged CSV files. Default is None (no cache).
+        spectra : bool
+            If True, the spectra of the readings are also extracted and, if save is True, saved to a NPY file.
+            Default is False.
+        matrices : bool
+            If True, the alpha matrices of the readings are also extracted and, if save is True, saved to a NPZ file.
+            Default is False.
+        format : str
+            The format of the saved tables of measurements. Options are 'csv', 'parquet', 'feather' or 'hdf5'.
+            Default is 'csv'.
+        compression : str or None
+            The compression of the saved tables of measurements. See `export_table`. Default is None.
+        raw_files : str or None
+            How the raw CSV files are saved with the results: 'copy' copies them to a readings folder, 'link' hard
+            links them to a readings folder (copying them if the file system does not support hard links), 'archive'
+            compresses them to a readings.zip file, 'store' keeps a single copy of each distinct file in a store
+            shared by all the analyses saved to the output folder and writes a readings.json manifest that maps each
+            file name to its file in the store, and None does not save them. Default is 'copy'.
+        plots : bool
+            If True and save is True, the plots of the measurements are saved to PNG files. If False, they are
+            skipped and can be saved later with `export_plots`. Default is True.
 
         Raises
         ------
         ValueError
-            If save is True and output_folder is not provided.
+            If save is True and output_folder is not provided, or if an invalid table format or raw files mode is
+            provided.
 
         Examples
         --------
@@ -805,10 +2048,16 @@ class Hidex300:
         Sample measurements PNG saved to "/path/to/input/folder/Lu-177_2023_11" folder.
         Net measurements PNG saved to "/path/to/input/folder/Lu-177_2023_11" folder.
         """
+        # Check if the provided format is valid before parsing the readings
+        if format not in self._TABLE_FORMATS:
+            raise ValueError(f'Invalid table format. Choose from "csv", "parquet", "feather", or "hdf5".')
+        # Check if the provided raw files mode is valid before parsing the readings
+        if raw_files is not None and raw_files not in self._RAW_FILES_MODES:
+            raise ValueError(f'Invalid raw files mode. Choose from "copy", "link", "archive", "store", or None.')
         # Print a message indicating the start of processing
         print(f'Processing readings from {input_folder}.')
         # Parse the readings from the CSV files in the input folder
-        self.parse_readings(input_folder)
+        self.parse_readings(input_folder, workers=workers, cache=cache, spectra=spectra, matrices=matrices)
         # Process all types of measurements
         self.process_readings(kind='all', time_unit=time_unit)
         # If save is True, save the results to the specified output folder
@@ -828,65 +2077,2243 @@ class Hidex300:
             os.makedirs(folder)
             # Save the CSV files
             print('Saving CSV files')
-            shutil.copytree(input_folder, f'{folder}/readings')
-            self.export_table(kind='readings', folder_path=folder)
-            self.export_table(kind='background', folder_path=folder)
-            self.export_table(kind='sample', folder_path=folder)
-            self.export_table(kind='net', folder_path=folder)
-            self.export_table(kind='all', folder_path=folder)
-            # Save the summary to a text file
-            self.summarize_readings(save=True, folder_path=folder)
-            # Save the plots
-            print('Saving figures')
-            self.export_plot(kind='background', folder_path=folder)
-            self.export_plot(kind='sample', folder_path=folder)
-            self.export_plot(kind='net', folder_path=folder)
+            if raw_files is not None:
+                with self._stage('raw files'):
+                    _save_raw_files(input_folder, folder, raw_files, f'{output_folder}/{self._STORE_FOLDER}')
+            self._export_results(folder, format=format, compression=compression, plots=plots, workers=workers)
 
+    def watch_readings(self, input_folder, time_unit='s', output_folder=None, interval=10, max_polls=None):
+        """
+        Watches a folder where the instrument writes its CSV files and processes each new cycle when it is complete.
 
+        The folder is polled at regular intervals. A CSV file is considered complete when its size has not changed
+        since the previous poll and its last data block ends with a full alpha matrix. Each complete file is parsed
+        once and added to the readings, and the processed measurements and the exported files are updated. The CSV
+        files already in the readings are not added again, and a file that cannot be added is skipped with a message.
 
-def _get_csv_files(folder_path):
-    """
-    Retrieves a list of CSV files from the specified folder.
+        Parameters
+        ----------
+        input_folder : str
+            Path to the folder where the CSV files are written.
+        time_unit : str
+            The unit of time for the measurements. Default is 's'.
+        output_folder : str or None
+            Path to the folder where the results are saved after each update. If None, the results are not saved.
+            Default is None.
+        interval : float
+            Time between polls in seconds. Default is 10.
+        max_polls : int or None
+            Maximum number of polls. If None, the folder is watched until the process is interrupted. Default is None.
 
-    Parameters
-    ----------
-    folder_path : str
-        The path to the folder containing the files.
+        Examples
+        --------
+        >>> processor = Hidex300('Lu-177', 2023, 11)
+        >>> processor.watch_readings('/path/to/input/folder', output_folder='/path/to/output/folder')
+        Watching folder /path/to/input/folder for new readings.
+        Found 2 CSV files in folder /path/to/input/folder
+        Saving measurement files to folder /path/to/output/folder/Lu-177_2023_11.
+        ...
+        Added 1 cycles from /path/to/input/folder/file3.csv
+        Saving measurement files to folder /path/to/output/folder/Lu-177_2023_11.
+        ...
+        Stopped watching folder /path/to/input/folder.
+        """
+        print(f'Watching folder {input_folder} for new readings.')
+        # Files already added to the readings and size and modification time of the files in the previous poll
+        seen = set(self._cache.get('files', set())) if self.readings is not None else set()
+        previous = {}
+        polls = 0
+        try:
+            while max_polls is None or polls < max_polls:
+                if polls:
+                    time.sleep(interval)
+                polls += 1
+                # Find the new CSV files that did not change since the previous poll and are complete
+                current = {}
+                for file_name in sorted(os.listdir(input_folder)):
+                    file_path = os.path.abspath(os.path.join(input_folder, file_name))
+                    if file_name.endswith('.csv') and file_path not in seen:
+                        # Skip the files renamed or deleted by the instrument since they were listed
+                        try:
+                            stat = os.stat(file_path)
+                        except FileNotFoundError:
+                            continue
+                        current[file_path] = (stat.st_size, stat.st_mtime_ns)
+                ready = []
+                for file_path, signature in current.items():
+                    try:
+                        if previous.get(file_path) == signature and _is_complete_csv_file(file_path):
+                            ready.append(file_path)
+                    except FileNotFoundError:
+                        continue
+                previous = current
+                # Add each new CSV file to the readings and update the processed measurements
+                added = []
+                for file_path in ready:
+                    seen.add(file_path)
+                    try:
+                        if self.readings is None:
+                            self._load_csv_file(file_path, time_unit)
+                        else:
+                            self.add_readings(file_path)
+                    except (ValueError, FileNotFoundError) as error:
+                        print(f'Skipped CSV file {file_path}: {error}')
+                        continue
+                    added.append(file_path)
+                if not added:
+                    continue
+                # Save the updated results
+                if output_folder is not None:
+                    folder = f'{output_folder}/{self.radionuclide}_{self.year}_{self.month}'
+                    print(f'Saving measurement files to folder {folder}.')
+                    os.makedirs(f'{folder}/readings', exist_ok=True)
+                    for file_path in added:
+                        shutil.copy2(file_path, f'{folder}/readings')
+                    self._export_results(folder)
+        except KeyboardInterrupt:
+            pass
+        print(f'Stopped watching folder {input_folder}.')
 
-    Returns
-    -------
-    list
-        A list of full paths to the CSV files found in the folder.
+    def _load_csv_file(self, file_path, time_unit):
+        """
+        Parses the readings of a first CSV file and processes all types of measurements.
 
-    Examples
-    --------
-    >>> _get_csv_files('/path/to/folder')
-    Found 3 CSV files in folder /path/to/folder:
-    ['/path/to/folder/file1.csv', '/path/to/folder/file2.csv', '/path/to/folder/file3.csv']
-    """
-    # List to store csv files with their full paths
-    csv_files = []
-    # Iterate over all the files in the given folder
-    for file_name in os.listdir(folder_path):
-        # Check if the file has a .csv extension
-        if file_name.endswith('.csv'):
-            # Append the absolute path of the file to the list
-            csv_files.append(os.path.abspath(os.path.join(folder_path, file_name)))
-    print(f'Found {len(csv_files)} CSV files in folder {folder_path}')
-    return csv_files
+        If the readings are not valid, the readings are cleared so that the next CSV file is loaded as the first one.
 
+        Parameters
+        ----------
+        file_path : str
+            The path to the CSV file.
+        time_unit : str
+            The unit of time for the measurements.
 
-def _get_elapsed_time(df, time_unit='s'):
-    """
-    Calculate the elapsed time from the minimum 'End time' in a dataframe and convert it to the specified time unit.
+        Raises
+        ------
+        ValueError
+            If repetitions per cycle are not consistent for all measurements.
+        """
+        readings = self._sort_readings(self._get_blocks_frame(_parse_files([file_path], 1, 'python')))
+        self.readings = readings
+        self._cache['files'] = {file_path}
+        try:
+            self._set_readings_statistics()
+            self.process_readings(kind='all', time_unit=time_unit)
+        except ValueError:
+            self.readings = None
+            raise
 
-    Parameters
-    ----------
-    df : pandas.DataFrame
-        The time data containing a column 'End time' with datetime values.
-    time_unit : str
-        The unit of time to convert the elapsed time to. Options are 's' (seconds), 'min' (minutes), 'h' (hours),
-        'd' (days), 'wk' (weeks), 'mo' (months), 'yr' (years). Default is 's'.
+    def _export_results(self, folder, format='csv', compression=None, plots=True, workers=1):
+        """
+        Exports the tables, the summary and the plots of the measurements to a folder.
+
+        Parameters
+        ----------
+        folder : str
+            The path to the folder where the files will be saved.
+        format : str
+            The format of the tables of measurements. Default is 'csv'.
+        compression : str or None
+            The compression of the tables of measurements. Default is None.
+        plots : bool
+            If True, the plots of the measurements are saved. Default is True.
+        workers : int or None
+            Number of worker processes used to render the plots. Default is 1.
+        """
+        for kind in ['readings', 'background', 'sample', 'net', 'all']:
+            self.export_table(kind=kind, folder_path=folder, format=format, compression=compression)
+        # Save the spectra to a NPY file
+        if self.spectra is not None:
+            self.export_spectra(folder_path=folder)
+        # Save the alpha matrices to a NPZ file
+        if self.matrices is not None:
+            self.export_matrices(folder_path=folder)
+        # Save the summary to a text file
+        self.summarize_readings(save=True, folder_path=folder)
+        # Save the plots
+        if plots:
+            print('Saving figures')
+            self.export_plots(folder_path=folder, workers=workers)
+
+
+class ParseCache:
+    """
+    A persistent on-disk cache of the data blocks extracted from Hidex TDCR CSV files.
+
+    Each CSV file is stored as a NumPy ``.npz`` file named after the hash of its content, with a column for each
+    extracted row. An index maps the path, size and modification time of each CSV file to its content hash, so that
+    unchanged files are found without reading them. Least recently used entries are evicted when the cache grows over
+    its maximum size.
+    """
+    # Name of the index file inside the cache folder
+    _INDEX_FILE = 'index.json'
+    # Default maximum size of the cache in bytes
+    _MAX_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, folder_path, max_size=_MAX_SIZE):
+        """
+        Initializes the ParseCache with the given folder and maximum size.
+
+        Parameters
+        ----------
+        folder_path : str
+            Path to the folder where the cache is kept. It is created if it does not exist.
+        max_size : int
+            Maximum size of the cached entries in bytes. Default is 256 MiB.
+        """
+        self.folder_path = folder_path
+        """Path to the folder where the cache is kept (str)."""
+        self.max_size = max_size
+        """Maximum size of the cached entries in bytes (int)."""
+        self.hits = 0
+        """Number of CSV files loaded from the cache (int)."""
+        self.misses = 0
+        """Number of CSV files not found in the cache (int)."""
+        self.evictions = 0
+        """Number of entries evicted from the cache (int)."""
+        self._index = None
+
+    def __repr__(self):
+        return (f'ParseCache(folder_path={self.folder_path}, hits={self.hits}, misses={self.misses}, '
+                f'evictions={self.evictions})')
+
+    def load(self, file_path, rows):
+        """
+        Loads the extracted rows of a CSV file from the cache.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the CSV file.
+        rows : list of str
+            The labels of the rows to load.
+
+        Returns
+        -------
+        dict or None
+            A dictionary mapping the rows to NumPy arrays with a value for each data block, or None if the file is
+            not in the cache or its entry does not hold all the rows.
+        """
+        entry = self._get_entry_path(file_path)
+        try:
+            with np.load(entry) as data:
+                if not set(rows) <= set(data.files):
+                    raise KeyError
+                columns = {row: data[row] for row in rows}
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        # Mark the entry as recently used
+        os.utime(entry)
+        self.hits += 1
+        return columns
+
+    def save(self, file_path, columns):
+        """
+        Saves the extracted rows of a CSV file to the cache.
+
+        Columns that cannot be stored without pickling (e.g. rows missing from some data blocks) are not cached.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the CSV file.
+        columns : dict
+            A dictionary mapping the rows to NumPy arrays with a value for each data block.
+        """
+        if any(column.dtype == object for column in columns.values()):
+            return
+        entry = self._get_entry_path(file_path)
+        # Write to a temporary file first so that concurrent readers never see a partial entry
+        temporary = f'{entry}.{os.getpid()}.tmp'
+        with open(temporary, 'wb') as file:
+            np.savez(file, **columns)
+        os.replace(temporary, entry)
+
+    def flush(self):
+        """Writes the index to disk and evicts the least recently used entries over the maximum size."""
+        index = self._get_index()
+        # Evict the least recently used entries
+        entries = []
+        for file_name in os.listdir(self.folder_path):
+            if file_name.endswith('.npz'):
+                stat = os.stat(os.path.join(self.folder_path, file_name))
+                entries.append((stat.st_mtime_ns, stat.st_size, file_name))
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, file_name in sorted(entries):
+            if size <= self.max_size:
+                break
+            os.remove(os.path.join(self.folder_path, file_name))
+            size -= entry_size
+            self.evictions += 1
+        # Drop the index records of the evicted entries
+        existing = {file_name[:-len('.npz')] for file_name in os.listdir(self.folder_path)
+                    if file_name.endswith('.npz')}
+        self._index = {path: record for path, record in index.items() if record[2] in existing}
+        temporary = os.path.join(self.folder_path, f'{self._INDEX_FILE}.{os.getpid()}.tmp')
+        with open(temporary, 'w') as file:
+            json.dump(self._index, file)
+        os.replace(temporary, os.path.join(self.folder_path, self._INDEX_FILE))
+
+    def clear(self):
+        """Removes all the entries and the index from the cache."""
+        for file_name in os.listdir(self.folder_path):
+            if file_name.endswith('.npz') or file_name == self._INDEX_FILE:
+                os.remove(os.path.join(self.folder_path, file_name))
+        self._index = {}
+
+    def _get_index(self):
+        """
+        Gets the index of the cache, reading it from disk the first time.
+
+        Returns
+        -------
+        dict
+            A dictionary mapping the paths of the CSV files to their size, modification time and content hash.
+        """
+        if self._index is None:
+            os.makedirs(self.folder_path, exist_ok=True)
+            try:
+                with open(os.path.join(self.folder_path, self._INDEX_FILE)) as file:
+                    self._index = json.load(file)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _get_entry_path(self, file_path):
+        """
+        Gets the path of the cache entry of a CSV file, hashing its content if the file changed since it was indexed.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the CSV file.
+
+        Returns
+        -------
+        str
+            Path to the cache entry.
+        """
+        index = self._get_index()
+        file_path = os.path.abspath(file_path)
+        stat = os.stat(file_path)
+        record = index.get(file_path)
+        if record is None or record[:2] != [stat.st_size, stat.st_mtime_ns]:
+            record = index[file_path] = [stat.st_size, stat.st_mtime_ns, _hash_file(file_path)]
+        return os.path.join(self.folder_path, f'{record[2]}.npz')
+
+
+class AlphaMatrices:
+    """
+    A sparse store of the alpha matrices of the data blocks of Hidex TDCR CSV files.
+
+    The matrices are kept in a compressed sparse row layout where each row is a flattened matrix: the non-zero values
+    of all the matrices, their positions in the flattened matrix and the offsets of the values of each matrix.
+    Indexing with an integer returns the dense matrix of a measurement and indexing with a slice or an array of
+    integers returns a new AlphaMatrices with the selected measurements.
+    """
+    # Number of columns of the alpha matrix
+    _COLUMNS = 64
+
+    def __init__(self, indptr, indices, data, shape=(32, 64)):
+        """
+        Initializes the AlphaMatrices with the given sparse arrays.
+
+        Parameters
+        ----------
+        indptr : numpy.ndarray
+            Offsets of the values of each matrix in indices and data, with one more element than matrices.
+        indices : numpy.ndarray
+            Positions of the non-zero values in the flattened matrices.
+        data : numpy.ndarray
+            Non-zero values of the matrices.
+        shape : tuple of int
+            Shape of each matrix. Default is (32, 64).
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        """Offsets of the values of each matrix in indices and data (numpy.ndarray)."""
+        self.indices = np.asarray(indices)
+        """Positions of the non-zero values in the flattened matrices (numpy.ndarray)."""
+        self.data = np.asarray(data)
+        """Non-zero values of the matrices (numpy.ndarray)."""
+        self.shape = tuple(shape)
+        """Shape of each matrix (tuple of int)."""
+
+    def __repr__(self):
+        return f'AlphaMatrices(matrices={len(self)}, shape={self.shape}, nonzero={len(self.data)})'
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __getitem__(self, item):
+        """
+        Gets the dense matrix of a measurement or a new AlphaMatrices with some of the measurements.
+
+        Parameters
+        ----------
+        item : int, slice or array of int
+            The position of the measurement or the positions of the measurements.
+
+        Returns
+        -------
+        numpy.ndarray or AlphaMatrices
+            The dense matrix of the measurement for an integer. Else, the selected measurements.
+        """
+        if isinstance(item, (int, np.integer)):
+            if not -len(self) <= item < len(self):
+                raise IndexError(f'Alpha matrix index {item} out of range for {len(self)} matrices.')
+            item = item % len(self)
+            start, end = self.indptr[item], self.indptr[item + 1]
+            matrix = np.zeros(self.shape[0] * self.shape[1], dtype=self.data.dtype)
+            matrix[self.indices[start:end]] = self.data[start:end]
+            return matrix.reshape(self.shape)
+        items = np.arange(len(self))[item]
+        # Gather the values of the selected matrices with a single fancy index
+        starts = self.indptr[items]
+        counts = self.indptr[items + 1] - starts
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        positions = np.repeat(starts - indptr[:-1], counts) + np.arange(indptr[-1])
+        return AlphaMatrices(indptr, self.indices[positions], self.data[positions], shape=self.shape)
+
+    @property
+    def nbytes(self):
+        """Memory used by the sparse arrays in bytes (int)."""
+        return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes
+
+    def sum(self, items=None):
+        """
+        Sums the matrices of all or some of the measurements.
+
+        Parameters
+        ----------
+        items : slice, array of int or array of bool, optional
+            The positions or a mask of the measurements to sum. If None, all the measurements are summed.
+
+        Returns
+        -------
+        numpy.ndarray
+            The dense summed matrix.
+        """
+        matrices = self if items is None else self[items]
+        total = np.bincount(matrices.indices, weights=matrices.data, minlength=self.shape[0] * self.shape[1])
+        return total.astype(np.int64).reshape(self.shape)
+
+    def to_dense(self):
+        """
+        Converts the matrices to a dense array.
+
+        Returns
+        -------
+        numpy.ndarray
+            Array of shape (measurements, rows, columns) with the matrices.
+        """
+        dense = np.zeros((len(self), self.shape[0] * self.shape[1]), dtype=self.data.dtype)
+        dense[np.repeat(np.arange(len(self)), np.diff(self.indptr)), self.indices] = self.data
+        return dense.reshape(len(self), *self.shape)
+
+    def save(self, file_path):
+        """
+        Saves the sparse arrays to a NumPy NPZ file.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the NPZ file.
+        """
+        np.savez_compressed(file_path, indptr=self.indptr, indices=self.indices, data=self.data,
+                            shape=np.array(self.shape))
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Loads the sparse arrays from a NumPy NPZ file saved with ``save``.
+
+        Parameters
+        ----------
+        file_path : str
+            The path to the NPZ file.
+
+        Returns
+        -------
+        AlphaMatrices
+            The loaded matrices.
+        """
+        with np.load(file_path) as entry:
+            return cls(entry['indptr'], entry['indices'], entry['data'], shape=entry['shape'])
+
+    @classmethod
+    def concatenate(cls, matrices):
+        """
+        Concatenates several AlphaMatrices in order.
+
+        Parameters
+        ----------
+        matrices : list of AlphaMatrices
+            The matrices to concatenate. They must have the same shape.
+
+        Returns
+        -------
+        AlphaMatrices
+            The concatenated matrices.
+        """
+        offsets = np.cumsum([0] + [len(item.data) for item in matrices[:-1]])
+        indptr = np.concatenate([[0]] + [item.indptr[1:] + offset for item, offset in zip(matrices, offsets)])
+        return cls(indptr, np.concatenate([item.indices for item in matrices]),
+                   np.concatenate([item.data for item in matrices]), shape=matrices[0].shape)
+
+
+class Metrics:
+    """
+    Wall times and counters of the processing stages of a Hidex300 object.
+
+    Assign a Metrics object to the ``metrics`` attribute of a Hidex300 object to record them. The time of each stage
+    and the value of each counter are added up over all the calls, until they are reset. Each recorded stage and counter
+    is also reported to an optional callback and to an optional logger.
+
+    The stages are 'discovery' (listing the CSV files), 'parse' (extracting the header rows, or loading them from
+    the parse cache or the block index), 'conversion' (building the readings table), 'spectra' and 'matrices'
+    (extracting them), 'sort', 'process', 'uncertainty' (Monte Carlo propagation), 'bootstrap', 'export' (tables,
+    spectra, matrices and summary), 'plot' and 'raw files' (saving the raw CSV files). With the 'python' engine in
+    the current process, the files are parsed while the readings table is built, so their parse time is included in
+    the 'conversion' stage.
+
+    The counters are 'files' (CSV files found), 'files parsed' and 'bytes read' (of the parsed CSV files), 'blocks
+    parsed', 'rows produced' (rows of the readings, background, sample and net tables), 'files written' and 'bytes
+    written'.
+    """
+
+    def __init__(self, callback=None, logger=None):
+        """
+        Initializes the Metrics object with no recorded stages or counters.
+
+        Parameters
+        ----------
+        callback : callable or None
+            Function called as ``callback(event, name, value)`` for each recorded stage, with event 'stage' and the
+            wall time in seconds, and for each counter increment, with event 'counter' and the increment.
+            Default is None.
+        logger : logging.Logger or None
+            Logger where the recorded stages and counter increments are logged with the DEBUG level. Default is None.
+        """
+        self.timings = {}
+        """Total wall time in seconds of each stage (dict)."""
+        self.calls = {}
+        """Number of times each stage was run (dict)."""
+        self.counters = {}
+        """Total value of each counter (dict)."""
+        self.callback = callback
+        """Function called for each recorded stage and counter increment (callable or None)."""
+        self.logger = logger
+        """Logger of the recorded stages and counter increments (logging.Logger or None)."""
+
+    def __repr__(self):
+        return (f'Metrics(stages={len(self.timings)}, time={sum(self.timings.values()):.3f} s, '
+                f'counters={len(self.counters)})')
+
+    def __str__(self):
+        lines = ['Stages']
+        lines.extend(f'{name}: {seconds:.6f} s ({self.calls[name]} calls)' for name, seconds in self.timings.items())
+        lines.append('Counters')
+        lines.extend(f'{name}: {value}' for name, value in self.counters.items())
+        return '\n'.join(lines)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Records the wall time of a stage run inside a ``with`` block.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+
+        Examples
+        --------
+        >>> metrics = Metrics()
+        >>> with metrics.stage('parse'):
+        ...     pass
+        >>> metrics.calls
+        {'parse': 1}
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self._report('stage', name, seconds)
+
+    def count(self, name, value=1):
+        """
+        Increments a counter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        value : int
+            The increment. Default is 1.
+
+        Examples
+        --------
+        >>> metrics = Metrics()
+        >>> metrics.count('files', 2)
+        >>> metrics.counters
+        {'files': 2}
+        """
+        value = int(value)
+        self.counters[name] = self.counters.get(name, 0) + value
+        self._report('counter', name, value)
+
+    def reset(self):
+        """
+        Clears the recorded stages and counters.
+        """
+        self.timings.clear()
+        self.calls.clear()
+        self.counters.clear()
+
+    def to_dict(self):
+        """
+        Gets the recorded stages and counters as a dictionary, which can be saved to a JSON file.
+
+        Returns
+        -------
+        dict
+            A dictionary with the 'timings', 'calls' and 'counters' dictionaries.
+
+        Examples
+        --------
+        >>> processor.metrics.to_dict()
+        {'timings': {'discovery': 0.0001, 'parse': 0.0152, ...}, 'calls': {...}, 'counters': {'files': 4, ...}}
+        """
+        return {'timings': dict(self.timings), 'calls': dict(self.calls), 'counters': dict(self.counters)}
+
+    def _report(self, event, name, value):
+        """
+        Reports a recorded stage or counter increment to the callback and the logger.
+
+        Parameters
+        ----------
+        event : str
+            The kind of record: 'stage' or 'counter'.
+        name : str
+            The name of the stage or counter.
+        value : float or int
+            The wall time in seconds of the stage or the increment of the counter.
+        """
+        if self.callback is not None:
+            self.callback(event, name, value)
+        if self.logger is not None:
+            self.logger.debug('%s %s: %s', event, name, value)
+
+
+def analyze_campaigns(manifest, workers=None, raw_files='copy'):
+    """
+    Analyzes several measurement campaigns in a pool of worker processes and summarizes them.
+
+    Each campaign is analyzed with ``Hidex300.analyze_readings`` in its own worker process, so the wall-clock time
+    scales with the number of CPUs. A campaign that fails does not stop the others: its error message is reported in
+    the summary table.
+
+    Parameters
+    ----------
+    manifest : str, pandas.DataFrame or list of dict
+        The campaigns to analyze, as a CSV file, a DataFrame or a list of dictionaries, with the keys 'radionuclide',
+        'year', 'month' and 'input_folder' and, optionally, 'time_unit' (default 's') and 'output_folder'. The
+        results of a campaign are saved only if it has an output folder.
+    workers : int or None
+        Number of worker processes. If None, one worker is used per CPU, up to the number of campaigns. If 1, the
+        campaigns are analyzed in the current process. Default is None.
+    raw_files : str or None
+        How the raw CSV files of the campaigns are saved with their results. See ``Hidex300.analyze_readings``.
+        With 'store', the campaigns saved to the same output folder share a single store. Default is 'copy'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A summary table with a row per campaign with its number of cycles, total number of measurements, total
+        measurement time and error message, if any.
+
+    Raises
+    ------
+    ValueError
+        If the manifest lacks a required column or an invalid number of workers is provided.
+
+    Examples
+    --------
+    >>> analyze_campaigns([{'radionuclide': 'Lu-177', 'year': 2023, 'month': 11, 'input_folder': '/path/to/lu177'},
+    ...                    {'radionuclide': 'I-131', 'year': 2023, 'month': 11, 'input_folder': '/path/to/i131'}])
+    Campaign Lu-177 2023-11 done.
+    Campaign I-131 2023-11 failed: [Errno 2] No such file or directory: '/path/to/i131'
+      Radionuclide  Year  Month    Input folder  Cycles  Total measurements  Measurement time (s)               Error
+    0       Lu-177  2023     11  /path/to/lu177       2                   4                 400.0                None
+    1        I-131  2023     11   /path/to/i131    <NA>                <NA>                   NaN  [Errno 2] No such...
+    """
+    campaigns = _read_manifest(manifest)
+    workers = _get_workers(workers, len(campaigns), per_worker=1)
+    results = [None] * len(campaigns)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_analyze_campaign, campaign, raw_files): i
+                       for i, campaign in enumerate(campaigns)}
+            for future in as_completed(futures):
+                results[futures[future]] = _get_campaign_result(campaigns[futures[future]], future.result)
+    else:
+        for i, campaign in enumerate(campaigns):
+            results[i] = _get_campaign_result(campaign, partial(_analyze_campaign, campaign, raw_files))
+    # Build the summary table in the order of the manifest
+    summary = pd.DataFrame({
+        'Radionuclide': [campaign['radionuclide'] for campaign in campaigns],
+        'Year': [campaign['year'] for campaign in campaigns],
+        'Month': [campaign['month'] for campaign in campaigns],
+        'Input folder': [campaign['input_folder'] for campaign in campaigns],
+    })
+    for column in ['Cycles', 'Total measurements', 'Measurement time (s)', 'Error']:
+        summary[column] = [result.get(column) for result in results]
+    # Keep the counts as integers, with missing values for the failed campaigns
+    summary[['Cycles', 'Total measurements']] = summary[['Cycles', 'Total measurements']].astype('Int64')
+    return summary
+
+
+def _read_manifest(manifest):
+    """
+    Reads the campaigns of a batch analysis.
+
+    Parameters
+    ----------
+    manifest : str, pandas.DataFrame or list of dict
+        The campaigns, as a CSV file, a DataFrame or a list of dictionaries.
+
+    Returns
+    -------
+    list of dict
+        A dictionary for each campaign with the keys 'radionuclide', 'year', 'month', 'input_folder', 'time_unit'
+        and 'output_folder'.
+
+    Raises
+    ------
+    ValueError
+        If the manifest lacks a required column.
+    """
+    if isinstance(manifest, str):
+        manifest = pd.read_csv(manifest)
+    df = pd.DataFrame(manifest)
+    missing = [column for column in ['radionuclide', 'year', 'month', 'input_folder'] if column not in df.columns]
+    if missing:
+        raise ValueError(f'Invalid campaigns manifest. Missing columns: {", ".join(missing)}.')
+    campaigns = []
+    for campaign in df.to_dict('records'):
+        # Fill in the optional columns, which may be missing or empty
+        time_unit, output_folder = campaign.get('time_unit'), campaign.get('output_folder')
+        campaigns.append({'radionuclide': campaign['radionuclide'], 'year': int(campaign['year']),
+                          'month': int(campaign['month']), 'input_folder': campaign['input_folder'],
+                          'time_unit': time_unit if isinstance(time_unit, str) else 's',
+                          'output_folder': output_folder if isinstance(output_folder, str) else None})
+    return campaigns
+
+
+def _analyze_campaign(campaign, raw_files='copy'):
+    """
+    Analyzes a measurement campaign of a batch analysis, silencing its progress messages.
+
+    Parameters
+    ----------
+    campaign : dict
+        The campaign, as returned by ``_read_manifest``.
+    raw_files : str or None
+        How the raw CSV files are saved with the results. Default is 'copy'.
+
+    Returns
+    -------
+    dict
+        The number of cycles, the total number of measurements and the total measurement time of the campaign.
+    """
+    processor = Hidex300(campaign['radionuclide'], campaign['year'], campaign['month'])
+    with contextlib.redirect_stdout(io.StringIO()):
+        processor.analyze_readings(campaign['input_folder'], campaign['time_unit'],
+                                   save=campaign['output_folder'] is not None, output_folder=campaign['output_folder'],
+                                   workers=1, raw_files=raw_files)
+    return {'Cycles': processor.cycles, 'Total measurements': processor.total_measurements,
+            'Measurement time (s)': processor.measurement_time}
+
+
+def _get_campaign_result(campaign, analyze):
+    """
+    Gets the result of a campaign of a batch analysis, catching its errors so that they do not stop the others.
+
+    Parameters
+    ----------
+    campaign : dict
+        The campaign, as returned by ``_read_manifest``.
+    analyze : callable
+        A function without arguments that returns the result of ``_analyze_campaign``.
+
+    Returns
+    -------
+    dict
+        The result of the campaign, or its error message under 'Error'.
+    """
+    name = f'{campaign["radionuclide"]} {campaign["year"]}-{campaign["month"]:02d}'
+    try:
+        result = analyze()
+    except Exception as error:
+        print(f'Campaign {name} failed: {error}')
+        return {'Error': str(error) or type(error).__name__}
+    print(f'Campaign {name} done.')
+    return result
+
+
+def fit_decay(measurements, by=None, column='Counts', absolute_sigma=False, max_iterations=100, tolerance=1e-10):
+    """
+    Fits exponential decay curves to one or more series of net measurements by weighted least squares.
+
+    The values of each series are fitted to ``N(t) = A exp(-lambda t)``, where t is the elapsed time, weighting each
+    measurement by the inverse square of its counts uncertainty. All the series are fitted at once: the initial values
+    come from a weighted linear fit of the logarithm of the values and are refined with Levenberg-Marquardt iterations
+    computed on NumPy arrays for every series together, so hundreds of series are fitted in a few milliseconds.
+
+    Parameters
+    ----------
+    measurements : pandas.DataFrame, dict of pandas.DataFrame or list of pandas.DataFrame
+        The net measurements of one or more campaigns, as in ``Hidex300.net``. Each DataFrame is a series, or several
+        if ``by`` is given. A dictionary labels the series with its keys and a list with their positions.
+        All the measurements must have the elapsed time in the same unit.
+    by : str, list of str or None
+        Columns of the measurements that split them into series, e.g. 'Repetition' to fit each repetition along
+        the cycles. If None, each DataFrame is a single series. Default is None.
+    column : str
+        The fitted values: 'Counts' or 'Count rate (cpm)'. The uncertainty of the count rate is the counts
+        uncertainty scaled to the count rate. Default is 'Counts'.
+    absolute_sigma : bool
+        If True, the covariance is computed from the uncertainties as they are. Else, it is scaled by the reduced
+        chi-squared of the fit, as ``scipy.optimize.curve_fit`` does by default. Default is False.
+    max_iterations : int
+        Maximum number of Levenberg-Marquardt iterations. Default is 100.
+    tolerance : float
+        Relative change of the parameters below which a fit has converged. Default is 1e-10.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A row per series with its number of points, the fitted value at elapsed time zero ('Activity', in the
+        units of the column), the decay constant and the half-life in the time unit of the measurements, their
+        uncertainties, the covariance and correlation of the activity and the decay constant, the reduced
+        chi-squared and whether the fit converged. Series with less than two valid points have missing values.
+
+    Raises
+    ------
+    ValueError
+        If an invalid column is provided or the measurements have different time units.
+
+    Examples
+    --------
+    Fit each repetition of a campaign processed with the elapsed time in days
+
+    >>> fit_decay(processor.net, by='Repetition')[['Points', 'Activity', 'Half-life (d)', 'Half-life uncertainty (d)']]
+                Points       Activity  Half-life (d)  Half-life uncertainty (d)
+    Repetition
+    1                4  376647.872328       7.009911                   0.100309
+    2                4  376011.206464       7.055701                   0.091703
+
+    Fit the count rates of several campaigns at once
+
+    >>> fit_decay({'Lu-177 2023-11': processor.net, 'Lu-177 2024-01': processor2.net}, column='Count rate (cpm)')
+    """
+    # Check if the provided column is valid
+    if column not in ['Counts', 'Count rate (cpm)']:
+        raise ValueError('Invalid fit column. Choose from "Counts" or "Count rate (cpm)".')
+    time_unit, index, series, t, y, sigma = _get_decay_series(measurements, by, column)
+    n = len(index)
+    # Fit all the series at once
+    activity, decay, covariance, chi2, converged = _fit_exponentials(series, t, y, sigma, n, max_iterations,
+                                                                    tolerance)
+    points = np.bincount(series, minlength=n)
+    # Scale the covariance by the reduced chi-squared, if required
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reduced_chi2 = np.where(points > 2, chi2 / (points - 2), np.nan)
+        if not absolute_sigma:
+            covariance = covariance * reduced_chi2[:, None, None]
+        activity_uncertainty = np.sqrt(covariance[:, 0, 0])
+        decay_uncertainty = np.sqrt(covariance[:, 1, 1])
+        half_life = np.log(2) / decay
+        return pd.DataFrame({
+            'Points': points,
+            'Activity': activity,
+            'Activity uncertainty': activity_uncertainty,
+            f'Decay constant (1/{time_unit})': decay,
+            f'Decay constant uncertainty (1/{time_unit})': decay_uncertainty,
+            f'Half-life ({time_unit})': half_life,
+            f'Half-life uncertainty ({time_unit})': half_life * decay_uncertainty / decay,
+            'Covariance': covariance[:, 0, 1],
+            'Correlation': covariance[:, 0, 1] / (activity_uncertainty * decay_uncertainty),
+            'Reduced chi-squared': reduced_chi2,
+            'Converged': converged,
+        }, index=index)
+
+
+def _get_decay_series(measurements, by, column):
+    """
+    Gets the points of the series of a decay fit as flat arrays labelled by the position of their series.
+
+    Parameters
+    ----------
+    measurements : pandas.DataFrame, dict of pandas.DataFrame or list of pandas.DataFrame
+        The net measurements, as in ``fit_decay``.
+    by : str, list of str or None
+        Columns of the measurements that split them into series.
+    column : str
+        The fitted values.
+
+    Returns
+    -------
+    tuple
+        The time unit, the index of the series and, for the valid points, the position of their series, their
+        elapsed time, their values and their uncertainties as NumPy arrays.
+
+    Raises
+    ------
+    ValueError
+        If the measurements have different time units.
+    """
+    single = isinstance(measurements, pd.DataFrame)
+    if single:
+        measurements = [measurements]
+    if not isinstance(measurements, dict):
+        measurements = dict(enumerate(measurements))
+    # Check that all the elapsed times have the same unit
+    time_units = {_get_time_unit(df) for df in measurements.values()}
+    if len(time_units) > 1:
+        raise ValueError('Inconsistent time units. Process all the measurements with the same time unit.')
+    time_unit = time_units.pop()
+    # Label the series by their key and the values of the by columns
+    by = [] if by is None else [by] if isinstance(by, str) else list(by)
+    df = pd.concat(measurements, names=['Series', None]).reset_index(level=0)
+    keys = by if single and by else ['Series'] + by
+    groups = df.groupby(keys, sort=False, dropna=False)
+    series = groups.ngroup().to_numpy()
+    index = groups.size().index
+    # Get the points and their uncertainties, scaling the counts uncertainty to the fitted values
+    t = df[f'Elapsed time ({time_unit})'].to_numpy(dtype=float)
+    y = df[column].to_numpy(dtype=float)
+    sigma = df['Counts uncertainty'].to_numpy(dtype=float)
+    if column != 'Counts':
+        sigma = sigma * np.abs(y / df['Counts'].to_numpy(dtype=float))
+    # Discard the points without a valid value or uncertainty
+    with np.errstate(invalid='ignore'):
+        valid = np.isfinite(t) & np.isfinite(y) & np.isfinite(sigma) & (sigma > 0)
+    return time_unit, index, series[valid], t[valid], y[valid], sigma[valid]
+
+
+def _fit_exponentials(series, t, y, sigma, n, max_iterations=100, tolerance=1e-10):
+    """
+    Fits exponential decay curves to several series at once by weighted least squares.
+
+    The parameters of each series are the logarithm of the activity and the decay constant. The sums of the normal
+    equations of all the series are computed with ``numpy.bincount`` and the 2x2 systems are solved in closed form.
+
+    Parameters
+    ----------
+    series : numpy.ndarray
+        The position of the series of each point.
+    t : numpy.ndarray
+        The elapsed time of each point.
+    y : numpy.ndarray
+        The value of each point.
+    sigma : numpy.ndarray
+        The uncertainty of each point.
+    n : int
+        The number of series.
+    max_iterations : int
+        Maximum number of Levenberg-Marquardt iterations. Default is 100.
+    tolerance : float
+        Relative change of the parameters below which a fit has converged. Default is 1e-10.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The activity, the decay constant, the unscaled covariance matrix of both (n x 2 x 2), the chi-squared and
+        whether each fit converged.
+    """
+    def sums(*values):
+        # Sum the values of the points of each series
+        return [np.bincount(series, weights=value, minlength=n) for value in values]
+
+    def chi_squared(log_activity, decay):
+        # Chi-squared of each series for the given parameters
+        residuals = y - np.exp(log_activity[series] - decay[series] * t)
+        return sums(weights * residuals ** 2)[0]
+
+    weights = 1 / sigma ** 2
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Get the initial values from a weighted linear fit of the logarithm of the positive values, whose
+        # uncertainty is the relative uncertainty of the values
+        positive = y > 0
+        log_weights = np.where(positive, weights * y ** 2, 0)
+        log_y = np.log(np.where(positive, y, 1))
+        s, st, stt, sy, sty = sums(log_weights, log_weights * t, log_weights * t ** 2, log_weights * log_y,
+                                   log_weights * t * log_y)
+        determinant = s * stt - st ** 2
+        log_activity = (stt * sy - st * sty) / determinant
+        decay = (st * sy - s * sty) / determinant
+        # Discard the series with less than two points, which can not be fitted
+        active = np.isfinite(log_activity) & np.isfinite(decay) & (np.bincount(series, minlength=n) > 1)
+        log_activity = np.where(active, log_activity, np.nan)
+        decay = np.where(active, decay, np.nan)
+        # Refine the parameters of all the series with Levenberg-Marquardt iterations
+        converged = np.zeros(n, dtype=bool)
+        damping = np.full(n, 1e-3)
+        chi2 = chi_squared(log_activity, decay)
+        for _ in range(max_iterations):
+            if not active.any():
+                break
+            model = np.exp(log_activity[series] - decay[series] * t)
+            residuals = y - model
+            # Gradient and curvature of the chi-squared with respect to the logarithm of the activity and the decay
+            haa, hal, hll, ga, gl = sums(weights * model ** 2, -weights * t * model ** 2, weights * (t * model) ** 2,
+                                         weights * model * residuals, -weights * t * model * residuals)
+            daa = haa * (1 + damping)
+            dll = hll * (1 + damping)
+            determinant = daa * dll - hal ** 2
+            step_activity = np.where(active, (dll * ga - hal * gl) / determinant, 0)
+            step_decay = np.where(active, (daa * gl - hal * ga) / determinant, 0)
+            new_chi2 = chi_squared(log_activity + step_activity, decay + step_decay)
+            # Accept the steps that reduce the chi-squared and adapt the damping
+            better = active & (new_chi2 <= chi2)
+            log_activity = np.where(better, log_activity + step_activity, log_activity)
+            decay = np.where(better, decay + step_decay, decay)
+            chi2 = np.where(better, new_chi2, chi2)
+            damping = np.where(better, damping / 10, damping * 10)
+            # Stop the fits whose steps are negligible
+            small = ((np.abs(step_activity) <= tolerance * (1 + np.abs(log_activity)))
+                     & (np.abs(step_decay) <= tolerance * np.abs(decay)))
+            converged |= active & small
+            active &= ~small & np.isfinite(chi2)
+        # Compute the covariance of the activity and the decay constant from the curvature at the solution
+        model = np.exp(log_activity[series] - decay[series] * t)
+        haa, hal, hll = sums(weights * model ** 2, -weights * t * model ** 2, weights * (t * model) ** 2)
+        determinant = haa * hll - hal ** 2
+        activity = np.exp(log_activity)
+        covariance = np.empty((n, 2, 2))
+        covariance[:, 0, 0] = activity ** 2 * hll / determinant
+        covariance[:, 0, 1] = covariance[:, 1, 0] = -activity * hal / determinant
+        covariance[:, 1, 1] = haa / determinant
+    return activity, decay, covariance, chi2, converged
+
+
+def _pair_measurements(sample, background):
+    """
+    Pairs each sample measurement with the background measurement of the same cycle and repetition.
+
+    Parameters
+    ----------
+    sample : pandas.DataFrame
+        The processed sample measurements.
+    background : pandas.DataFrame
+        The processed background measurements.
+
+    Returns
+    -------
+    tuple of pandas.DataFrame
+        The sample measurements with a background measurement and their background measurements, in the order of the
+        sample measurements. If every sample measurement has the background measurement at its same position, they
+        are the given DataFrames.
+
+    Raises
+    ------
+    ValueError
+        If several background measurements have the same cycle and repetition.
+
+    Examples
+    --------
+    >>> my_sample = pd.DataFrame({'Cycle': [1, 1, 2], 'Repetition': [1, 2, 1], 'Counts': [300., 310., 200.]})
+    >>> my_background = pd.DataFrame({'Cycle': [1, 2], 'Repetition': [1, 1], 'Counts': [10., 12.]})
+    >>> paired_sample, paired_background = _pair_measurements(my_sample, my_background)
+    >>> paired_sample['Counts'] - paired_background['Counts']
+    0    290.0
+    1    188.0
+    Name: Counts, dtype: float64
+    """
+    keys = ['Cycle', 'Repetition']
+    # Index the background measurements by cycle and repetition
+    index = pd.MultiIndex.from_frame(background[keys])
+    if not index.is_unique:
+        raise ValueError('Duplicated cycle and repetition in the background measurements. Check readings table.')
+    # Look up the position of the background measurement of each sample measurement
+    positions = index.get_indexer(pd.MultiIndex.from_frame(sample[keys]))
+    if len(positions) == len(background) and (positions == np.arange(len(positions))).all():
+        return sample, background
+    paired = np.flatnonzero(positions >= 0)
+    return (sample.take(paired).reset_index(drop=True),
+            background.take(positions[paired]).reset_index(drop=True))
+
+
+def _bootstrap_resamples(kind, groups, t, y, sigma, resamples, seed):
+    """
+    Draws a chunk of bootstrap resamples of the repetitions of each cycle and computes their statistics.
+
+    Parameters
+    ----------
+    kind : str
+        The statistic: 'cycles' (mean of each cycle) or 'decay' (fitted decay parameters).
+    groups : list of tuple of int
+        The start and stop positions of the points of each cycle.
+    t : numpy.ndarray
+        The elapsed time of each point.
+    y : numpy.ndarray
+        The value of each point.
+    sigma : numpy.ndarray
+        The uncertainty of each point.
+    resamples : int
+        Number of resamples.
+    seed : numpy.random.SeedSequence
+        The seed of the resamples.
+
+    Returns
+    -------
+    numpy.ndarray
+        The statistics of each resample, with a row per resample and a column per cycle ('cycles') or per parameter:
+        activity, decay constant and half-life ('decay').
+    """
+    rng = np.random.default_rng(seed)
+    # Draw the resamples of each cycle as an array of indices of its repetitions
+    indices = [rng.integers(start, stop, size=(resamples, stop - start)) for start, stop in groups]
+    if kind == 'cycles':
+        return np.column_stack([y[index].mean(axis=1) for index in indices])
+    # Fit all the resamples at once, each one as a series of points
+    index = np.concatenate(indices, axis=1)
+    series = np.repeat(np.arange(resamples), index.shape[1])
+    index = index.ravel()
+    activity, decay, _, _, _ = _fit_exponentials(series, t[index], y[index], sigma[index], resamples)
+    with np.errstate(divide='ignore'):
+        return np.column_stack([activity, decay, np.log(2) / decay])
+
+
+def _propagate_counts(background, sample, trials, dead_time_uncertainty, real_time_uncertainty, rng,
+                      chunk_size=Hidex300._TRIALS_CHUNK_SIZE):
+    """
+    Simulates the background, sample and net counts of all the measurements by Monte Carlo, one chunk of trials at a
+    time, and gets the mean and the standard deviation of each one.
+
+    Parameters
+    ----------
+    background : pandas.DataFrame
+        The processed background measurements.
+    sample : pandas.DataFrame
+        The processed sample measurements, paired by position with the background measurements.
+    trials : int
+        Number of Monte Carlo trials.
+    dead_time_uncertainty : float
+        Standard uncertainty of the dead time.
+    real_time_uncertainty : float
+        Standard uncertainty of the real time (s).
+    rng : numpy.random.Generator
+        The random number generator.
+    chunk_size : int
+        Maximum number of simulated values of each quantity held in memory at once.
+
+    Returns
+    -------
+    list of tuple of numpy.ndarray
+        The mean and the standard deviation of the background, sample and net counts of each measurement.
+    """
+    nominal = [background['Counts'].to_numpy(), sample['Counts'].to_numpy()]
+    nominal.append(nominal[1] - nominal[0])
+    # Sums of the deviations of the simulated counts from their nominal values and of their squares, which keep the
+    # variance accurate when it is small compared to the counts
+    sums = [np.zeros(len(values)) for values in nominal]
+    squares = [np.zeros(len(values)) for values in nominal]
+    chunk_trials = max(1, chunk_size // max(1, len(sample)))
+    for start in range(0, trials, chunk_trials):
+        n = min(chunk_trials, trials - start)
+        simulated = [_simulate_counts(df, n, dead_time_uncertainty, real_time_uncertainty, rng)
+                     for df in [background, sample]]
+        simulated.append(simulated[1] - simulated[0])
+        for values, center, total, square in zip(simulated, nominal, sums, squares):
+            values -= center
+            total += values.sum(axis=0)
+            square += np.einsum('ij,ij->j', values, values)
+    return [(center + total / trials, np.sqrt(np.maximum(square - total ** 2 / trials, 0) / (trials - 1)))
+            for center, total, square in zip(nominal, sums, squares)]
+
+
+def _simulate_counts(df, trials, dead_time_uncertainty, real_time_uncertainty, rng):
+    """
+    Simulates the counts of background or sample measurements for a number of Monte Carlo trials.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The processed background or sample measurements.
+    trials : int
+        Number of Monte Carlo trials.
+    dead_time_uncertainty : float
+        Standard uncertainty of the dead time.
+    real_time_uncertainty : float
+        Standard uncertainty of the real time (s).
+    rng : numpy.random.Generator
+        The random number generator.
+
+    Returns
+    -------
+    numpy.ndarray
+        The simulated counts, with a row per trial and a column per measurement.
+    """
+    counts = df['Counts'].to_numpy()
+    shape = (trials, len(counts))
+    # Sample the counting statistics with the mean and the variance of the Poisson distribution of the counts
+    simulated = rng.standard_normal(shape)
+    simulated *= np.sqrt(counts)
+    simulated += counts
+    # Scale the counts by the sampled real time and dead time, skipping the exact ones
+    if real_time_uncertainty:
+        real_time = df['Real time (s)'].to_numpy()
+        simulated *= 1 + real_time_uncertainty / real_time * rng.standard_normal(shape)
+    if dead_time_uncertainty:
+        dead_time = df['Dead time'].to_numpy()
+        simulated *= dead_time / (dead_time + dead_time_uncertainty * rng.standard_normal(shape))
+    return simulated
+
+
+def _get_csv_files(folder_path):
+    """
+    Retrieves a list of CSV files from the specified folder.
+
+    Parameters
+    ----------
+    folder_path : str
+        The path to the folder containing the files.
+
+    Returns
+    -------
+    list
+        A list of full paths to the CSV files found in the folder.
+
+    Examples
+    --------
+    >>> _get_csv_files('/path/to/folder')
+    Found 3 CSV files in folder /path/to/folder:
+    ['/path/to/folder/file1.csv', '/path/to/folder/file2.csv', '/path/to/folder/file3.csv']
+    """
+    # List to store csv files with their full paths
+    csv_files = []
+    # Iterate over all the files in the given folder
+    for file_name in os.listdir(folder_path):
+        # Check if the file has a .csv extension
+        if file_name.endswith('.csv'):
+            # Append the absolute path of the file to the list
+            csv_files.append(os.path.abspath(os.path.join(folder_path, file_name)))
+    print(f'Found {len(csv_files)} CSV files in folder {folder_path}')
+    return csv_files
+
+
+def _get_workers(workers, files, per_worker=Hidex300._FILES_PER_WORKER):
+    """
+    Gets the number of worker processes used to parse a number of CSV files.
+
+    Parameters
+    ----------
+    workers : int or None
+        The requested number of worker processes. If None, one worker is used per CPU, but each worker gets at least
+        per_worker files so that small folders are parsed in the current process.
+    files : int
+        The number of CSV files to parse.
+    per_worker : int
+        The minimum number of files per worker when the number of workers is chosen automatically.
+        Default is ``Hidex300._FILES_PER_WORKER``.
+
+    Returns
+    -------
+    int
+        The number of worker processes, between 1 and the number of files.
+
+    Raises
+    ------
+    ValueError
+        If the requested number of workers is not a positive integer.
+
+    Examples
+    --------
+    >>> _get_workers(4, 2)
+    2
+    >>> _get_workers(None, 100)  # On a machine with 16 CPUs
+    7
+    """
+    if workers is None:
+        workers = min(os.cpu_count() or 1, -(-files // per_worker))
+    elif isinstance(workers, bool) or not isinstance(workers, int) or workers < 1:
+        raise ValueError('Invalid number of workers. Choose a positive integer or None.')
+    return max(1, min(workers, files))
+
+
+def _is_complete_csv_file(file_path):
+    """
+    Checks if a Hidex 300 CSV file is complete, that is, if its last data block ends with a full alpha matrix.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the CSV file.
+
+    Returns
+    -------
+    bool
+        True if the file has at least a data block and the alpha matrix of the last one has all its rows.
+    """
+    if os.path.getsize(file_path) == 0:
+        return False
+    with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = data.rfind(Hidex300._BLOCK_STARTER.encode())
+        if start == -1:
+            return False
+        matrix = data.find(b'\n' + Hidex300._MATRIX_STARTER.encode(), start)
+        if matrix == -1:
+            return False
+        # Count the rows after the alpha matrix starter, ignoring a trailing newline
+        end = data.find(b'\n', matrix + 1)
+        if end == -1:
+            return False
+        rows = data[end + 1:].rstrip(b'\r\n')
+        return bool(rows) and rows.count(b'\n') + 1 >= Hidex300._MATRIX_ROWS
+
+
+def _parse_files(input_files, workers, engine, rows=None):
+    """
+    Extracts the header rows of each data block of a list of CSV files with the given engine.
+
+    Parameters
+    ----------
+    input_files : list of str
+        The paths to the CSV files.
+    workers : int or None
+        The requested number of worker processes.
+    engine : str
+        The engine used to parse the CSV files. Options are 'python' or 'mmap'.
+    rows : list of str or None
+        The labels of the rows to extract. Default is None (the default rows).
+
+    Returns
+    -------
+    iterable of dict
+        The parsed CSV files, in the order of the input files. Each file is a dictionary mapping the rows to extract
+        to NumPy arrays with a value for each data block.
+
+    Raises
+    ------
+    ValueError
+        If an invalid number of workers is provided.
+    """
+    # Get the number of worker processes
+    workers = _get_workers(workers, len(input_files))
+    # Get the function that parses a single CSV file
+    parser = partial(_parse_csv_file if engine == 'python' else _map_csv_file, rows=rows)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(parser, input_files, chunksize=-(-len(input_files) // workers)))
+    return map(parser, input_files)
+
+
+def _get_parse_cache(cache, folder_path):
+    """
+    Gets the parse cache for the given cache option.
+
+    Parameters
+    ----------
+    cache : bool, str or ParseCache
+        The cache option. If True, the cache is kept in the default subfolder of the folder of the CSV files.
+        If a string, the cache is kept in that folder. A ParseCache object is returned unchanged.
+    folder_path : str
+        Path to the folder containing the CSV files.
+
+    Returns
+    -------
+    ParseCache
+        The parse cache.
+
+    Raises
+    ------
+    ValueError
+        If an invalid cache option is provided.
+    """
+    if isinstance(cache, ParseCache):
+        return cache
+    if cache is True:
+        return ParseCache(os.path.join(folder_path, Hidex300._CACHE_FOLDER))
+    if isinstance(cache, (str, os.PathLike)):
+        return ParseCache(cache)
+    raise ValueError('Invalid parse cache. Choose from True, a folder path, a ParseCache object or None.')
+
+
+def _parse_csv_file(file_path, rows=None):
+    """
+    Extracts the header rows of each data block of a Hidex 300 CSV file into NumPy arrays.
+
+    The values are collected as strings by ``_iter_csv_file`` and each row is converted at once to the type of its
+    field by ``_convert_column``, as in ``_map_csv_file``.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the CSV file.
+    rows : list of str or None
+        The labels of the rows to extract. Default is None (the default rows).
+
+    Returns
+    -------
+    dict
+        A dictionary mapping the rows to extract to NumPy arrays with a value for each data block.
+
+    Examples
+    --------
+    >>> _parse_csv_file('/path/to/folder/file1.csv')['Counts']
+    array([   140, 374237,    146, 373593])
+    """
+    rows = rows or Hidex300._ROWS_TO_EXTRACT
+    blocks = list(_iter_csv_file(file_path, rows=rows, convert=False))
+    # Missing rows are left empty, as in the memory-mapped scanner
+    return {row: _convert_column(np.array([block.get(row, '') for block in blocks], dtype=str), Hidex300._FIELDS[row][1])
+            for row in rows}
+
+
+def _iter_csv_file(file_path, chunk_size=Hidex300._CHUNK_SIZE, rows=None, convert=True):
+    """
+    Iterates over the header rows of each data block of a Hidex 300 CSV file.
+
+    The file is read in large chunks and scanned with a two-state machine. While in the header of a data block,
+    each line is split at the first delimiter and its key is looked up in the rows to extract. Once the spectrum
+    section is reached, the scanner jumps straight to the next block starter without inspecting the spectrum lines.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the CSV file.
+    chunk_size : int
+        Number of characters read from the file at once. Default is 1 MiB.
+    rows : list of str or None
+        The labels of the rows to extract. Default is None (the default rows).
+    convert : bool
+        If True, the values are converted to the types of their fields. Else, they are yielded as strings, to be
+        converted a row at a time. Default is True.
+
+    Yields
+    ------
+    dict
+        A dictionary for each data block, mapping the rows to extract to their values converted to numbers or
+        datetimes, or to their string values.
+
+    Examples
+    --------
+    >>> next(_iter_csv_file('/path/to/folder/file1.csv'))
+    {'Samp.': 1, 'Repe.': 1, 'CPM': 83.97, 'Counts': 140, 'DTime': 1.0, 'Time': 100, 'EndTime': datetime.datetime(2023, 11, 30, 8, 44, 20)}
+    """
+    rows = set(rows or Hidex300._ROWS_TO_EXTRACT)
+    delimiter = Hidex300._DELIMITER
+    block_starter = Hidex300._BLOCK_STARTER
+    spectrum_starter = Hidex300._SPECTRUM_STARTER
+    # A block starter is only valid at the beginning of a line
+    marker = '\n' + block_starter
+    block = None
+    with open(file_path, 'r') as file:
+        # Skip the initial ID lines
+        for _ in range(Hidex300._ID_LINES):
+            file.readline()
+        # The buffer always keeps the newline preceding the current position, so that a block starter at the current
+        # position can be matched with the marker
+        buffer = '\n' + file.read(chunk_size)
+        position = 1
+        end_of_file = len(buffer) == 1
+        # The scanner starts at a line that is expected to be a block starter
+        in_header = True
+        at_marker = True
+        while True:
+            if in_header:
+                # Read the next line, refilling the buffer if the line is not complete
+                end = buffer.find('\n', position)
+                if end == -1 and not end_of_file:
+                    chunk = file.read(chunk_size)
+                    end_of_file = not chunk
+                    buffer = buffer[position - 1:] + chunk
+                    position = 1
+                    continue
+                line = buffer[position:] if end == -1 else buffer[position:end]
+                if line.strip() == block_starter:
+                    # Yield the previous data block and start a new one
+                    if block is not None:
+                        yield _convert_block(block) if convert else block
+                    block = {}
+                elif at_marker or line.startswith(spectrum_starter):
+                    # Not a block starter or at the end of the header of a data block, switch to fast-forward
+                    in_header = False
+                else:
+                    # Extract relevant rows from the line
+                    key, _, values = line.partition(delimiter)
+                    if key in rows:
+                        block[key] = values.split(delimiter, 1)[0].strip()
+                at_marker = False
+                if end == -1:
+                    break
+                position = end + 1
+            else:
+                # Fast-forward to the next block starter
+                start = buffer.find(marker, position - 1)
+                if start != -1:
+                    position = start + 1
+                    in_header = True
+                    at_marker = True
+                elif end_of_file:
+                    break
+                else:
+                    # Keep enough characters to match a marker split between chunks
+                    position = max(position, len(buffer) - len(marker) + 1)
+                    chunk = file.read(chunk_size)
+                    end_of_file = not chunk
+                    buffer = buffer[position - 1:] + chunk
+                    position = 1
+    # Yield the last data block if it exists
+    if block is not None:
+        yield _convert_block(block) if convert else block
+
+
+def _convert_block(block):
+    """
+    Converts the string values of the header rows of a data block to the types of their fields.
+
+    Parameters
+    ----------
+    block : dict
+        A dictionary mapping the rows of a data block to their string values.
+
+    Returns
+    -------
+    dict
+        The same dictionary, with the end time converted to a datetime, number fields to integers or floats, float
+        fields to floats and text fields left as strings.
+
+    Examples
+    --------
+    >>> _convert_block({'CPM': '83.970', 'Counts': '140', 'EndTime': '30/11/2023 08:44:20'})
+    {'CPM': 83.97, 'Counts': 140, 'EndTime': datetime.datetime(2023, 11, 30, 8, 44, 20)}
+    """
+    for row, value in block.items():
+        kind = Hidex300._FIELDS[row][1]
+        if kind == 'datetime':
+            block[row] = datetime.strptime(value, Hidex300._DATE_TIME_FORMAT)
+        elif kind == 'float':
+            block[row] = float(value)
+        elif kind == 'number':
+            try:
+                block[row] = int(value)
+            except ValueError:
+                block[row] = float(value)
+    return block
+
+
+@lru_cache()
+def _compile_header_pattern():
+    """
+    Compiles the regular expression that matches the block starters and the header rows of a Hidex 300 CSV file.
+
+    Any label is matched, so that the cost of the pattern does not depend on the number of rows to extract. The
+    labels are looked up in the rows to extract afterwards.
+
+    Returns
+    -------
+    re.Pattern
+        A bytes pattern with three groups: the block starter, the row label and the row value.
+    """
+    starter = re.escape(Hidex300._BLOCK_STARTER.encode())
+    delimiter = re.escape(Hidex300._DELIMITER.encode())
+    # Matching on the newline that precedes each line, only for lines that start with a letter, lets the regular
+    # expression engine skip the numeric spectrum and matrix lines quickly
+    return re.compile(rb'\n(?=[A-Za-z])(?:(%s)[ \t]*\r?$|([^%s\r\n]+)%s([^%s\r\n]*))'
+                      % (starter, delimiter, delimiter, delimiter), re.MULTILINE)
+
+
+def _map_csv_file(file_path, rows=None):
+    """
+    Extracts the header rows of each data block of a Hidex 300 CSV file using a memory map.
+
+    The file is memory-mapped and scanned with a single pass of a compiled bytes regular expression. The matches are
+    converted into NumPy arrays without decoding the spectrum sections into strings.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the CSV file.
+    rows : list of str or None
+        The labels of the rows to extract. Default is None (the default rows).
+
+    Returns
+    -------
+    dict
+        A dictionary mapping the rows to extract to NumPy arrays with a value for each data block.
+        Rows are converted to the types of their fields.
+
+    Examples
+    --------
+    >>> _map_csv_file('/path/to/folder/file1.csv')['CPM']
+    array([8.3970000e+01, 2.5262323e+05, 8.7570000e+01, 2.5195309e+05])
+    """
+    rows = rows or Hidex300._ROWS_TO_EXTRACT
+    matches = []
+    if os.path.getsize(file_path) > 0:
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Skip the initial ID lines, keeping the position of the newline that ends the last one
+            offset = -1
+            for _ in range(Hidex300._ID_LINES):
+                offset = data.find(b'\n', offset + 1)
+                if offset == -1:
+                    offset = len(data)
+                    break
+            matches = _compile_header_pattern().findall(data, max(offset, 0))
+    matches = np.array(matches, dtype=bytes).reshape(-1, 3)
+    # Assign each match to its data block, discarding matches before the first block starter
+    is_starter = matches[:, 0] != b''
+    block_index = np.cumsum(is_starter) - 1
+    blocks = int(is_starter.sum())
+    # Look up the labels in a hash table of the rows to extract, discarding the other header rows
+    row_index = pd.Index([row.encode() for row in rows]).get_indexer(matches[:, 1])
+    keep = ~is_starter & (block_index >= 0) & (row_index >= 0)
+    row_index, values, block_index = row_index[keep], np.char.strip(matches[keep, 2]), block_index[keep]
+    columns = {}
+    for i, row in enumerate(rows):
+        # Missing rows are left empty, repeated rows keep the last value as in the line scanner
+        column = np.full(blocks, b'', dtype=values.dtype if values.size else 'S1')
+        mask = row_index == i
+        column[block_index[mask]] = values[mask]
+        columns[row] = _convert_column(column, Hidex300._FIELDS[row][1])
+    return columns
+
+
+def _convert_column(column, kind):
+    """
+    Converts an array of bytes or string values of a header row to the type of its field.
+
+    Parameters
+    ----------
+    column : numpy.ndarray
+        The bytes or string values, with an empty value for the data blocks missing the row.
+    kind : str
+        The type of the field: 'number', 'float', 'text' or 'datetime'.
+
+    Returns
+    -------
+    numpy.ndarray
+        The converted values. Missing numbers are NaN and missing texts are empty strings.
+
+    Examples
+    --------
+    >>> _convert_column(np.array([b'140', b'374237']), 'number')
+    array([   140, 374237])
+    """
+    is_bytes = column.dtype.kind == 'S'
+    if kind == 'datetime':
+        column = np.char.decode(column, 'ascii') if is_bytes else column
+        return pd.to_datetime(column, format=Hidex300._DATE_TIME_FORMAT).values
+    if kind == 'text':
+        return np.char.decode(column, 'utf-8') if is_bytes else column
+    if kind == 'number':
+        try:
+            return column.astype(np.int64)
+        except ValueError:
+            pass
+    empty, missing = (b'', b'nan') if is_bytes else ('', 'nan')
+    return np.where(column == empty, missing, column).astype(np.float64)
+
+
+def _iter_block_spans(data):
+    """
+    Iterates over the positions of the data blocks of a memory-mapped Hidex 300 CSV file.
+
+    Parameters
+    ----------
+    data : mmap.mmap
+        The memory-mapped CSV file.
+
+    Yields
+    ------
+    tuple of int
+        The position of the newline before the block starter line and the position of the end of the data block.
+    """
+    block_marker = b'\n' + Hidex300._BLOCK_STARTER.encode()
+    start = data.find(block_marker)
+    while start != -1:
+        end = data.find(block_marker, start + 1)
+        yield start, len(data) if end == -1 else end
+        start = end
+
+
+def _read_spectra(file_path):
+    """
+    Extracts the spectrum of each data block of a Hidex 300 CSV file.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the CSV file.
+
+    Returns
+    -------
+    numpy.ndarray
+        Integer array of shape (blocks, channels, 4) with the Alpha, Beta, Alpha Triple and Beta Triple counts of each
+        channel of each data block, with the narrowest integer dtype that holds all the counts.
+
+    Raises
+    ------
+    ValueError
+        If a data block has no spectrum or its spectrum does not have the expected number of channels.
+    """
+    channels = Hidex300._SPECTRUM_CHANNELS
+    spectrum_marker = b'\n' + Hidex300._SPECTRUM_STARTER.encode()
+    matrix_marker = b'\n' + Hidex300._MATRIX_STARTER.encode()
+    spectra = []
+    if os.path.getsize(file_path) > 0:
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in _iter_block_spans(data):
+                # Find the spectrum rows between the spectrum starter line and the alpha matrix or the next block
+                spectrum = data.find(spectrum_marker, start, end)
+                if spectrum == -1:
+                    raise ValueError(f'Data block without spectrum in CSV file {file_path}.')
+                spectrum_start = data.find(b'\n', spectrum + 1) + 1
+                spectrum_end = data.find(matrix_marker, spectrum_start, end)
+                spectrum_end = end if spectrum_end == -1 else spectrum_end
+                # Parse the rows, dropping the channel number column
+                rows = np.loadtxt(io.BytesIO(data[spectrum_start:spectrum_end]), delimiter=Hidex300._DELIMITER,
+                                  dtype=np.int64, ndmin=2)
+                if rows.shape != (channels, 5):
+                    raise ValueError(f'Spectrum without {channels} channels in CSV file {file_path}.')
+                spectra.append(rows[:, 1:])
+    return _narrow_integers(np.array(spectra, dtype=np.int64).reshape(-1, channels, 4))
+
+
+def _read_matrices(file_path):
+    """
+    Extracts the alpha matrix of each data block of a Hidex 300 CSV file into a sparse store.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the CSV file.
+
+    Returns
+    -------
+    AlphaMatrices
+        The alpha matrices of the data blocks of the file.
+
+    Raises
+    ------
+    ValueError
+        If a data block has no alpha matrix or its alpha matrix does not have the expected shape.
+    """
+    shape = (Hidex300._MATRIX_ROWS, AlphaMatrices._COLUMNS)
+    matrix_marker = b'\n' + Hidex300._MATRIX_STARTER.encode()
+    counts, indices, values = [0], [], []
+    if os.path.getsize(file_path) > 0:
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in _iter_block_spans(data):
+                # Find the matrix rows between the matrix starter line and the next block
+                matrix = data.find(matrix_marker, start, end)
+                if matrix == -1:
+                    raise ValueError(f'Data block without alpha matrix in CSV file {file_path}.')
+                matrix_start = data.find(b'\n', matrix + 1, end) + 1 or end
+                rows = np.loadtxt(io.BytesIO(data[matrix_start:end]), delimiter=Hidex300._DELIMITER, dtype=np.int64,
+                                  ndmin=2)
+                if rows.shape != shape:
+                    raise ValueError(f'Alpha matrix without {shape[0]} rows of {shape[1]} values in CSV file '
+                                     f'{file_path}.')
+                # Keep only the non-zero values and their positions in the flattened matrix
+                flat = rows.ravel()
+                nonzero = np.flatnonzero(flat)
+                counts.append(len(nonzero))
+                indices.append(nonzero)
+                values.append(flat[nonzero])
+    indptr = np.cumsum(counts)
+    indices = np.concatenate(indices) if indices else np.empty(0, dtype=np.int64)
+    values = np.concatenate(values) if values else np.empty(0, dtype=np.int64)
+    return AlphaMatrices(indptr, indices.astype(np.uint16), _narrow_integers(values), shape=shape)
+
+
+def _read_files(reader, input_files, workers):
+    """
+    Reads a list of CSV files with the given reader, in a pool of worker processes if more than one worker is used.
+
+    Parameters
+    ----------
+    reader : callable
+        The function that reads a CSV file, such as ``_read_spectra`` or ``_read_matrices``.
+    input_files : list of str
+        The paths to the CSV files.
+    workers : int or None
+        The requested number of worker processes.
+
+    Returns
+    -------
+    list
+        The results of the reader for each CSV file, in the order of the input files.
+    """
+    workers = _get_workers(workers, len(input_files))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(reader, input_files, chunksize=-(-len(input_files) // workers)))
+    return [reader(input_file) for input_file in input_files]
+
+
+def _sort_blocks(blocks, df):
+    """
+    Sorts per-block data, such as spectra, alpha matrices or block offsets, in the chronological order of the readings.
+
+    Parameters
+    ----------
+    blocks : numpy.ndarray, AlphaMatrices or pandas.DataFrame
+        The per-block data, aligned with the rows of df.
+    df : pandas.DataFrame
+        The unsorted readings, with the 'End time' column.
+
+    Returns
+    -------
+    numpy.ndarray, AlphaMatrices or pandas.DataFrame
+        The per-block data in the order of the readings sorted by end time.
+
+    Raises
+    ------
+    ValueError
+        If the number of blocks is not the number of readings.
+    """
+    if len(blocks) != len(df):
+        raise ValueError('Spectra, alpha matrices or block offsets are not available for all measurements.')
+    # Use the same stable sort as the readings
+    order = np.argsort(df['End time'].to_numpy(), kind='stable')
+    if isinstance(blocks, pd.DataFrame):
+        return blocks.iloc[order].reset_index(drop=True)
+    return blocks[order]
+
+
+def _get_block_index(file_path):
+    """
+    Gets the block index of a Hidex 300 CSV file from its sidecar file, building it if it is missing or out of date.
+
+    The block index holds the header rows of each data block and the byte offsets of its header, spectrum and alpha
+    matrix sections and of its end. It is stored next to the CSV file, with the size and modification time of the
+    file to detect changes. Rows missing from some data blocks are stored as missing values, as returned by
+    ``_map_csv_file``: NaN numbers, empty texts and NaT times. If the sidecar file cannot be written, for example in
+    a read-only archive folder, the index is only kept in memory and it is built again on the next call.
+
+    Parameters
+    ----------
+    file_path : str
+        The path to the CSV file.
+
+    Returns
+    -------
+    dict
+        A dictionary mapping the rows to extract and the offset names to NumPy arrays with a value for each data block.
+    """
+    index_path = file_path + Hidex300._INDEX_SUFFIX
+    stat = os.stat(file_path)
+    fingerprint = [stat.st_size, stat.st_mtime_ns]
+    # Load the sidecar file if the CSV file has not changed since it was written and it holds all the fields
+    if os.path.isfile(index_path):
+        with np.load(index_path) as entry:
+            if entry['Fingerprint'].tolist() == fingerprint and set(Hidex300._FIELDS) <= set(entry.files):
+                return {name: entry[name] for name in entry.files if name != 'Fingerprint'}
+    # Build the index from all the header rows and the positions of the sections of each data block
+    columns = _map_csv_file(file_path, list(Hidex300._FIELDS))
+    spectrum_marker = b'\n' + Hidex300._SPECTRUM_STARTER.encode()
+    matrix_marker = b'\n' + Hidex300._MATRIX_STARTER.encode()
+    offsets = []
+    if stat.st_size > 0:
+        with open(file_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start, end in _iter_block_spans(data):
+                spectrum = data.find(spectrum_marker, start, end)
+                spectrum = end if spectrum == -1 else spectrum
+                matrix = data.find(matrix_marker, spectrum, end)
+                matrix = end if matrix == -1 else matrix
+                # Point to the first character of each section starter line
+                offsets.append([start + 1, spectrum + 1, matrix + 1, end])
+    offsets = np.array(offsets, dtype=np.int64).reshape(-1, len(Hidex300._OFFSET_NAMES))
+    columns.update((name, offsets[:, i]) for i, name in enumerate(Hidex300._OFFSET_NAMES))
+    # Write to a temporary file first so that concurrent readers never see a partial index
+    temporary = f'{index_path}.{os.getpid()}.tmp'
+    try:
+        with open(temporary, 'wb') as file:
+            np.savez(file, Fingerprint=np.array(fingerprint, dtype=np.int64), **columns)
+        os.replace(temporary, index_path)
+    except OSError:
+        # Keep the index in memory if the folder is not writable, removing any partial temporary file
+        with contextlib.suppress(OSError):
+            os.remove(temporary)
+    return columns
+
+
+def _get_index_stamps(input_files):
+    """
+    Gets the modification times of the sidecar block index files of a list of CSV files.
+
+    Parameters
+    ----------
+    input_files : list of str
+        The paths to the CSV files.
+
+    Returns
+    -------
+    numpy.ndarray
+        The modification time in nanoseconds of the block index file of each CSV file, or -1 if it does not exist.
+    """
+    stamps = []
+    for file_path in input_files:
+        try:
+            stamps.append(os.stat(file_path + Hidex300._INDEX_SUFFIX).st_mtime_ns)
+        except FileNotFoundError:
+            stamps.append(-1)
+    return np.array(stamps, dtype=np.int64)
+
+
+def _get_blocks_offsets(input_files, indexes):
+    """
+    Converts the block indexes of a list of CSV files to a table of block locations.
+
+    Parameters
+    ----------
+    input_files : list of str
+        The paths to the CSV files.
+    indexes : list of dict
+        The block index of each CSV file.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A table with the absolute path of the CSV file and the byte offsets of each data block, in the order of the
+        input files.
+    """
+    frames = []
+    for input_file, columns in zip(input_files, indexes):
+        frame = pd.DataFrame({name: columns[name] for name in Hidex300._OFFSET_NAMES})
+        frame.insert(0, 'File', os.path.abspath(input_file))
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _narrow_integers(array):
+    """
+    Converts an integer array to the narrowest integer dtype that holds all its values.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        The integer array.
+
+    Returns
+    -------
+    numpy.ndarray
+        The converted array.
+
+    Examples
+    --------
+    >>> _narrow_integers(np.array([0, 255])).dtype
+    dtype('uint8')
+    >>> _narrow_integers(np.array([-1, 1000])).dtype
+    dtype('int16')
+    """
+    if array.size == 0:
+        return array.astype(np.uint8)
+    minimum, maximum = array.min(), array.max()
+    dtypes = [np.uint8, np.uint16, np.uint32, np.uint64] if minimum >= 0 else [np.int8, np.int16, np.int32, np.int64]
+    for dtype in dtypes:
+        if np.iinfo(dtype).min <= minimum and maximum <= np.iinfo(dtype).max:
+            return array.astype(dtype)
+    return array
+
+
+def _widen_integers(array):
+    """
+    Converts an integer array to int64, so that arithmetic on compact integer columns does not overflow.
+
+    Parameters
+    ----------
+    array : numpy.ndarray
+        The array. Arrays that are not of integers are returned as they are.
+
+    Returns
+    -------
+    numpy.ndarray
+        The converted array.
+
+    Examples
+    --------
+    >>> _widen_integers(np.array([30], dtype=np.uint8)) * 100
+    array([3000])
+    """
+    return array.astype(np.int64) if array.dtype.kind in 'iu' and array.dtype != np.int64 else array
+
+
+def _compact_frame(df, tolerance=Hidex300._COMPACT_TOLERANCE):
+    """
+    Downcasts the columns of a DataFrame to compact dtypes.
+
+    The integer columns are converted to the narrowest integer dtype that holds their values, the float64 columns to
+    float32 if all their values round-trip within the relative tolerance, and the text columns to categorical if less
+    than half of their values are unique. The other columns are kept as they are.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The DataFrame to downcast.
+    tolerance : float
+        Maximum relative difference between a float64 value and its float32 version.
+        Default is ``Hidex300._COMPACT_TOLERANCE``.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A new DataFrame with the downcast columns.
+
+    Examples
+    --------
+    >>> _compact_frame(pd.DataFrame({'Cycle': [1, 2], 'Dead time': [1.0, 1.125], 'Time': [1.0, 1e40]})).dtypes
+    Cycle          uint8
+    Dead time    float32
+    Time         float64
+    dtype: object
+    """
+    columns = {}
+    for column, values in df.items():
+        dtype = values.dtype
+        if isinstance(dtype, np.dtype) and dtype.kind in 'iu':
+            columns[column] = _narrow_integers(values.to_numpy())
+        elif dtype == np.float64:
+            array = values.to_numpy()
+            with np.errstate(over='ignore'):
+                compact = array.astype(np.float32)
+            if np.isclose(compact, array, rtol=tolerance, atol=0, equal_nan=True).all():
+                columns[column] = compact
+            else:
+                columns[column] = array
+        elif dtype == object and values.map(type).eq(str).all() and values.nunique() < len(values) / 2:
+            columns[column] = values.astype('category')
+        else:
+            columns[column] = values
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _get_default_memory(df):
+    """
+    Gets the memory that a DataFrame would use with the default dtypes: int64, float64 and text.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The DataFrame, possibly with compact dtypes.
+
+    Returns
+    -------
+    int
+        The memory in bytes, without the index.
+
+    Examples
+    --------
+    >>> _get_default_memory(pd.DataFrame({'Cycle': np.array([1, 2], dtype=np.uint8)}))
+    16
+    """
+    memory = 0
+    for _, values in df.items():
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            memory += values.astype(object).memory_usage(index=False, deep=True)
+        elif values.dtype.kind in 'iuf':
+            memory += 8 * len(values)
+        else:
+            memory += values.memory_usage(index=False, deep=True)
+    return int(memory)
+
+
+def _write_table(df, file_path, format='csv', compression=None, key='table'):
+    """
+    Writes a DataFrame to a CSV, Parquet, Feather or HDF5 file.
+
+    The index of the DataFrame is not written. The Parquet and Feather files store the pandas metadata of the table,
+    so a multi-level header is restored by ``pandas.read_parquet`` and ``pandas.read_feather``.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The DataFrame to write.
+    file_path : str
+        The path to the file. For a compressed CSV file, the extension of the compression is appended.
+    format : str
+        The format of the file: 'csv', 'parquet', 'feather' or 'hdf5'. Default is 'csv'.
+    compression : str or None
+        The compression of the file. Default is None (the default of the format).
+    key : str
+        The key of the table in the HDF5 file. Default is 'table'.
+
+    Returns
+    -------
+    str
+        The path to the written file.
+
+    Raises
+    ------
+    ValueError
+        If an invalid CSV compression is provided.
+
+    Examples
+    --------
+    >>> _write_table(pd.DataFrame({'a': [1, 2]}), '/path/to/table.csv', 'csv', 'gzip')
+    '/path/to/table.csv.gz'
+    """
+    if format == 'csv':
+        # Append the extension of the compression so the file can be read back with pandas.read_csv
+        if compression is not None:
+            if compression not in Hidex300._CSV_COMPRESSIONS:
+                raise ValueError(f'Invalid CSV compression. Choose from "gzip", "bz2", "zip", "xz", or "zstd".')
+            file_path += Hidex300._CSV_COMPRESSIONS[compression]
+        df.to_csv(file_path, index=False, compression=compression)
+    elif format == 'parquet':
+        # Keep the default index out of the file as metadata only
+        df.reset_index(drop=True).to_parquet(file_path, compression=compression or 'snappy')
+    elif format == 'feather':
+        # Write through pyarrow since pandas.DataFrame.to_feather does not accept a multi-level header
+        import pyarrow as pa
+        import pyarrow.feather as feather
+        table = pa.Table.from_pandas(df.reset_index(drop=True))
+        feather.write_feather(table, file_path, compression=compression)
+    else:
+        # Store the categorical columns as text since the fixed HDF5 format does not support them
+        categorical = [column for column, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)]
+        if categorical:
+            df = df.astype(dict.fromkeys(categorical, object))
+        df.reset_index(drop=True).to_hdf(file_path, key=key, mode='w', complib=compression,
+                                         complevel=9 if compression else None)
+    return file_path
+
+
+def _save_raw_files(input_folder, folder, mode, store_folder):
+    """
+    Saves the raw CSV files of an analysis to its results folder.
+
+    The parse cache folder and the sidecar block index files are not saved.
+
+    Parameters
+    ----------
+    input_folder : str
+        Path to the folder containing the CSV files with readings.
+    folder : str
+        Path to the results folder of the analysis.
+    mode : str
+        How the files are saved: 'copy', 'link', 'archive' or 'store'.
+    store_folder : str
+        Path to the content-addressed store of raw CSV files, used only in 'store' mode.
+
+    Examples
+    --------
+    >>> _save_raw_files('/path/to/input/folder', '/path/to/output/Lu-177_2023_11', 'link', '/path/to/output/.store')
+    Raw files linked to "/path/to/output/Lu-177_2023_11/readings" folder.
+    """
+    if mode == 'copy':
+        shutil.copytree(input_folder, f'{folder}/readings',
+                        ignore=shutil.ignore_patterns(Hidex300._CACHE_FOLDER, f'*{Hidex300._INDEX_SUFFIX}'))
+    elif mode == 'link':
+        # Hard link each file, falling back to a copy across file systems or where links are not supported
+        for name in _get_raw_files(input_folder):
+            target = os.path.join(folder, 'readings', name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.link(os.path.join(input_folder, name), target)
+            except OSError:
+                shutil.copy2(os.path.join(input_folder, name), target)
+        print(f'Raw files linked to "{folder}/readings" folder.')
+    elif mode == 'archive':
+        with zipfile.ZipFile(f'{folder}/readings.zip', 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name in _get_raw_files(input_folder):
+                archive.write(os.path.join(input_folder, name), arcname=name)
+        print(f'Raw files archived to "{folder}/readings.zip" file.')
+    else:
+        # Store each distinct file once under its content hash and record where each file of the analysis is
+        os.makedirs(store_folder, exist_ok=True)
+        manifest = {}
+        for name in _get_raw_files(input_folder):
+            source = os.path.join(input_folder, name)
+            entry = f'{_hash_file(source)}{os.path.splitext(name)[1]}'
+            entry_path = os.path.join(store_folder, entry)
+            if not os.path.exists(entry_path):
+                # Write to a temporary file first so that concurrent analyses never see a partial entry
+                temporary = f'{entry_path}.{os.getpid()}.tmp'
+                shutil.copy2(source, temporary)
+                os.replace(temporary, entry_path)
+            manifest[name] = os.path.relpath(entry_path, folder)
+        with open(f'{folder}/readings.json', 'w') as file:
+            json.dump(manifest, file, indent=2)
+        print(f'Raw files stored in "{store_folder}" folder.')
+
+
+def _get_raw_files(input_folder):
+    """
+    Gets the paths of the raw files of a folder of CSV files, relative to the folder.
+
+    The parse cache folder and the sidecar block index files are skipped.
+
+    Parameters
+    ----------
+    input_folder : str
+        Path to the folder containing the CSV files with readings.
+
+    Returns
+    -------
+    list of str
+        The sorted relative paths of the files.
+
+    Examples
+    --------
+    >>> _get_raw_files('/path/to/input/folder')
+    ['Lu-177_2023_11_30.csv', 'Lu-177_2023_12_01.csv']
+    """
+    names = []
+    for root, folders, files in os.walk(input_folder):
+        folders[:] = [folder for folder in folders if folder != Hidex300._CACHE_FOLDER]
+        for file in files:
+            if not file.endswith(Hidex300._INDEX_SUFFIX):
+                names.append(os.path.relpath(os.path.join(root, file), input_folder))
+    return sorted(names)
+
+
+def _hash_file(file_path):
+    """
+    Computes the hash of the content of a file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the file.
+
+    Returns
+    -------
+    str
+        The hexadecimal BLAKE2b digest of 16 bytes of the file.
+
+    Examples
+    --------
+    >>> _hash_file('/path/to/file.csv')
+    '5d41402abc4b2a76b9719d911017c592'
+    """
+    content_hash = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(Hidex300._CHUNK_SIZE), b''):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+def _get_elapsed_time(df, time_unit='s', initial_time=None):
+    """
+    Calculate the elapsed time from the minimum 'End time' in a dataframe and convert it to the specified time unit.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The time data containing a column 'End time' with datetime values.
+    time_unit : str
+        The unit of time to convert the elapsed time to. Options are 's' (seconds), 'min' (minutes), 'h' (hours),
+        'd' (days), 'wk' (weeks), 'mo' (months), 'yr' (years). Default is 's'.
+    initial_time : pandas.Timestamp or None
+        The time from which the elapsed time is calculated. If None, the minimum 'End time' is used. Default is None.
 
     Returns
     -------
@@ -915,7 +4342,8 @@ def _get_elapsed_time(df, time_unit='s'):
     """
     # TODO: check time conversion factors
     # Find the earliest 'End time' in the DataFrame
-    initial_time = df['End time'].min()
+    if initial_time is None:
+        initial_time = df['End time'].min()
     # Calculate the elapsed time from the initial time for each entry
     elapsed_time = df['End time'] - initial_time
     # Define conversion factors for different time units
@@ -932,12 +4360,130 @@ def _get_elapsed_time(df, time_unit='s'):
     if time_unit not in time_conversion:
         raise ValueError(f'Invalid unit. Choose from seconds ("s"), minutes ("min"), hours ("h"), days ("d"), '
                          f'weeks ("wk"), months ("mo"), or years ("yr").')
-    # Convert elapsed time to the specified unit
-    elapsed_time_unit = pd.Series([i.total_seconds() for i in elapsed_time]) * time_conversion[time_unit]
+    # Convert elapsed time to seconds as Timedelta.total_seconds does (whole seconds plus microseconds), then to the
+    # specified unit
+    microseconds = elapsed_time.to_numpy().astype('m8[ns]').view(np.int64) // 1000
+    seconds = microseconds // 1000000 + (microseconds % 1000000) / 1e6
+    seconds = np.where(elapsed_time.isna().to_numpy(), np.nan, seconds)
+    elapsed_time_unit = pd.Series(seconds) * time_conversion[time_unit]
     return elapsed_time, elapsed_time_unit
 
 
-def _plot_background_sample_measurements(df, kind):
+def _process_measurements(df, time_unit='s', initial_time=None):
+    """
+    Calculates the live time, elapsed time, counts, and counts uncertainty of background or sample measurements.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The readings of the background or sample measurements.
+    time_unit : str
+        The unit of time for the elapsed time. Default is seconds ('s').
+    initial_time : pandas.Timestamp or None
+        The time from which the elapsed time is calculated. If None, the minimum 'End time' is used. Default is None.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same DataFrame with the calculated columns added.
+    """
+    # Calculate the elapsed time and its unit
+    elapsed_time, elapsed_time_unit = _get_elapsed_time(df, time_unit, initial_time)
+    # Calculate the live time, the counts and their uncertainty on the NumPy arrays of the readings
+    live_time = df['Real time (s)'].to_numpy(dtype=np.float64) / df['Dead time'].to_numpy(dtype=np.float64)
+    counts = df['Count rate (cpm)'].to_numpy(dtype=np.float64) * live_time / 60
+    uncertainty = np.sqrt(counts)
+    # Add the calculated quantities to the DataFrame
+    df['Live time (s)'] = live_time
+    df['Elapsed time'] = elapsed_time
+    df[f'Elapsed time ({time_unit})'] = elapsed_time_unit
+    df['Counts'] = counts
+    df['Counts uncertainty'] = uncertainty
+    df['Counts uncertainty (%)'] = uncertainty / counts * 100
+    return df
+
+
+def _get_time_unit(df):
+    """
+    Gets the unit of the elapsed time of processed measurements from the label of its column.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The processed measurements, with a column 'Elapsed time (unit)'.
+
+    Returns
+    -------
+    str
+        The unit of the elapsed time.
+
+    Examples
+    --------
+    >>> _get_time_unit(pd.DataFrame(columns=['Elapsed time', 'Elapsed time (h)']))
+    'h'
+    """
+    etime_column = [col for col in df.columns if col.startswith('Elapsed time (')][0]
+    return etime_column.split('(')[-1].strip(')')
+
+
+def _save_plot(df, kind, file_path):
+    """
+    Saves the plot of background, sample or net measurements to a PNG file.
+
+    The figure is not registered in pyplot, so it is freed as soon as it is saved and no interactive backend is used.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        The measurement data.
+    kind : str
+        The type of measurements: 'background', 'sample' or 'net'.
+    file_path : str
+        The path to the PNG file.
+
+    Examples
+    --------
+    >>> _save_plot(processor.net, 'net', '/path/to/folder/net.png')
+    """
+    if kind == 'net':
+        fig = _plot_net_measurements(df, pyplot=False)
+    else:
+        fig = _plot_background_sample_measurements(df, kind, pyplot=False)
+    fig.savefig(file_path)
+
+
+def _create_figure(figsize, pyplot=True):
+    """
+    Creates an empty figure, importing matplotlib on first use.
+
+    Matplotlib is imported here rather than with the module so that parsing, processing and exporting tables do not
+    pay for its import or initialize a plotting backend.
+
+    Parameters
+    ----------
+    figsize : tuple of float
+        The width and height of the figure in inches.
+    pyplot : bool
+        If True, the figure is created with pyplot so that it can be shown. If False, it is a standalone figure that
+        can only be saved. Default is True.
+
+    Returns
+    -------
+    matplotlib.figure.Figure
+        The empty figure.
+
+    Examples
+    --------
+    >>> fig = _create_figure(figsize=(8, 6), pyplot=False)
+    """
+    if pyplot:
+        import matplotlib.pyplot as plt
+        return plt.figure(figsize=figsize)
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
+
+def _plot_background_sample_measurements(df, kind, pyplot=True):
     """
     Plots various quantities for background or sample measurements from the given DataFrame.
 
@@ -948,6 +4494,9 @@ def _plot_background_sample_measurements(df, kind):
         'Real time (s)', 'Live time (s)', 'Counts (reading)', 'Counts', and 'Counts uncertainty (%)'.
     kind : str
         A string indicating the type of measurements (e.g., 'background' or 'sample').
+    pyplot : bool
+        If True, the figure is created with pyplot so that it can be shown. If False, it is a standalone figure that
+        can only be saved. Default is True.
 
     Returns
     -------
@@ -974,7 +4523,8 @@ def _plot_background_sample_measurements(df, kind):
     x_label = 'End time'
     marker_size = 2
     # Create a 3x2 grid of subplots
-    fig, axs = plt.subplots(3, 2, figsize=(1.5 * 8, 1.5 * 6), sharex=True)
+    fig = _create_figure(figsize=(1.5 * 8, 1.5 * 6), pyplot=pyplot)
+    axs = fig.subplots(3, 2, sharex=True)
     # Plot 'Count rate (cpm)' on the first subplot
     axs[0, 0].plot(x, df['Count rate (cpm)'], 'o-', markersize=marker_size)
     axs[0, 0].set_ylabel('Count rate (cpm)')
@@ -1002,11 +4552,11 @@ def _plot_background_sample_measurements(df, kind):
     # Set the overall title for the figure
     fig.suptitle(f'{kind.capitalize()} measurements')
     # Adjust the layout to prevent overlap
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
 
 
-def _plot_net_measurements(df):
+def _plot_net_measurements(df, pyplot=True):
     """
     Plots various quantities for net measurements from the given DataFrame.
 
@@ -1015,6 +4565,9 @@ def _plot_net_measurements(df):
     df : pandas.DataFrame
         The measurement data with columns 'Elapsed time (unit)', 'Counts', and
         'Counts uncertainty (%)'.
+    pyplot : bool
+        If True, the figure is created with pyplot so that it can be shown. If False, it is a standalone figure that
+        can only be saved. Default is True.
 
     Returns
     -------
@@ -1032,14 +4585,14 @@ def _plot_net_measurements(df):
     >>> plt.show()
     """
     # Extracting the unit from the column label
-    etime_column = [col for col in df.columns if col.startswith('Elapsed time (')][0]
-    unit = etime_column.split('(')[-1].strip(')')
+    unit = _get_time_unit(df)
     # Extract the 'Elapsed time' column for the x-axis
     x = df[f'Elapsed time ({unit})']
     x_label = f'Elapsed time ({unit})'
     marker_size = 2
     # Create a 2x1 grid of subplots
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 6), sharex=True)
+    fig = _create_figure(figsize=(8, 6), pyplot=pyplot)
+    ax1, ax2 = fig.subplots(2, 1, sharex=True)
     # Plot 'Counts' on the first subplot
     ax1.plot(x, df['Counts'], 'o-', markersize=marker_size)
     ax1.set_ylabel('Counts')
@@ -1053,5 +4606,5 @@ def _plot_net_measurements(df):
     # Set the overall title for the figure
     fig.suptitle('Net quantities measurements')
     # Adjust the layout to prevent overlap
-    plt.tight_layout()
+    fig.tight_layout()
     return fig
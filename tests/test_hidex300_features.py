@@ -1,9 +1,20 @@
+import json
+import logging
 import os
+import shutil
+import subprocess
+import sys
+import zipfile
+from datetime import datetime
 
+import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import pytest
 
-from metpyrad.hidex300 import Hidex300
+from metpyrad.__main__ import main
+from metpyrad.hidex300 import (Hidex300, ParseCache, AlphaMatrices, Metrics, analyze_campaigns, fit_decay,
+                                _iter_csv_file, _read_spectra, _compact_frame, _get_block_index)
 
 
 class TestHidex300Analyze:
@@ -36,6 +47,1064 @@ class TestHidex300Features:
         assert repr(processor) == expected_repr
 
 
+class TestImport:
+
+    def test_import_does_not_load_matplotlib(self):
+        # Import the package in a fresh interpreter and list the plotting modules it loaded
+        code = 'import sys, metpyrad; print(sorted(m for m in sys.modules if m.split(".")[0] == "matplotlib"))'
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == '[]'
+
+    def test_export_plot_does_not_load_pyplot(self, tmpdir):
+        code = ('import sys, contextlib, io, metpyrad\n'
+                'processor = metpyrad.Hidex300("Lu-177", 2023, 11)\n'
+                'with contextlib.redirect_stdout(io.StringIO()):\n'
+                '    processor.parse_readings("./data/hidex300")\n'
+                '    processor.process_readings("all")\n'
+                f'    processor.export_plot("net", {str(tmpdir)!r})\n'
+                'print("matplotlib.pyplot" in sys.modules)')
+        result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == 'False'
+        assert os.path.isfile(os.path.join(tmpdir, 'net.png'))
+
+
+class TestHidex300IterCsvFile:
+
+    def test_iter_csv_file(self):
+        blocks = list(_iter_csv_file('./data/hidex300/Lu-177_2023_11_30.csv'))
+        assert len(blocks) == 4
+        assert blocks[0] == {'Samp.': 1, 'Repe.': 1, 'CPM': 83.97, 'Counts': 140, 'DTime': 1.0, 'Time': 100,
+                             'EndTime': datetime(2023, 11, 30, 8, 44, 20)}
+
+    @pytest.mark.parametrize('chunk_size', [1, 7, 64, 4096])
+    def test_iter_csv_file_chunk_size(self, chunk_size):
+        # The extracted blocks must not depend on where the chunks are split
+        expected = list(_iter_csv_file('./data/hidex300/Lu-177_2023_12_06.csv'))
+        assert list(_iter_csv_file('./data/hidex300/Lu-177_2023_12_06.csv', chunk_size=chunk_size)) == expected
+
+    def test_iter_blocks(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        blocks = processor.iter_blocks('./data/hidex300/Lu-177_2023_11_30.csv')
+        assert next(blocks) == {'File': os.path.abspath('./data/hidex300/Lu-177_2023_11_30.csv'), 'Sample': 1,
+                                'Repetition': 1, 'Count rate (cpm)': 83.97, 'Counts (reading)': 140, 'Dead time': 1.0,
+                                'Real time (s)': 100, 'End time': datetime(2023, 11, 30, 8, 44, 20)}
+        assert len(list(processor.iter_blocks('./data/hidex300'))) == 16
+
+
+class TestHidex300ParseReadings:
+
+    def test_parse_readings_workers(self):
+        serial = Hidex300('Lu-177', 2023, 11)
+        serial.parse_readings('./data/hidex300', workers=1)
+        parallel = Hidex300('Lu-177', 2023, 11)
+        parallel.parse_readings('./data/hidex300', workers=2)
+        pd.testing.assert_frame_equal(parallel.readings, serial.readings)
+        assert parallel.cycles == serial.cycles
+
+    def test_parse_readings_mmap_engine(self):
+        python = Hidex300('Lu-177', 2023, 11)
+        python.parse_readings('./data/hidex300', engine='python')
+        mmap = Hidex300('Lu-177', 2023, 11)
+        mmap.parse_readings('./data/hidex300', engine='mmap')
+        pd.testing.assert_frame_equal(mmap.readings, python.readings)
+
+    def test_parse_readings_invalid_engine(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='Invalid parser engine. Choose from "python" or "mmap".'):
+            processor.parse_readings('./data/hidex300', engine='invalid')
+
+    def test_parse_readings_invalid_workers(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='Invalid number of workers. Choose a positive integer or None.'):
+            processor.parse_readings('./data/hidex300', workers=0)
+
+    @pytest.mark.parametrize('engine', ['python', 'mmap'])
+    def test_parse_readings_fields(self, engine):
+        default = Hidex300('Lu-177', 2023, 11)
+        default.parse_readings('./data/hidex300')
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings('./data/hidex300', engine=engine, fields=['TDCR', 'DPM', 'Temp', 'WName'])
+        pd.testing.assert_frame_equal(processor.readings[default.readings.columns], default.readings)
+        extra = processor.readings.iloc[0, -4:].to_dict()
+        assert extra == {'TDCR': 0.664, 'Disintegration rate (dpm)': 126.0, 'Temperature': 24.1, 'Well name': 'A01'}
+        assert processor.readings['Disintegration rate (dpm)'].dtype == float
+
+    def test_parse_readings_missing_rows(self, tmpdir):
+        # Remove the QPE and well name rows of the first data block of a file
+        shutil.copy('./data/hidex300/Lu-177_2023_11_30.csv', tmpdir)
+        file_path = os.path.join(tmpdir, 'Lu-177_2023_11_30.csv')
+        with open(file_path) as file:
+            content = file.read()
+        with open(file_path, 'w') as file:
+            file.write(content.replace('QPE;786.730\n', '', 1).replace('WName;A01\n', '', 1))
+        readings = {}
+        for engine in ['python', 'mmap']:
+            processor = Hidex300('Lu-177', 2023, 11)
+            processor.parse_readings(str(tmpdir), engine=engine, fields=['QPE', 'WName'])
+            readings[engine] = processor.readings
+        # Both engines convert the rows a column at a time, leaving the missing values empty
+        pd.testing.assert_frame_equal(readings['python'], readings['mmap'])
+        assert readings['python']['QPE'].isna().sum() == 1
+        assert (readings['python']['Well name'] == '').sum() == 1
+
+    def test_parse_readings_invalid_fields(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='Invalid header field. Choose from "Vial", "WName", "DPM"'):
+            processor.parse_readings('./data/hidex300', fields=['Column 17'])
+
+
+class TestHidex300ExportTable:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.parse_readings('./data/hidex300')
+        self.processor.process_readings('all', time_unit='h')
+        self.folder = str(tmpdir.mkdir('output'))
+
+    @pytest.mark.parametrize('kind', ['readings', 'background', 'sample', 'net', 'all'])
+    def test_export_table_parquet(self, kind):
+        self.processor.export_table(kind, self.folder, format='parquet', compression='zstd')
+        expected = self.processor._compile_measurements() if kind == 'all' else getattr(self.processor, kind)
+        df = pd.read_parquet(os.path.join(self.folder, f'{kind}.parquet'))
+        pd.testing.assert_frame_equal(df, expected)
+
+    @pytest.mark.parametrize('kind', ['readings', 'net', 'all'])
+    def test_export_table_feather(self, kind):
+        self.processor.export_table(kind, self.folder, format='feather')
+        expected = self.processor._compile_measurements() if kind == 'all' else getattr(self.processor, kind)
+        df = pd.read_feather(os.path.join(self.folder, f'{kind}.feather'))
+        pd.testing.assert_frame_equal(df, expected)
+
+    @pytest.mark.parametrize('kind', ['readings', 'net', 'all'])
+    def test_export_table_hdf5(self, kind):
+        self.processor.export_table(kind, self.folder, format='hdf5', compression='blosc')
+        expected = self.processor._compile_measurements() if kind == 'all' else getattr(self.processor, kind)
+        df = pd.read_hdf(os.path.join(self.folder, f'{kind}.h5'), key=kind)
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_export_table_csv_compression(self):
+        self.processor.export_table('readings', self.folder, compression='gzip')
+        df = pd.read_csv(os.path.join(self.folder, 'readings.csv.gz'), parse_dates=['End time'])
+        pd.testing.assert_frame_equal(df, self.processor.readings)
+
+    def test_analyze_readings_format(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.analyze_readings('./data/hidex300', time_unit='s', save=True, output_folder=self.folder,
+                                   format='parquet')
+        folder = os.path.join(self.folder, 'Lu-177_2023_11')
+        for kind in ['readings', 'background', 'sample', 'net', 'all']:
+            assert os.path.exists(os.path.join(folder, f'{kind}.parquet'))
+            assert not os.path.exists(os.path.join(folder, f'{kind}.csv'))
+
+
+class TestHidex300RawFiles:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.input_folder = str(tmpdir.join('input'))
+        shutil.copytree('./data/hidex300', self.input_folder)
+        self.output_folder = str(tmpdir.join('output'))
+        self.files = sorted(os.listdir(self.input_folder))
+
+    def analyze(self, month, raw_files):
+        processor = Hidex300('Lu-177', 2023, month)
+        processor.analyze_readings(self.input_folder, time_unit='s', save=True, output_folder=self.output_folder,
+                                   raw_files=raw_files)
+        return os.path.join(self.output_folder, f'Lu-177_2023_{month}')
+
+    def test_raw_files_link(self):
+        folder = self.analyze(11, 'link')
+        for file_name in self.files:
+            assert os.path.samefile(os.path.join(folder, 'readings', file_name),
+                                    os.path.join(self.input_folder, file_name))
+
+    def test_raw_files_archive(self):
+        folder = self.analyze(11, 'archive')
+        with zipfile.ZipFile(os.path.join(folder, 'readings.zip')) as archive:
+            assert sorted(archive.namelist()) == self.files
+            with open(os.path.join(self.input_folder, self.files[0]), 'rb') as file:
+                assert archive.read(self.files[0]) == file.read()
+        assert not os.path.exists(os.path.join(folder, 'readings'))
+
+    def test_raw_files_store(self):
+        folders = [self.analyze(11, 'store'), self.analyze(12, 'store')]
+        # The files of both analyses are stored once
+        assert len(os.listdir(os.path.join(self.output_folder, Hidex300._STORE_FOLDER))) == len(self.files)
+        manifests = []
+        for folder in folders:
+            with open(os.path.join(folder, 'readings.json')) as file:
+                manifests.append(json.load(file))
+            assert sorted(manifests[-1]) == self.files
+            for file_name, entry in manifests[-1].items():
+                with open(os.path.join(folder, entry), 'rb') as stored, \
+                        open(os.path.join(self.input_folder, file_name), 'rb') as original:
+                    assert stored.read() == original.read()
+        assert manifests[0] == manifests[1]
+
+    def test_raw_files_none(self):
+        folder = self.analyze(11, None)
+        assert not os.path.exists(os.path.join(folder, 'readings'))
+        assert os.path.isfile(os.path.join(folder, 'summary.txt'))
+
+
+class TestHidex300Plots:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.parse_readings('./data/hidex300')
+        self.processor.process_readings('all', time_unit='h')
+        self.folder = str(tmpdir.mkdir('output'))
+        plt.close('all')
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_export_plots(self, workers):
+        self.processor.export_plots(self.folder, workers=workers)
+        for kind in ['background', 'sample', 'net']:
+            assert os.path.getsize(os.path.join(self.folder, f'{kind}.png')) > 0
+        # No figure is left open
+        assert plt.get_fignums() == []
+
+    def test_export_plots_default_in_process(self, monkeypatch):
+        # The default does not start a pool of worker processes
+        monkeypatch.setattr('metpyrad.hidex300.ProcessPoolExecutor', None)
+        self.processor.export_plots(self.folder)
+        assert os.path.isfile(os.path.join(self.folder, 'net.png'))
+
+    def test_export_plot_closes_figure(self):
+        self.processor.export_plot('sample', self.folder)
+        assert os.path.isfile(os.path.join(self.folder, 'sample.png'))
+        assert plt.get_fignums() == []
+
+    def test_plot_measurements(self):
+        fig = self.processor.plot_measurements('net')
+        assert plt.get_fignums() == [fig.number]
+        plt.close(fig)
+
+    def test_analyze_readings_deferred_plots(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.analyze_readings('./data/hidex300', time_unit='s', save=True, output_folder=self.folder,
+                                   plots=False)
+        folder = os.path.join(self.folder, 'Lu-177_2023_11')
+        assert not os.path.exists(os.path.join(folder, 'net.png'))
+        processor.export_plots(folder, workers=1)
+        assert os.path.isfile(os.path.join(folder, 'net.png'))
+
+
+class TestHidex300Metrics:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.metrics = Metrics()
+        self.folder = str(tmpdir.mkdir('input'))
+        for file_name in os.listdir('./data/hidex300'):
+            shutil.copy(os.path.join('./data/hidex300', file_name), self.folder)
+        self.output_folder = str(tmpdir.mkdir('output'))
+
+    def test_metrics_disabled(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(self.folder)
+        assert processor.metrics is None
+
+    @pytest.mark.parametrize('engine', ['python', 'mmap'])
+    def test_parse_readings_metrics(self, engine):
+        self.processor.parse_readings(self.folder, engine=engine)
+        files = [os.path.join(self.folder, file_name) for file_name in os.listdir(self.folder)]
+        assert self.processor.metrics.counters == {
+            'files': 4, 'files parsed': 4, 'bytes read': sum(os.path.getsize(file_path) for file_path in files),
+            'blocks parsed': 16, 'rows produced': 16}
+        assert list(self.processor.metrics.timings) == ['discovery', 'parse', 'conversion', 'sort']
+
+    def test_parse_readings_index_metrics(self):
+        self.processor.parse_readings(self.folder, index=True)
+        assert self.processor.metrics.counters['files parsed'] == 4
+        self.processor.metrics.reset()
+        # The second time the readings are loaded from the block index
+        self.processor.parse_readings(self.folder, index=True)
+        assert self.processor.metrics.counters['files parsed'] == 0
+        assert self.processor.metrics.counters['bytes read'] == 0
+        assert self.processor.metrics.counters['blocks parsed'] == 0
+
+    def test_analyze_readings_metrics_callback(self):
+        events = []
+        self.processor.metrics = Metrics(callback=lambda *event: events.append(event))
+        self.processor.analyze_readings(self.folder, 's', save=True, output_folder=self.output_folder, workers=1)
+        metrics = self.processor.metrics.to_dict()
+        assert set(metrics['timings']) == {'discovery', 'parse', 'conversion', 'sort', 'process', 'raw files',
+                                           'export', 'plot'}
+        assert metrics['calls']['export'] == 6
+        # Five tables, the summary and three plots
+        assert metrics['counters']['files written'] == 9
+        assert metrics['counters']['rows produced'] == 16 + 8 + 8 + 8
+        assert [event for event in events if event[0] == 'stage'][0][1] == 'discovery'
+        assert sum(value for event, name, value in events if name == 'bytes written') == \
+               metrics['counters']['bytes written']
+
+    def test_metrics_logger(self, caplog):
+        self.processor.metrics = Metrics(logger=logging.getLogger('metpyrad'))
+        with caplog.at_level(logging.DEBUG, logger='metpyrad'):
+            self.processor.parse_readings(self.folder)
+        assert 'counter blocks parsed: 16' in caplog.messages
+
+    def test_metrics_reset(self):
+        self.processor.parse_readings(self.folder)
+        self.processor.metrics.reset()
+        assert self.processor.metrics.to_dict() == {'timings': {}, 'calls': {}, 'counters': {}}
+
+
+class TestHidex300Spectra:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.parse_readings('./data/hidex300', spectra=True)
+        self.folder = tmpdir.mkdir('output')
+
+    def test_parse_readings_spectra(self):
+        spectra = self.processor.spectra
+        assert spectra.shape == (len(self.processor.readings), 1024, 4)
+        assert spectra.dtype == np.uint16
+        # Each spectrum is the one of the data block with the end time of its reading
+        expected = {}
+        for file_name in os.listdir('./data/hidex300'):
+            file_path = os.path.join('./data/hidex300', file_name)
+            blocks = Hidex300('Lu-177', 2023, 11).iter_blocks(file_path)
+            for block, spectrum in zip(blocks, _read_spectra(file_path)):
+                expected[block['End time']] = spectrum
+        for end_time, spectrum in zip(self.processor.readings['End time'], spectra):
+            np.testing.assert_array_equal(spectrum, expected[end_time])
+
+    def test_add_readings_spectra(self):
+        for file_name in os.listdir('./data/hidex300'):
+            if file_name != 'Lu-177_2023_11_30.csv':
+                shutil.copy(os.path.join('./data/hidex300', file_name), self.folder)
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(str(self.folder), spectra=True)
+        processor.add_readings('./data/hidex300/Lu-177_2023_11_30.csv')
+        np.testing.assert_array_equal(processor.spectra, self.processor.spectra)
+
+    def test_export_spectra(self):
+        self.processor.export_spectra(str(self.folder))
+        spectra = np.load(os.path.join(self.folder, 'spectra.npy'), mmap_mode='r')
+        np.testing.assert_array_equal(spectra, self.processor.spectra)
+
+    def test_export_spectra_no_data(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='No spectra data to export.'):
+            processor.export_spectra(str(self.folder))
+
+
+class TestHidex300AlphaMatrices:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.folder = tmpdir.mkdir('readings')
+        for file_name in os.listdir('./data/hidex300'):
+            shutil.copy(os.path.join('./data/hidex300', file_name), self.folder)
+        # Write some counts into the first alpha matrix of a file
+        self.file_path = os.path.join(self.folder, 'Lu-177_2023_11_30.csv')
+        with open(self.file_path) as file:
+            lines = file.read().split('\n')
+        row = lines.index('Alpha:') + 2
+        lines[row] = ';'.join(['0', '0', '7'] + ['0'] * 60 + ['300'])
+        with open(self.file_path, 'w') as file:
+            file.write('\n'.join(lines))
+        self.matrices = AlphaMatrices([0, 2, 2, 3], [2, 65, 130], [5, 1, 9])
+
+    def test_parse_readings_matrices(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(str(self.folder), matrices=True)
+        assert len(processor.matrices) == len(processor.readings)
+        assert processor.matrices.data.dtype == np.uint16
+        # The counts belong to the reading of the first data block of the file
+        end_time = next(processor.iter_blocks(self.file_path))['End time']
+        matrix = processor.matrices[int(np.flatnonzero(processor.readings['End time'] == end_time)[0])]
+        assert matrix[1, 2] == 7 and matrix[1, 63] == 300 and matrix.sum() == 307
+        assert processor.matrices.sum().sum() == 307
+
+    def test_alpha_matrices_access(self):
+        dense = self.matrices.to_dense()
+        assert dense.shape == (3, 32, 64)
+        assert dense[0, 0, 2] == 5 and dense[0, 1, 1] == 1 and dense[2, 2, 2] == 9
+        np.testing.assert_array_equal(self.matrices[-1], dense[2])
+        np.testing.assert_array_equal(self.matrices[[2, 0]].to_dense(), dense[[2, 0]])
+        np.testing.assert_array_equal(self.matrices.sum(), dense.sum(axis=0))
+        np.testing.assert_array_equal(self.matrices.sum(np.array([False, True, True])), dense[1:].sum(axis=0))
+        concatenated = AlphaMatrices.concatenate([self.matrices, self.matrices[1:]])
+        np.testing.assert_array_equal(concatenated.to_dense(), np.concatenate([dense, dense[1:]]))
+
+    def test_alpha_matrices_save_load(self):
+        self.matrices.save(os.path.join(self.folder, 'alpha_matrices.npz'))
+        loaded = AlphaMatrices.load(os.path.join(self.folder, 'alpha_matrices.npz'))
+        np.testing.assert_array_equal(loaded.to_dense(), self.matrices.to_dense())
+
+    def test_export_matrices_no_data(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='No alpha matrices data to export.'):
+            processor.export_matrices(str(self.folder))
+
+
+class TestHidex300BlockIndex:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.expected = Hidex300('Lu-177', 2023, 11)
+        self.expected.parse_readings('./data/hidex300', spectra=True, matrices=True)
+        self.folder = tmpdir.mkdir('readings')
+        for file_name in os.listdir('./data/hidex300'):
+            shutil.copy(os.path.join('./data/hidex300', file_name), self.folder)
+
+    def test_parse_readings_index(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(str(self.folder), index=True)
+        assert sorted(os.listdir(self.folder)) == sorted(
+            [name for file_name in os.listdir('./data/hidex300') for name in [file_name, file_name + '.idx.npz']])
+        # The readings are built again from the sidecar files
+        processor.parse_readings(str(self.folder), index=True)
+        pd.testing.assert_frame_equal(processor.readings, self.expected.readings)
+        for i in range(len(processor.readings)):
+            np.testing.assert_array_equal(processor.read_spectrum(i), self.expected.spectra[i])
+            np.testing.assert_array_equal(processor.read_matrix(i), self.expected.matrices[i])
+
+    def test_parse_readings_index_read_only(self, monkeypatch):
+        def fail(*args, **kwargs):
+            raise PermissionError('Read-only file system')
+
+        # The block index is kept in memory if the sidecar files cannot be written
+        monkeypatch.setattr(np, 'savez', fail)
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(str(self.folder), index=True)
+        pd.testing.assert_frame_equal(processor.readings, self.expected.readings)
+        assert sorted(os.listdir(self.folder)) == sorted(os.listdir('./data/hidex300'))
+
+    def test_get_block_index_missing_row(self):
+        # Remove the QPE row of the first data block
+        file_path = os.path.join(self.folder, 'Lu-177_2023_11_30.csv')
+        with open(file_path) as file:
+            content = file.read()
+        with open(file_path, 'w') as file:
+            file.write(content.replace('QPE;786.730\n', '', 1))
+        index = _get_block_index(file_path)
+        assert np.isnan(index['QPE'][0]) and not np.isnan(index['QPE'][1:]).any()
+        # The index is stored with the missing value and loaded again
+        assert os.path.isfile(file_path + '.idx.npz')
+        stored = _get_block_index(file_path)
+        for name, column in index.items():
+            np.testing.assert_array_equal(stored[name], column)
+
+    def test_add_readings_index(self):
+        os.remove(os.path.join(self.folder, 'Lu-177_2023_11_30.csv'))
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(str(self.folder), index=True)
+        shutil.copy('./data/hidex300/Lu-177_2023_11_30.csv', self.folder)
+        processor.add_readings(os.path.join(self.folder, 'Lu-177_2023_11_30.csv'))
+        for i in range(len(processor.readings)):
+            np.testing.assert_array_equal(processor.read_spectrum(i), self.expected.spectra[i])
+
+    def test_read_spectrum_no_data(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='No block index data to read from.'):
+            processor.read_spectrum(0)
+
+
+class TestHidex300ParseCache:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.cache_dir = str(tmpdir.mkdir('cache'))
+        self.expected = Hidex300('Lu-177', 2023, 11)
+        self.expected.parse_readings('./data/hidex300')
+
+    def test_parse_readings_cache(self):
+        cache = ParseCache(self.cache_dir)
+        for engine in ['python', 'mmap']:
+            processor = Hidex300('Lu-177', 2023, 11)
+            processor.parse_readings('./data/hidex300', engine=engine, cache=cache)
+            pd.testing.assert_frame_equal(processor.readings, self.expected.readings)
+        assert cache.misses == 4
+        assert cache.hits == 4
+
+    def test_parse_readings_cache_eviction(self):
+        cache = ParseCache(self.cache_dir, max_size=1)
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings('./data/hidex300', cache=cache)
+        assert cache.evictions == 4
+        assert not [file_name for file_name in os.listdir(self.cache_dir) if file_name.endswith('.npz')]
+
+    def test_parse_readings_invalid_cache(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='Invalid parse cache.'):
+            processor.parse_readings('./data/hidex300', cache=1)
+
+
+class TestHidex300AddReadings:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.expected = Hidex300('Lu-177', 2023, 11)
+        self.expected.parse_readings('./data/hidex300')
+        self.expected.process_readings('all', time_unit='h')
+        self.folder = tmpdir.mkdir('readings')
+
+    @pytest.mark.parametrize('new_file', ['Lu-177_2023_11_30.csv', 'Lu-177_2023_12_22.csv'])
+    def test_add_readings(self, new_file):
+        # Parse all the files except the new one, which is added afterwards
+        for file_name in os.listdir('./data/hidex300'):
+            if file_name != new_file:
+                shutil.copy(os.path.join('./data/hidex300', file_name), self.folder)
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(str(self.folder))
+        processor.process_readings('all', time_unit='h')
+        processor.add_readings(os.path.join('./data/hidex300', new_file))
+        for kind in ['readings', 'background', 'sample', 'net']:
+            pd.testing.assert_frame_equal(getattr(processor, kind), getattr(self.expected, kind))
+        assert processor.cycles == self.expected.cycles
+        assert processor.total_measurements == self.expected.total_measurements
+        assert processor.measurement_time == self.expected.measurement_time
+
+    def test_add_readings_no_data(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='No readings data to add new readings to.'):
+            processor.add_readings('./data/hidex300/Lu-177_2023_11_30.csv')
+
+    def _get_state(self):
+        return {kind: getattr(self.expected, kind) for kind in
+                ['readings', 'background', 'sample', 'net', 'cycles', 'total_measurements', 'measurement_time']}
+
+    def test_add_readings_duplicated(self):
+        state = self._get_state()
+        with pytest.raises(ValueError, match='Duplicated readings in CSV files .*Lu-177_2023_11_30.csv'):
+            self.expected.add_readings('./data/hidex300/Lu-177_2023_11_30.csv')
+        # The failed addition leaves the processor unchanged
+        for name, value in self._get_state().items():
+            assert value is state[name]
+
+    def test_add_readings_failed_net(self, monkeypatch):
+        shutil.copy('./data/hidex300/Lu-177_2023_11_30.csv', self.folder)
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(str(self.folder))
+        processor.process_readings('all', time_unit='h')
+        self.expected = processor
+        state = self._get_state()
+
+        def fail(sample, background):
+            raise ValueError('Duplicated cycle and repetition in the background measurements. Check readings table.')
+
+        # A failure while processing the net measurements, after merging the readings, leaves the processor unchanged
+        monkeypatch.setattr('metpyrad.hidex300._pair_measurements', fail)
+        with pytest.raises(ValueError, match='Duplicated cycle and repetition'):
+            processor.add_readings('./data/hidex300/Lu-177_2023_12_22.csv')
+        for name, value in self._get_state().items():
+            assert value is state[name]
+
+
+class TestAnalyzeCampaigns:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.folder = tmpdir
+        self.campaigns = [
+            {'radionuclide': 'Lu-177', 'year': 2023, 'month': 11, 'input_folder': './data/hidex300', 'time_unit': 'h'},
+            {'radionuclide': 'I-131', 'year': 2023, 'month': 11, 'input_folder': str(tmpdir.join('missing'))},
+            {'radionuclide': 'Lu-177', 'year': 2023, 'month': 12, 'input_folder': './data/hidex300',
+             'output_folder': str(tmpdir)},
+        ]
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_analyze_campaigns(self, workers):
+        summary = analyze_campaigns(self.campaigns, workers=workers)
+        assert summary['Radionuclide'].tolist() == ['Lu-177', 'I-131', 'Lu-177']
+        assert summary['Cycles'].tolist() == [4, pd.NA, 4]
+        assert summary['Total measurements'].tolist() == [8, pd.NA, 8]
+        assert summary['Measurement time (s)'].tolist()[::2] == [800, 800]
+        assert summary['Error'].isna().tolist() == [True, False, True]
+        assert os.path.isfile(os.path.join(self.folder, 'Lu-177_2023_12', 'summary.txt'))
+
+    def test_main(self):
+        pd.DataFrame(self.campaigns[:1]).to_csv(os.path.join(self.folder, 'manifest.csv'), index=False)
+        output = os.path.join(self.folder, 'summary.csv')
+        assert main([os.path.join(self.folder, 'manifest.csv'), '--workers', '1', '--output', output]) == 0
+        assert pd.read_csv(output)['Cycles'].tolist() == [4]
+
+    def test_main_raw_files(self):
+        pd.DataFrame(self.campaigns[2:]).to_csv(os.path.join(self.folder, 'manifest.csv'), index=False)
+        assert main([os.path.join(self.folder, 'manifest.csv'), '--workers', '1', '--raw-files', 'store']) == 0
+        assert os.path.isfile(os.path.join(self.folder, 'Lu-177_2023_12', 'readings.json'))
+        assert os.path.isdir(os.path.join(self.folder, Hidex300._STORE_FOLDER))
+
+    def test_analyze_campaigns_invalid_manifest(self):
+        with pytest.raises(ValueError, match='Invalid campaigns manifest. Missing columns: input_folder.'):
+            analyze_campaigns([{'radionuclide': 'Lu-177', 'year': 2023, 'month': 11}])
+
+
+class TestFitDecay:
+
+    @staticmethod
+    def get_series(activity, half_life, seed, points=60, unit='d'):
+        # Synthetic net measurements of a decay with Poisson noise
+        rng = np.random.default_rng(seed)
+        t = np.linspace(0, 30, points)
+        counts = activity * np.exp(-np.log(2) / half_life * t)
+        uncertainty = np.sqrt(counts)
+        return pd.DataFrame({f'Elapsed time ({unit})': t, 'Counts': counts + rng.normal(0, uncertainty),
+                             'Counts uncertainty': uncertainty})
+
+    def test_fit_decay_recovers_half_life(self):
+        fit = fit_decay(self.get_series(1e6, 6.647, seed=0))
+        assert fit.loc[0, 'Points'] == 60
+        assert fit.loc[0, 'Converged']
+        assert fit.loc[0, 'Half-life (d)'] == pytest.approx(6.647, abs=4 * fit.loc[0, 'Half-life uncertainty (d)'])
+        assert fit.loc[0, 'Activity'] == pytest.approx(1e6, abs=4 * fit.loc[0, 'Activity uncertainty'])
+
+    def test_fit_decay_matches_curve_fit(self):
+        optimize = pytest.importorskip('scipy.optimize')
+        df = self.get_series(2e5, 2.7, seed=1)
+        fit = fit_decay(df).loc[0]
+        popt, pcov = optimize.curve_fit(lambda t, a, b: a * np.exp(-b * t), df['Elapsed time (d)'], df['Counts'],
+                                        p0=[1e5, 0.1], sigma=df['Counts uncertainty'])
+        np.testing.assert_allclose([fit['Activity'], fit['Decay constant (1/d)']], popt, rtol=1e-7)
+        np.testing.assert_allclose([fit['Activity uncertainty'] ** 2, fit['Covariance'],
+                                    fit['Decay constant uncertainty (1/d)'] ** 2], [pcov[0, 0], pcov[0, 1],
+                                                                                     pcov[1, 1]], rtol=1e-5)
+
+    def test_fit_decay_batch_equals_single_fits(self):
+        series = {f'Series {i}': self.get_series(10 ** (3 + i % 4), 1 + i, seed=i) for i in range(10)}
+        batch = fit_decay(series)
+        assert list(batch.index) == list(series)
+        for key, df in series.items():
+            pd.testing.assert_series_equal(batch.loc[key], fit_decay(df).iloc[0], check_names=False, rtol=1e-9)
+
+    def test_fit_decay_by(self):
+        df = pd.concat([self.get_series(1e5, 6.647, seed=i).assign(Repetition=i) for i in [1, 2, 3]])
+        fit = fit_decay(df, by='Repetition')
+        assert list(fit.index) == [1, 2, 3]
+        assert fit.index.name == 'Repetition'
+        assert (fit['Points'] == 60).all()
+
+    def test_fit_decay_absolute_sigma(self):
+        df = self.get_series(1e5, 6.647, seed=2)
+        scaled = fit_decay(df).loc[0]
+        absolute = fit_decay(df, absolute_sigma=True).loc[0]
+        assert scaled['Activity uncertainty'] == pytest.approx(
+            absolute['Activity uncertainty'] * np.sqrt(scaled['Reduced chi-squared']))
+
+    def test_fit_decay_many_series(self):
+        series = [self.get_series(1e5, 6.647, seed=i) for i in range(500)]
+        fit = fit_decay(series)
+        assert len(fit) == 500
+        assert fit['Converged'].all()
+        assert fit['Half-life (d)'].mean() == pytest.approx(6.647, rel=1e-3)
+
+    def test_fit_decay_invalid_points(self):
+        df = self.get_series(1e5, 6.647, seed=3)
+        df.loc[0, 'Counts'] = np.nan
+        df.loc[1, 'Counts uncertainty'] = 0
+        assert fit_decay(df).loc[0, 'Points'] == 58
+        # A single point can not be fitted
+        fit = fit_decay(df.iloc[:3])
+        assert fit.loc[0, 'Points'] == 1
+        assert np.isnan(fit.loc[0, 'Half-life (d)'])
+
+    def test_hidex300_fit_decay(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings('./data/hidex300')
+        processor.process_readings('all', time_unit='d')
+        fit = processor.fit_decay(column='Count rate (cpm)')
+        assert list(fit.index) == ['Lu-177 2023-11']
+        assert fit.loc['Lu-177 2023-11', 'Points'] == 8
+        assert fit.loc['Lu-177 2023-11', 'Half-life (d)'] == pytest.approx(6.644, abs=1e-3)
+        fit = processor.fit_decay(by='Repetition')
+        assert list(fit.index) == [('Lu-177 2023-11', 1), ('Lu-177 2023-11', 2)]
+
+    def test_fit_decay_errors(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        with pytest.raises(ValueError, match='No net data to fit. Please process the readings first.'):
+            processor.fit_decay()
+        with pytest.raises(ValueError, match='Invalid fit column. Choose from "Counts" or "Count rate \\(cpm\\)".'):
+            fit_decay(self.get_series(1e5, 6.647, seed=0), column='Dead time')
+        with pytest.raises(ValueError, match='Inconsistent time units.'):
+            fit_decay([self.get_series(1e5, 6.647, seed=0), self.get_series(1e5, 6.647, seed=0, unit='h')])
+
+
+class TestHidex300PropagateUncertainty:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.parse_readings('./data/hidex300')
+        self.processor.process_readings('all', time_unit='d')
+
+    def test_propagate_uncertainty_poisson(self):
+        result = self.processor.propagate_uncertainty(trials=20000, seed=0)
+        assert list(result.columns) == ['Cycle', 'Repetition', 'Background counts', 'Background counts uncertainty',
+                                        'Sample counts', 'Sample counts uncertainty', 'Counts', 'Counts uncertainty',
+                                        'Counts uncertainty (%)']
+        # Without time uncertainties the result agrees with the analytic propagation
+        np.testing.assert_allclose(result['Counts uncertainty'], self.processor.net['Counts uncertainty'], rtol=0.03)
+        np.testing.assert_allclose(result['Background counts uncertainty'],
+                                   self.processor.background['Counts uncertainty'], rtol=0.03)
+        np.testing.assert_allclose(result['Counts'], self.processor.net['Counts'], rtol=1e-3)
+
+    def test_propagate_uncertainty_seed_and_chunks(self, monkeypatch):
+        result = self.processor.propagate_uncertainty(trials=1000, dead_time_uncertainty=0.001,
+                                                      real_time_uncertainty=0.1, seed=1)
+        pd.testing.assert_frame_equal(result, self.processor.propagate_uncertainty(
+            trials=1000, dead_time_uncertainty=0.001, real_time_uncertainty=0.1, seed=1))
+        # Smaller chunks draw the same trials in another order, so the moments agree to rounding
+        monkeypatch.setattr(Hidex300, '_TRIALS_CHUNK_SIZE', 8 * 7)
+        chunked = self.processor.propagate_uncertainty(trials=1000, dead_time_uncertainty=0.001,
+                                                       real_time_uncertainty=0.1, seed=1)
+        assert not chunked.equals(result)
+        np.testing.assert_allclose(chunked['Counts uncertainty'], result['Counts uncertainty'], rtol=0.15)
+
+    def test_propagate_uncertainty_time_uncertainties(self):
+        poisson = self.processor.propagate_uncertainty(trials=20000, seed=2)
+        result = self.processor.propagate_uncertainty(trials=20000, dead_time_uncertainty=0.001,
+                                                      real_time_uncertainty=0.1, seed=2)
+        assert (result['Counts uncertainty'] > poisson['Counts uncertainty']).all()
+        # The real time and the dead time add relative uncertainties of 0.1 % and 0.1 % / dead time to the counts
+        expected = np.sqrt(self.processor.sample['Counts'] + self.processor.background['Counts']
+                           + (self.processor.sample['Counts'] * 1e-3 * np.hypot(
+                               1, 1 / self.processor.sample['Dead time'])) ** 2)
+        np.testing.assert_allclose(result['Counts uncertainty'], expected, rtol=0.05)
+
+    def test_propagate_uncertainty_update(self):
+        net = self.processor.net
+        previous = net.copy()
+        measurement = self.processor.get(cycle=1, repetition=1)
+        counts = self.processor.net['Counts'].copy()
+        result = self.processor.propagate_uncertainty(trials=100, dead_time_uncertainty=0.001, seed=3, update=True)
+        # The tables held before the update are not modified
+        pd.testing.assert_frame_equal(net, previous)
+        assert self.processor.get(cycle=1, repetition=1)['Counts uncertainty'] != measurement['Counts uncertainty']
+        np.testing.assert_array_equal(self.processor.net['Counts uncertainty'], result['Counts uncertainty'])
+        pd.testing.assert_series_equal(self.processor.net['Counts'], counts)
+        np.testing.assert_allclose(self.processor.net['Counts uncertainty (%)'],
+                                   result['Counts uncertainty'] / counts * 100)
+
+    def test_propagate_uncertainty_update_compact(self):
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.compact = True
+        processor.parse_readings('./data/hidex300')
+        processor.process_readings('all', time_unit='d')
+        dtypes = processor.net.dtypes
+        result = processor.propagate_uncertainty(trials=100, seed=3, update=True)
+        pd.testing.assert_series_equal(processor.net.dtypes, dtypes)
+        np.testing.assert_allclose(processor.net['Counts uncertainty'], result['Counts uncertainty'], rtol=1e-6)
+
+    def test_propagate_uncertainty_errors(self):
+        with pytest.raises(ValueError, match='Invalid number of trials. Choose at least 2 trials.'):
+            self.processor.propagate_uncertainty(trials=1)
+        with pytest.raises(ValueError, match='No background and sample data to propagate the uncertainty.'):
+            Hidex300('Lu-177', 2023, 11).propagate_uncertainty()
+
+
+class TestHidex300Bootstrap:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.parse_readings('./data/hidex300')
+        self.processor.process_readings('all', time_unit='d')
+
+    def test_bootstrap_cycles(self):
+        result = self.processor.bootstrap('cycles', resamples=2000, seed=0)
+        assert list(result.columns) == ['Cycle', 'Repetitions', 'Mean count rate (cpm)', 'Standard error',
+                                        'Lower limit', 'Upper limit']
+        assert result['Cycle'].tolist() == [1, 2, 3, 4]
+        assert result['Repetitions'].tolist() == [2, 2, 2, 2]
+        means = self.processor.net.groupby('Cycle')['Count rate (cpm)']
+        np.testing.assert_allclose(result['Mean count rate (cpm)'], means.mean())
+        # With two repetitions the resampled means are the two values and their mean
+        np.testing.assert_allclose(result['Lower limit'], means.min())
+        np.testing.assert_allclose(result['Upper limit'], means.max())
+
+    def test_bootstrap_decay(self):
+        result = self.processor.bootstrap('decay', resamples=500, column='Counts', seed=0)
+        assert list(result.index) == ['Activity', 'Decay constant (1/d)', 'Half-life (d)']
+        fit = self.processor.fit_decay().iloc[0]
+        assert result.loc['Half-life (d)', 'Estimate'] == pytest.approx(fit['Half-life (d)'])
+        assert (result['Lower limit'] <= result['Estimate']).all()
+        assert (result['Upper limit'] >= result['Estimate']).all()
+
+    def test_bootstrap_reproducible(self, monkeypatch):
+        monkeypatch.setattr(Hidex300, '_RESAMPLES_CHUNK_SIZE', 100)
+        result = self.processor.bootstrap('decay', resamples=250, seed=1, workers=1)
+        pd.testing.assert_frame_equal(result, self.processor.bootstrap('decay', resamples=250, seed=1, workers=1))
+        # The chunks get the same seeds in worker processes
+        pd.testing.assert_frame_equal(result, self.processor.bootstrap('decay', resamples=250, seed=1, workers=2))
+        assert not result.equals(self.processor.bootstrap('decay', resamples=250, seed=2, workers=1))
+
+    @pytest.mark.parametrize('arguments, message', [
+        ({'kind': 'invalid'}, 'Invalid bootstrap kind. Choose from "cycles" or "decay".'),
+        ({'kind': 'cycles', 'column': 'Dead time'}, 'Invalid bootstrap column.'),
+        ({'kind': 'cycles', 'resamples': 1}, 'Invalid number of resamples. Choose at least 2 resamples.'),
+        ({'kind': 'decay', 'confidence': 95}, 'Invalid confidence level. Choose a number between 0 and 1.'),
+    ])
+    def test_bootstrap_errors(self, arguments, message):
+        with pytest.raises(ValueError, match=message):
+            self.processor.bootstrap(**arguments)
+
+    def test_bootstrap_no_net(self):
+        with pytest.raises(ValueError, match='No net data to bootstrap. Please process the readings first.'):
+            Hidex300('Lu-177', 2023, 11).bootstrap('cycles')
+
+
+class TestHidex300Cache:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.parse_readings('./data/hidex300')
+
+    def test_summary_cached(self, monkeypatch):
+        summary = self.processor._get_readings_summary()
+        assert summary['Cycle'].tolist() == [1, 2, 3, 4]
+        assert summary['Repetitions'].tolist() == [2, 2, 2, 2]
+        assert summary['Date'].tolist() == self.processor.readings.groupby('Cycle')['End time'].min().tolist()
+        text = str(self.processor)
+        # Printing the object again does not scan the readings
+        monkeypatch.setattr(pd.DataFrame, 'groupby', None)
+        assert str(self.processor) == text
+        assert self.processor._get_readings_summary() is summary
+
+    def test_readings_assignment_clears_cache(self):
+        summary = self.processor._get_readings_summary()
+        self.processor.readings = self.processor.readings[self.processor.readings['Cycle'] < 3]
+        assert self.processor._get_readings_summary()['Cycle'].tolist() == [1, 2]
+        assert self.processor._get_readings_summary() is not summary
+
+    def test_process_readings_cached(self):
+        self.processor.metrics = Metrics()
+        self.processor.process_readings('all', time_unit='h')
+        background, sample, net = self.processor.background, self.processor.sample, self.processor.net
+        self.processor.process_readings('all', time_unit='h')
+        assert self.processor.background is background
+        assert self.processor.sample is sample
+        assert self.processor.net is net
+        assert self.processor.metrics.counters['rows produced'] == 8 + 8 + 8
+        # A new time unit processes the measurements again
+        self.processor.process_readings('all', time_unit='d')
+        assert 'Elapsed time (d)' in self.processor.net.columns
+        self.processor.process_readings('all', time_unit='h')
+        assert self.processor.net is not net
+        pd.testing.assert_frame_equal(self.processor.net, net)
+
+    def test_process_readings_cache_invalidation(self):
+        self.processor.process_readings('all')
+        net = self.processor.net
+        # The net measurements follow the background measurements they are derived from
+        self.processor.background = self.processor.background.assign(Counts=0)
+        self.processor.process_readings('net')
+        np.testing.assert_allclose(self.processor.net['Counts'], self.processor.sample['Counts'])
+        # New readings clear the processed measurements
+        self.processor.readings = self.processor.readings[self.processor.readings['Cycle'] < 3]
+        self.processor.process_readings('all')
+        assert len(self.processor.net) == 4
+        assert self.processor.net is not net
+
+    def test_propagate_uncertainty_update_clears_net(self):
+        self.processor.process_readings('all')
+        uncertainty = self.processor.net['Counts uncertainty'].copy()
+        self.processor.propagate_uncertainty(trials=10, seed=0, update=True)
+        self.processor.process_readings('net')
+        pd.testing.assert_series_equal(self.processor.net['Counts uncertainty'], uncertainty)
+
+
+class TestHidex300KeyedNet:
+
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.parse_readings('./data/hidex300')
+        self.processor.process_readings('all')
+
+    def test_net_shuffled_background(self):
+        net = self.processor.net
+        # Pairing by cycle and repetition does not depend on the order of the background measurements
+        self.processor.background = self.processor.background.iloc[::-1].reset_index(drop=True)
+        self.processor.process_readings('net')
+        pd.testing.assert_frame_equal(self.processor.net, net)
+
+    def test_net_partial_campaign(self, capsys):
+        readings = self.processor.readings
+        # Drop the background of the second repetition of the third cycle
+        missing = (readings['Sample'] == 1) & (readings['Cycle'] == 3) & (readings['Repetition'] == 2)
+        self.processor.readings = readings[~missing].reset_index(drop=True)
+        self.processor.process_readings('all')
+        assert 'Skipped 1 sample measurements without a background measurement' in capsys.readouterr().out
+        assert len(self.processor.net) == 7
+        assert (3, 2) not in set(zip(self.processor.net['Cycle'], self.processor.net['Repetition']))
+        row = self.processor.net[(self.processor.net['Cycle'] == 4) & (self.processor.net['Repetition'] == 1)]
+        expected = self.processor.get(4, 1, 'sample')['Counts'] - self.processor.get(4, 1, 'background')['Counts']
+        assert row['Counts'].item() == pytest.approx(expected)
+
+    def test_net_duplicated_background(self):
+        self.processor.background = pd.concat([self.processor.background, self.processor.background.iloc[:1]])
+        with pytest.raises(ValueError, match='Duplicated cycle and repetition in the background measurements.'):
+            self.processor.process_readings('net')
+
+    def test_get(self):
+        measurement = self.processor.get(cycle=3, repetition=2)
+        assert measurement['Cycle'] == 3 and measurement['Repetition'] == 2
+        assert measurement['Count rate (cpm)'] == pytest.approx(72257.79)
+        assert self.processor.get(3, 2, kind='sample')['Dead time'] == 1.035
+        assert self.processor.get(3, 2, kind='background')['Sample'] == 1
+        # The index follows the processed measurements
+        self.processor.background = self.processor.background.iloc[::-1].reset_index(drop=True)
+        assert self.processor.get(1, 1, kind='background')['Count rate (cpm)'] == pytest.approx(83.97)
+
+    def test_get_errors(self):
+        with pytest.raises(KeyError, match='No net measurement for cycle 5 and repetition 1.'):
+            self.processor.get(5, 1)
+        with pytest.raises(ValueError, match='Invalid measurement kind. Choose from "background", "sample" or "net".'):
+            self.processor.get(1, 1, kind='readings')
+        with pytest.raises(ValueError, match='No net data to look up. Please process the readings first.'):
+            Hidex300('Lu-177', 2023, 11).get(1, 1)
+
+
+class TestHidex300Compact:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.default = Hidex300('Lu-177', 2023, 11)
+        self.default.parse_readings('./data/hidex300', fields=['WName'])
+        self.default.process_readings('all', time_unit='d')
+        self.processor = Hidex300('Lu-177', 2023, 11)
+        self.processor.compact = True
+        self.processor.parse_readings('./data/hidex300', fields=['WName'])
+        self.processor.process_readings('all', time_unit='d')
+        self.folder = str(tmpdir)
+
+    def test_compact_readings(self):
+        readings = self.processor.readings
+        assert readings['Cycle'].dtype == np.uint8
+        assert readings['Real time (s)'].dtype == np.uint8
+        assert readings['Count rate (cpm)'].dtype == np.float32
+        assert isinstance(readings['Well name'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_frame_equal(readings, self.default.readings, check_dtype=False, check_categorical=False,
+                                      rtol=1e-6)
+        assert str(self.processor) == str(self.default)
+
+    def test_compact_processed(self):
+        for kind in ['background', 'sample', 'net']:
+            df = getattr(self.processor, kind)
+            assert df['Cycle'].dtype == np.uint8
+            assert df['Counts'].dtype == np.float32
+            pd.testing.assert_frame_equal(df, getattr(self.default, kind), check_dtype=False,
+                                          check_categorical=False, rtol=1e-6)
+        fit = self.processor.fit_decay().iloc[0]
+        assert fit['Half-life (d)'] == pytest.approx(self.default.fit_decay().iloc[0]['Half-life (d)'], rel=1e-6)
+
+    def test_memory_usage(self):
+        report = self.processor.memory_usage()
+        assert list(report.index) == ['readings', 'background', 'sample', 'net']
+        assert report.loc['readings', 'Rows'] == 16
+        assert (report['Saved (%)'] > 40).all()
+        assert report.loc['readings', 'Default memory (bytes)'] == \
+               self.default.readings.memory_usage(index=False, deep=True).sum()
+        assert (self.default.memory_usage()['Saved (%)'] == 0).all()
+
+    def test_compact_statistics_do_not_overflow(self):
+        readings = self.default.readings.copy()
+        readings['Repetition'] *= 30
+        readings['Real time (s)'] *= 2
+        self.processor.readings = readings
+        self.processor._set_readings_statistics()
+        assert self.processor.readings['Repetition'].dtype == np.uint8
+        assert self.processor.measurement_time == 4 * 60 * 200
+
+    @pytest.mark.parametrize('format', ['csv', 'parquet', 'hdf5'])
+    def test_compact_export(self, format):
+        self.processor.export_table('readings', self.folder, format=format)
+        file_path = os.path.join(self.folder, 'readings' + Hidex300._TABLE_FORMATS[format])
+        if format == 'csv':
+            df = pd.read_csv(file_path, parse_dates=['End time'])
+            # The shortest representation of the float32 values is the one of the CSV files
+            pd.testing.assert_frame_equal(df, self.default.readings, check_dtype=False)
+        elif format == 'parquet':
+            pd.testing.assert_frame_equal(pd.read_parquet(file_path), self.processor.readings)
+        else:
+            df = pd.read_hdf(file_path)
+            assert df['Cycle'].dtype == np.uint8
+            assert df['Well name'].tolist() == self.default.readings['Well name'].tolist()
+
+    def test_compact_frame(self):
+        df = pd.DataFrame({'Small': [0, 200, 5], 'Negative': [-1, 40000, 5], 'Exact': [1.0, 1.125, 2.5],
+                           'Large': [1.0, 1e40, 2.5], 'Missing': [np.nan, 2.5, 1.0], 'Text': ['A01', 'A01', 'A01'],
+                           'Names': ['A01', 'A02', 'A03']})
+        df = _compact_frame(df)
+        assert df.dtypes.astype(str).tolist() == ['uint8', 'int32', 'float32', 'float64', 'float32', 'category',
+                                                 'object']
+
+
+class TestHidex300WatchReadings:
+
+    @pytest.fixture(autouse=True)
+    def setup(self, tmpdir):
+        self.expected = Hidex300('Lu-177', 2023, 11)
+        self.expected.parse_readings('./data/hidex300')
+        self.expected.process_readings('all')
+        self.folder = tmpdir.mkdir('readings')
+        self.output_dir = tmpdir.mkdir('output')
+
+    def test_watch_readings(self):
+        for file_name in os.listdir('./data/hidex300'):
+            shutil.copy(os.path.join('./data/hidex300', file_name), self.folder)
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.watch_readings(str(self.folder), output_folder=str(self.output_dir), interval=0, max_polls=3)
+        pd.testing.assert_frame_equal(processor.net, self.expected.net)
+        assert os.path.exists(os.path.join(self.output_dir, 'Lu-177_2023_11', 'net.csv'))
+        assert len(os.listdir(os.path.join(self.output_dir, 'Lu-177_2023_11', 'readings'))) == 4
+
+    def test_watch_readings_partial_file(self):
+        # Copy a complete file and the first half of another one
+        shutil.copy('./data/hidex300/Lu-177_2023_11_30.csv', self.folder)
+        with open('./data/hidex300/Lu-177_2023_12_06.csv') as file:
+            content = file.read()
+        with open(os.path.join(self.folder, 'Lu-177_2023_12_06.csv'), 'w') as file:
+            file.write(content[:len(content) // 2])
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.watch_readings(str(self.folder), interval=0, max_polls=2)
+        assert processor.cycles == 1
+
+    def test_watch_readings_parsed_folder(self):
+        readings = self.expected.readings
+        self.expected.watch_readings('./data/hidex300', interval=0, max_polls=2)
+        # The CSV files already parsed are not added again
+        assert self.expected.readings is readings
+        assert self.expected.cycles == 4
+
+    def test_watch_readings_invalid_file(self, capsys):
+        for file_name in ['Lu-177_2023_11_30.csv', 'Lu-177_2023_12_06.csv']:
+            shutil.copy(os.path.join('./data/hidex300', file_name), self.folder)
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.parse_readings(str(self.folder))
+        processor.process_readings('all')
+        # A file with another real time is skipped, and the files after it are still added
+        with open('./data/hidex300/Lu-177_2023_12_12.csv') as file:
+            content = file.read()
+        with open(os.path.join(self.folder, 'A_invalid.csv'), 'w') as file:
+            file.write(content.replace('Time;100', 'Time;200'))
+        shutil.copy('./data/hidex300/Lu-177_2023_12_22.csv', self.folder)
+        processor.watch_readings(str(self.folder), interval=0, max_polls=3)
+        output = capsys.readouterr().out
+        assert f'Skipped CSV file {os.path.join(str(self.folder), "A_invalid.csv")}' in output
+        assert output.count('Skipped CSV file') == 1
+        assert processor.cycles == 3
+
+    def test_watch_readings_deleted_file(self, monkeypatch):
+        shutil.copy('./data/hidex300/Lu-177_2023_11_30.csv', self.folder)
+        listdir = os.listdir
+        # A file listed but deleted before it is inspected is skipped
+        monkeypatch.setattr(os, 'listdir', lambda path: listdir(path) + ['deleted.csv'])
+        processor = Hidex300('Lu-177', 2023, 11)
+        processor.watch_readings(str(self.folder), interval=0, max_polls=2)
+        assert processor.cycles == 1
+
+
 class TestHidex300ProcessReadings:
 
     @pytest.fixture(autouse=True)
@@ -81,6 +1150,17 @@ class TestHidex300ProcessReadings:
         assert self.processor.net is not None
         assert not self.processor.net.empty
 
+    @pytest.mark.parametrize('time_unit', ['s', 'h', 'yr'])
+    def test_process_elapsed_time(self, time_unit):
+        # Sub-second end times must give the same elapsed times as Timedelta.total_seconds
+        end_time = pd.Timestamp('2023-11-30') + pd.to_timedelta([0, 158843553356, 203941986880, 10 ** 15], 'ns')
+        self.processor.readings['End time'] = end_time
+        self.processor.process_readings(kind='background', time_unit=time_unit)
+        factor = {'s': 1, 'h': 1 / 3600, 'yr': 1 / (86400 * 365.25)}[time_unit]
+        expected = pd.Series([(t - end_time[0]).total_seconds() for t in end_time[:2]]) * factor
+        pd.testing.assert_series_equal(self.processor.background[f'Elapsed time ({time_unit})'], expected,
+                                       check_names=False, check_exact=True)
+
     def test_invalid_kind(self):
         with pytest.raises(ValueError):
             self.processor.process_readings(kind='invalid')
@@ -166,6 +1246,20 @@ class TestHidex300Exceptions:
         with pytest.raises(ValueError, match='Invalid measurement kind. Choose from "readings", "background", "sample", "net", or "all".'):
             self.processor.export_table(kind='invalid', folder_path='None')
 
+    def test_export_table_invalid_format(self):
+        self.processor.process_readings('all')
+        with pytest.raises(ValueError, match='Invalid table format. Choose from "csv", "parquet", "feather", or "hdf5".'):
+            self.processor.export_table(kind='net', folder_path='None', format='xlsx')
+
+    def test_analyze_readings_invalid_raw_files(self):
+        with pytest.raises(ValueError, match='Invalid raw files mode. Choose from "copy", "link", "archive", "store", or None.'):
+            self.processor.analyze_readings('./data/hidex300', time_unit='s', raw_files='move')
+
+    def test_export_table_invalid_compression(self):
+        self.processor.process_readings('all')
+        with pytest.raises(ValueError, match='Invalid CSV compression. Choose from "gzip", "bz2", "zip", "xz", or "zstd".'):
+            self.processor.export_table(kind='net', folder_path='None', compression='rar')
+
     def test_export_plot_invalid_kind(self):
         with pytest.raises(ValueError, match='Invalid measurement kind. Choose from "background", "sample", or "net".'):
             self.processor.export_plot(kind='invalid', folder_path='None')